@@ -0,0 +1,241 @@
+"""
+Headless command-line access to the clusters in servers.conf, without PyQt5.
+
+    python connector_cli.py list-topics
+    python connector_cli.py --server Prod tail orders --from latest
+    python connector_cli.py dump orders --range time --start 2024-05-01T00:00 > orders.jsonl
+    python connector_cli.py produce orders-copy --format jsonl --keep-partitions < orders.jsonl
+
+Records are written one per line to stdout as they arrive; status goes to stderr.
+"""
+import sys
+import os
+import json
+import argparse
+import datetime
+import connector_core
+
+def select_server(args):
+    if args.bootstrap_servers:
+        return dict(connector_core.default_server_config, bootstrap_servers=args.bootstrap_servers)
+    servers = connector_core.load_servers(args.servers)
+    name = args.server or next(iter(servers))
+    if name not in servers:
+        raise SystemExit(f"Unknown server '{name}'. Profiles: {', '.join(servers)}")
+    return servers[name]
+
+def parse_bound(value, range_kind):
+    if value is None:
+        return None
+    if range_kind == 'time':
+        return int(datetime.datetime.fromisoformat(value).timestamp() * 1000)
+    return int(value)
+
+def record_line(record, args):
+    output_format = args.format
+    if output_format == 'jsonl':
+        return connector_core.json_export_record(
+            record.partition, record.offset, record.timestamp, record.key, record.value, record.headers)
+    if output_format == 'value':
+        return (record.value or b'') + b'\n'
+    line = connector_core.format_consumed_message(record.offset, record.key, record.value, args.decode, args.registry)
+    return f"[{record.partition}] {line}\n".encode('utf-8')
+
+def list_topics(config, args, out):
+    consumer = connector_core.attach_consumer(config)
+    try:
+        for topic in sorted(consumer.topics()):
+            out.write(topic.encode('utf-8') + b'\n')
+    finally:
+        consumer.close()
+
+def describe_cluster(config, args, out):
+    admin = connector_core.create_client('admin', config)
+    try:
+        out.write(json.dumps(admin.describe_cluster(), default=str).encode('utf-8') + b'\n')
+    finally:
+        admin.close()
+
+def tail(config, args, out):
+    if args.partition:
+        from kafka import TopicPartition
+        consumer = connector_core.attach_consumer(config)
+        tps = [TopicPartition(args.topic, p) for p in args.partition]
+        consumer.assign(tps)
+        if args.start_at == 'latest':
+            consumer.seek_to_end(*tps)
+        else:
+            consumer.seek_to_beginning(*tps)
+    else:
+        consumer = connector_core.attach_consumer(config, args.topic, args.start_at)
+    try:
+        remaining = args.max_records
+        while remaining is None or remaining > 0:
+            batches = consumer.poll(timeout_ms=500, max_records=args.batch_records)
+            for records in batches.values():
+                if remaining is not None:
+                    records = records[:remaining]
+                    remaining -= len(records)
+                out.write(b''.join(record_line(r, args) for r in records))
+            if batches:
+                out.flush()
+    finally:
+        consumer.close()
+
+def dump(config, args, out):
+    """
+    Write a bounded offset/time range of a topic and exit, to stdout or an export file.
+    """
+    consumer = connector_core.attach_consumer(config)
+    writer = None
+    try:
+        ranges = connector_core.resolve_offset_ranges(
+            consumer, args.topic, args.range.capitalize(),
+            parse_bound(args.start, args.range), parse_bound(args.end, args.range))
+        remaining = {tp for tp, (first, last) in ranges.items() if first < last}
+        consumer.assign(list(remaining))
+        for tp in remaining:
+            consumer.seek(tp, ranges[tp][0])
+        if args.output:
+            writer = connector_core.ExportWriter(args.output, args.output_format, args.compression)
+        count = 0
+        while remaining:
+            batches = consumer.poll(timeout_ms=500, max_records=args.batch_records)
+            for tp, records in batches.items():
+                last = ranges[tp][1]
+                records = [r for r in records if r.offset < last]
+                if writer:
+                    for r in records:
+                        writer.write(r.partition, r.offset, r.timestamp, r.key, r.value, r.headers)
+                else:
+                    out.write(b''.join(record_line(r, args) for r in records))
+                count += len(records)
+                if not records or records[-1].offset + 1 >= last:
+                    remaining.discard(tp)
+                    consumer.pause(tp)
+            if not batches:
+                for tp in list(remaining):
+                    if consumer.position(tp) >= ranges[tp][1]:
+                        remaining.discard(tp)
+            elif not writer:
+                out.flush()
+        if writer:
+            writer.checkpoint()
+        print(f"Dumped {count} records from '{args.topic}'.", file=sys.stderr)
+    finally:
+        if writer:
+            writer.close()
+        consumer.close()
+
+def produce(config, args, out):
+    from kafka import KafkaProducer
+    linger_ms = args.linger_ms
+    if linger_ms is None and config.get('tuning_preset', 'Default') == 'Default':
+        linger_ms = 20
+    overrides = {} if linger_ms is None else {'linger_ms': linger_ms}
+    producer = KafkaProducer(**connector_core.client_kwargs(config, 'producer', **overrides))
+    errors = []
+    count = 0
+    source = open(args.file, 'rb') if args.file else sys.stdin.buffer
+    try:
+        partition_count = len(producer.partitions_for(args.topic))
+        for line in source:
+            line = line.rstrip(b'\r\n')
+            if not line:
+                continue
+            if args.format == 'jsonl':
+                record = json.loads(line)
+                key = connector_core.decode_export_bytes(record.get('key'))
+                value = connector_core.decode_export_bytes(record.get('value'))
+                headers = [(name, connector_core.decode_export_bytes(v)) for name, v in record.get('headers', [])]
+                partition = record['partition'] % partition_count if args.keep_partitions and 'partition' in record else None
+                timestamp = record.get('timestamp') if args.keep_timestamps else None
+            else:
+                key = args.key.encode('utf-8') if args.key else None
+                value, headers, partition, timestamp = line, None, None, None
+            future = producer.send(args.topic, value=value, key=key, headers=headers or None,
+                                   partition=partition, timestamp_ms=timestamp)
+            future.add_errback(errors.append)
+            count += 1
+        producer.flush()
+    finally:
+        if args.file:
+            source.close()
+        producer.close(timeout=10)
+    print(f"Produced {count} records to '{args.topic}', {len(errors)} errors.", file=sys.stderr)
+    if errors:
+        print(f"Last error: {errors[-1]}", file=sys.stderr)
+        return 1
+    return 0
+
+def add_decode_arguments(parser):
+    parser.add_argument('--decode', choices=connector_core.deserializers, default='Text',
+                        help="value deserializer for the text format")
+    parser.add_argument('--schema-dir', default=connector_core.default_schema_dir,
+                        help="local schema mirror with one <id>.json per schema id")
+    parser.add_argument('--registry-url', help="fetch ids missing from the mirror from this schema registry")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='connector_cli', description="Magic Boar Kafka Connector, headless.")
+    parser.add_argument('--servers', default=connector_core.default_servers_file, help="servers.conf to read profiles from")
+    parser.add_argument('--server', help="profile name (default: first profile)")
+    parser.add_argument('--bootstrap-servers', help="connect over PLAINTEXT without a profile")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list-topics', help="print topic names").set_defaults(handler=list_topics)
+    commands.add_parser('describe-cluster', help="print cluster metadata as JSON").set_defaults(handler=describe_cluster)
+
+    tail_parser = commands.add_parser('tail', help="follow a topic")
+    tail_parser.add_argument('topic')
+    tail_parser.add_argument('--from', dest='start_at', choices=['earliest', 'latest'], default='latest')
+    tail_parser.add_argument('--partition', type=int, action='append', help="only these partitions (repeatable)")
+    tail_parser.add_argument('--max-records', type=int, help="exit after this many records")
+    tail_parser.add_argument('--format', choices=['text', 'jsonl', 'value'], default='text')
+    tail_parser.add_argument('--batch-records', type=int, default=2000)
+    add_decode_arguments(tail_parser)
+    tail_parser.set_defaults(handler=tail)
+
+    dump_parser = commands.add_parser('dump', help="write a range of a topic and exit")
+    dump_parser.add_argument('topic')
+    dump_parser.add_argument('--range', choices=['all', 'offsets', 'time'], default='all')
+    dump_parser.add_argument('--start', help="first offset, or ISO time for --range time")
+    dump_parser.add_argument('--end', help="end offset (exclusive), or ISO time for --range time")
+    dump_parser.add_argument('--format', choices=['text', 'jsonl', 'value'], default='jsonl')
+    dump_parser.add_argument('--output', help="write an export file instead of stdout")
+    dump_parser.add_argument('--output-format', choices=connector_core.export_formats, default='JSONL')
+    dump_parser.add_argument('--compression', choices=connector_core.export_compressions, default='None')
+    dump_parser.add_argument('--batch-records', type=int, default=2000)
+    add_decode_arguments(dump_parser)
+    dump_parser.set_defaults(handler=dump)
+
+    produce_parser = commands.add_parser('produce', help="send stdin (or a file) line by line")
+    produce_parser.add_argument('topic')
+    produce_parser.add_argument('--file', help="read from this file instead of stdin")
+    produce_parser.add_argument('--format', choices=['lines', 'jsonl'], default='lines',
+                                help="lines: each line is a value; jsonl: records as written by dump")
+    produce_parser.add_argument('--key', help="key for every record in lines format")
+    produce_parser.add_argument('--keep-partitions', action='store_true')
+    produce_parser.add_argument('--keep-timestamps', action='store_true')
+    produce_parser.add_argument('--linger-ms', type=int, help="default: the profile's tuning, or 20 without a preset")
+    produce_parser.set_defaults(handler=produce)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if hasattr(args, 'decode'):
+        args.registry = connector_core.schema_registry(args.schema_dir, args.registry_url)
+    out = sys.stdout.buffer
+    try:
+        return args.handler(select_server(args), args, out) or 0
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); silence the flush at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1201 @@
+"""
+Kafka helpers shared by the GUI and the command-line tool. Nothing here imports PyQt5,
+and kafka-python is only imported inside the functions that create clients.
+"""
+import os
+import json
+import time
+import re
+import csv
+import logging
+import threading
+import collections
+import bisect
+import struct
+import base64
+import zlib
+import lzma
+import gzip
+import mmap
+import io
+import hashlib
+import importlib.util
+
+default_servers_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servers.conf')
+default_server_config = {
+    'bootstrap_servers': 'localhost:9092',
+    'security_protocol': 'PLAINTEXT',
+    'sasl_mechanism': '',
+    'sasl_username': '',
+    'sasl_password': '',
+    'ssl_cafile': '',
+    'ssl_certfile': '',
+    'ssl_keyfile': '',
+    'tuning_preset': 'Default',
+}
+
+def load_servers(path=default_servers_file):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {'Default Server': dict(default_server_config)}
+
+def connection_kwargs(config):
+    return dict(
+        bootstrap_servers=config['bootstrap_servers'],
+        security_protocol=config['security_protocol'],
+        sasl_mechanism=config['sasl_mechanism'] or None,
+        sasl_plain_username=config['sasl_username'] or None,
+        sasl_plain_password=config['sasl_password'] or None,
+        ssl_cafile=config['ssl_cafile'] or None,
+        ssl_certfile=config['ssl_certfile'] or None,
+        ssl_keyfile=config['ssl_keyfile'] or None,
+    )
+
+# kafka-python's own defaults, which the 'Default' preset keeps
+tuning_defaults = {
+    'fetch_min_bytes': 1,
+    'fetch_max_wait_ms': 500,
+    'fetch_max_bytes': 50 * 1024 * 1024,
+    'max_partition_fetch_bytes': 1024 * 1024,
+    'max_poll_records': 500,
+    'receive_buffer_bytes': 0,
+    'linger_ms': 0,
+    'batch_size': 16 * 1024,
+    'compression_type': 'none',
+    'acks': '1',
+    'buffer_memory': 32 * 1024 * 1024,
+}
+tuning_presets = {
+    'Default': {},
+    'Low latency': {
+        'fetch_max_wait_ms': 10,
+        'max_poll_records': 100,
+    },
+    'High throughput': {
+        'fetch_min_bytes': 1024 * 1024,
+        'fetch_max_bytes': 100 * 1024 * 1024,
+        'max_partition_fetch_bytes': 8 * 1024 * 1024,
+        'max_poll_records': 5000,
+        'receive_buffer_bytes': 1024 * 1024,
+        'linger_ms': 50,
+        'batch_size': 512 * 1024,
+        'compression_type': 'gzip',
+        'buffer_memory': 128 * 1024 * 1024,
+    },
+    'WAN / high RTT': {
+        'fetch_min_bytes': 64 * 1024,
+        'fetch_max_wait_ms': 1000,
+        'fetch_max_bytes': 64 * 1024 * 1024,
+        'max_partition_fetch_bytes': 4 * 1024 * 1024,
+        'max_poll_records': 2000,
+        'receive_buffer_bytes': 4 * 1024 * 1024,
+        'linger_ms': 100,
+        'batch_size': 256 * 1024,
+        'compression_type': 'gzip',
+        'acks': 'all',
+        'buffer_memory': 64 * 1024 * 1024,
+    },
+}
+tuning_preset_names = list(tuning_presets) + ['Custom']
+tuning_client_keys = {
+    'consumer': ('fetch_min_bytes', 'fetch_max_wait_ms', 'fetch_max_bytes', 'max_partition_fetch_bytes',
+                 'max_poll_records', 'receive_buffer_bytes'),
+    'producer': ('linger_ms', 'batch_size', 'compression_type', 'acks', 'buffer_memory', 'receive_buffer_bytes'),
+    'admin': ('receive_buffer_bytes',),
+}
+compression_modules = {'snappy': 'snappy', 'lz4': 'lz4', 'zstd': 'zstandard'}
+
+def server_tuning(config):
+    """
+    Resolve a server profile's 'tuning_preset' (and, for 'Custom', its 'tuning' values)
+    into a full set of tuning values. Profiles without a preset get the library defaults.
+    """
+    tuning = dict(tuning_defaults)
+    preset = config.get('tuning_preset', 'Default')
+    if preset == 'Custom':
+        tuning.update((key, value) for key, value in config.get('tuning', {}).items() if key in tuning)
+    else:
+        tuning.update(tuning_presets.get(preset, {}))
+    return tuning
+
+def tuning_kwargs(tuning, kind):
+    kwargs = {key: tuning[key] for key in tuning_client_keys[kind]}
+    kwargs['receive_buffer_bytes'] = kwargs['receive_buffer_bytes'] or None
+    if kind == 'producer':
+        kwargs['compression_type'] = None if kwargs['compression_type'] == 'none' else kwargs['compression_type']
+        kwargs['acks'] = 'all' if kwargs['acks'] == 'all' else int(kwargs['acks'])
+    return kwargs
+
+def client_kwargs(config, kind, **overrides):
+    """
+    Constructor arguments for a 'producer', 'consumer' or 'admin' client: the profile's
+    connection settings plus its tuning, with per-operation overrides taking precedence.
+    """
+    return {**connection_kwargs(config), **tuning_kwargs(server_tuning(config), kind), **overrides}
+
+def tuning_warnings(tuning):
+    """
+    Describe combinations of tuning values that contradict each other or will not work.
+    """
+    warnings = []
+    if tuning['fetch_min_bytes'] > tuning['fetch_max_bytes']:
+        warnings.append("fetch_min_bytes is larger than fetch_max_bytes, so most fetches will wait the full fetch_max_wait_ms.")
+    if tuning['max_partition_fetch_bytes'] > tuning['fetch_max_bytes']:
+        warnings.append("max_partition_fetch_bytes is larger than fetch_max_bytes; the smaller limit applies.")
+    if tuning['fetch_max_wait_ms'] >= 305000:
+        warnings.append("fetch_max_wait_ms must stay below the consumer's 305 s request timeout, or consumers cannot be created.")
+    if tuning['fetch_min_bytes'] > 1 and tuning['fetch_max_wait_ms'] < 10:
+        warnings.append("fetch_min_bytes has little effect with fetch_max_wait_ms under 10 ms.")
+    if tuning['batch_size'] > tuning['buffer_memory']:
+        warnings.append("batch_size is larger than buffer_memory, so full batches can never be buffered.")
+    if tuning['compression_type'] != 'none' and tuning['linger_ms'] == 0:
+        warnings.append("compression with linger_ms 0 sends small batches that compress poorly.")
+    if str(tuning['acks']) == '0':
+        warnings.append("acks 0 never waits for the broker, so send errors and delivery latencies are not reported.")
+    if 0 < tuning['receive_buffer_bytes'] < 64 * 1024:
+        warnings.append("receive_buffer_bytes below 64 KB limits throughput on high-RTT links.")
+    module = compression_modules.get(tuning['compression_type'])
+    if module and importlib.util.find_spec(module) is None:
+        warnings.append(f"compression_type {tuning['compression_type']} needs the '{module}' package (pip install {module}).")
+    return warnings
+
+def attach_consumer(config, topic=None, start_at='earliest'):
+    """
+    Build a read-only consumer that never joins a consumer group or commits offsets.
+    With a topic, all of its partitions are assigned directly and positioned at
+    start_at ('earliest' or 'latest'), so records flow after a single metadata lookup.
+    """
+    from kafka import KafkaConsumer, TopicPartition
+    from kafka.errors import KafkaError
+    # 'earliest' so a seek below the log start (after retention) lands on the oldest record, not the tail
+    consumer = KafkaConsumer(**client_kwargs(config, 'consumer', group_id=None, enable_auto_commit=False,
+                                             auto_offset_reset='earliest'))
+    if topic is not None:
+        partitions = consumer.partitions_for_topic(topic)
+        if not partitions:
+            consumer.close()
+            raise KafkaError(f"Topic '{topic}' not found")
+        tps = [TopicPartition(topic, p) for p in sorted(partitions)]
+        consumer.assign(tps)
+        if start_at == 'latest':
+            consumer.seek_to_end(*tps)
+        else:
+            consumer.seek_to_beginning(*tps)
+    return consumer
+
+def to_bytes(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return json.dumps(value).encode('utf-8')
+
+class RecordFileReader:
+    """
+    Streams (key, value, headers, partition) tuples from a JSONL, CSV or raw-lines file.
+    `fields` maps 'key', 'value', 'headers' and 'partition' to JSON fields or CSV columns;
+    an empty value field sends the whole line (or the whole CSV row as JSON).
+    Lines that fail to parse are counted in parse_errors and skipped.
+    """
+    formats = ['JSONL', 'CSV', 'Raw lines']
+
+    def __init__(self, path, file_format, fields=None):
+        self.path = path
+        self.file_format = file_format
+        self.fields = fields or {}
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.parse_errors = 0
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            if self.file_format == 'CSV':
+                rows = csv.DictReader(line.decode('utf-8', errors='replace') for line in self._lines(f))
+                for row in rows:
+                    record = self._parse(self._from_mapping, row)
+                    if record:
+                        yield record
+            else:
+                for line in self._lines(f):
+                    line = line.rstrip(b'\r\n')
+                    if not line:
+                        continue
+                    if self.file_format == 'JSONL':
+                        record = self._parse(self._from_json_line, line)
+                        if record:
+                            yield record
+                    else:
+                        yield None, line, None, None
+
+    def _lines(self, f):
+        for line in f:
+            self.bytes_read += len(line)
+            yield line
+
+    def _parse(self, parser, item):
+        try:
+            return parser(item)
+        except (ValueError, TypeError, KeyError) as e:
+            self.parse_errors += 1
+            logging.debug(f"Skipping unparseable record in {self.path}: {e}")
+            return None
+
+    def _from_json_line(self, line):
+        obj = json.loads(line)
+        if not isinstance(obj, dict) or not self.fields.get('value'):
+            return self._from_mapping(obj if isinstance(obj, dict) else {}, whole=line)
+        return self._from_mapping(obj)
+
+    def _from_mapping(self, obj, whole=None):
+        value_field = self.fields.get('value')
+        if value_field:
+            value = to_bytes(obj[value_field])
+        else:
+            value = whole if whole is not None else to_bytes(obj)
+        key_field = self.fields.get('key')
+        key = to_bytes(obj.get(key_field)) if key_field else None
+        headers = None
+        headers_field = self.fields.get('headers')
+        if headers_field and obj.get(headers_field):
+            raw_headers = obj[headers_field]
+            if isinstance(raw_headers, str):
+                raw_headers = json.loads(raw_headers)
+            headers = [(str(k), to_bytes(v)) for k, v in raw_headers.items()]
+        partition = None
+        partition_field = self.fields.get('partition')
+        if partition_field and obj.get(partition_field) not in (None, ''):
+            partition = int(obj[partition_field])
+        return key, value, headers, partition
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies in microseconds. Each power of two is split
+    into 2**sub_bucket_bits linear sub-buckets, so recording is O(1), memory stays small and
+    every reported value is within about 1% of the true one.
+    """
+    def __init__(self, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sum = 0
+        self._lock = threading.Lock()
+
+    def bucket_index(self, value):
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return (shift << self.sub_bucket_bits) + (value >> shift)
+
+    def bucket_value(self, index):
+        shift = index >> self.sub_bucket_bits
+        lower = (index & ((1 << self.sub_bucket_bits) - 1)) << shift
+        return lower + ((1 << shift) - 1) // 2
+
+    def record(self, value_us):
+        value = max(int(value_us), 0)
+        index = self.bucket_index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.total += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        with self._lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.total += other.total
+            self.sum += other.sum
+            if other.total:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent):
+        with self._lock:
+            if not self.total:
+                return 0
+            target = max(1, int(round(self.total * percent / 100.0)))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= target:
+                    return min(self.bucket_value(index), self.max)
+            return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0
+
+    def summary(self):
+        return {
+            'count': self.total,
+            'min_us': self.min or 0,
+            'mean_us': round(self.mean(), 1),
+            'p50_us': self.percentile(50),
+            'p95_us': self.percentile(95),
+            'p99_us': self.percentile(99),
+            'p999_us': self.percentile(99.9),
+            'max_us': self.max or 0,
+        }
+
+    def to_dict(self):
+        summary = self.summary()
+        with self._lock:
+            summary['buckets'] = [[self.bucket_value(index), self.counts[index]] for index in sorted(self.counts)]
+        return summary
+
+    def format_bars(self, width=40):
+        # Fold the fine buckets into one row per power of two for display
+        with self._lock:
+            rows = {}
+            for index, count in self.counts.items():
+                upper = 1 << max(self.bucket_value(index).bit_length(), 1)
+                rows[upper] = rows.get(upper, 0) + count
+        if not rows:
+            return "(no samples)"
+        peak = max(rows.values())
+        lines = []
+        for upper in sorted(rows):
+            bar = '#' * max(1, round(rows[upper] * width / peak))
+            lines.append(f"<{upper / 1000:>10.2f} ms | {bar} {rows[upper]}")
+        return "\n".join(lines)
+
+    def format_summary(self):
+        summary = self.summary()
+        return (f"p50 {summary['p50_us'] / 1000:.2f} ms, p95 {summary['p95_us'] / 1000:.2f} ms, "
+                f"p99 {summary['p99_us'] / 1000:.2f} ms, p99.9 {summary['p999_us'] / 1000:.2f} ms, "
+                f"max {summary['max_us'] / 1000:.2f} ms")
+
+client_labels = {'producer': 'producer', 'consumer': 'consumer', 'admin': 'admin client'}
+
+def create_client(kind, config):
+    from kafka import KafkaProducer, KafkaConsumer
+    from kafka.admin import KafkaAdminClient
+    factories = {'producer': KafkaProducer, 'consumer': KafkaConsumer, 'admin': KafkaAdminClient}
+    return factories[kind](**client_kwargs(config, kind))
+
+def close_clients(clients):
+    for client in clients.values():
+        try:
+            client.close()
+        except Exception as e:
+            logging.error(f"Error closing client: {e}")
+
+class ClientPool:
+    """
+    Keeps the clients of recently used server profiles connected so switching back to a
+    cluster skips the TCP/TLS/SASL handshakes. Each client type is created on first use.
+    Profiles are evicted least recently used first and after idle_timeout seconds without
+    use (except the active one); a profile whose configuration changed is rebuilt.
+    acquire() may block on the network and is meant to be called from a worker thread.
+    """
+    def __init__(self, max_profiles=4, idle_timeout=600):
+        self.max_profiles = max_profiles
+        self.idle_timeout = idle_timeout
+        self.active = None
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, name, config, kind):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry['config'] != config:
+                return None
+            entry['last_used'] = time.monotonic()
+            return entry['clients'].get(kind)
+
+    def acquire(self, name, config, kind):
+        client = self.peek(name, config, kind)
+        if client is not None:
+            return client
+        client = create_client(kind, config)
+        stale = []
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry['config'] != config:
+                if entry is not None:
+                    stale.append(self._entries.pop(name))
+                entry = {'config': dict(config), 'clients': {}}
+                self._entries[name] = entry
+            pooled = entry['clients'].setdefault(kind, client)
+            entry['last_used'] = time.monotonic()
+            self._entries.move_to_end(name)
+        if pooled is not client:
+            # Another thread connected the same client first
+            client.close()
+        for old_entry in stale:
+            close_clients(old_entry['clients'])
+        self.evict()
+        return pooled
+
+    def set_active(self, name):
+        self.active = name
+        with self._lock:
+            if name in self._entries:
+                self._entries[name]['last_used'] = time.monotonic()
+                self._entries.move_to_end(name)
+
+    def rename(self, old_name, new_name):
+        if old_name == new_name:
+            return
+        self.discard(new_name)
+        with self._lock:
+            if old_name in self._entries:
+                self._entries[new_name] = self._entries.pop(old_name)
+        if self.active == old_name:
+            self.active = new_name
+
+    def discard(self, name):
+        with self._lock:
+            entry = self._entries.pop(name, None)
+        if entry:
+            close_clients(entry['clients'])
+            logging.info(f"Closed pooled clients for '{name}'.")
+        if self.active == name:
+            self.active = None
+
+    def evict(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [name for name, entry in self._entries.items()
+                       if name != self.active and now - entry['last_used'] > self.idle_timeout]
+            overflow = [name for name in self._entries if name != self.active and name not in expired]
+            expired += overflow[:max(0, len(self._entries) - len(expired) - self.max_profiles)]
+        for name in expired:
+            self.discard(name)
+
+    def close_all(self):
+        with self._lock:
+            names = list(self._entries)
+        for name in names:
+            self.discard(name)
+
+class TopicIndex:
+    """
+    Sorted topic names with lower-cased keys, built once per refresh and patched with the
+    added/removed names afterwards. Supports prefix (binary search), substring and fuzzy
+    (in-order characters) filtering; `within` narrows a previous result when the user
+    keeps typing.
+    """
+    modes = ['Substring', 'Prefix', 'Fuzzy']
+
+    def __init__(self, topics=()):
+        self.names = sorted(topics, key=lambda name: (name.lower(), name))
+        self.keys = [name.lower() for name in self.names]
+        self.version = 0
+
+    def update(self, topics):
+        topics = set(topics)
+        current = set(self.names)
+        added = sorted(topics - current)
+        removed = sorted(current - topics)
+        for name in removed:
+            self.remove(name)
+        for name in added:
+            self.add(name)
+        return added, removed
+
+    def add(self, name):
+        key = name.lower()
+        position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key and self.names[position] < name:
+            position += 1
+        if position < len(self.names) and self.names[position] == name:
+            return
+        self.names.insert(position, name)
+        self.keys.insert(position, key)
+        self.version += 1
+
+    def remove(self, name):
+        key = name.lower()
+        position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.names[position] == name:
+                del self.names[position]
+                del self.keys[position]
+                self.version += 1
+                return
+            position += 1
+
+    def filter(self, query, mode='Substring', within=None):
+        query = query.lower()
+        if not query:
+            return list(self.names)
+        if mode == 'Prefix':
+            first = bisect.bisect_left(self.keys, query)
+            last = bisect.bisect_left(self.keys, query + '\U0010ffff')
+            return self.names[first:last]
+        candidates = within if within is not None else self.names
+        if mode == 'Fuzzy':
+            pattern = re.compile('.*?'.join(re.escape(ch) for ch in query))
+            scored = []
+            for name in candidates:
+                match = pattern.search(name.lower())
+                if match:
+                    scored.append((match.end() - match.start(), match.start(), name))
+            scored.sort()
+            return [name for _, _, name in scored]
+        return [name for name in candidates if query in name.lower()]
+
+class TopicCache:
+    """
+    Topic name index per server profile with a time-to-live. Stale entries are still served
+    while a background refresh runs; fetches share one lock so only one metadata request
+    per cache is in flight. update() must be called on the GUI thread.
+    """
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._entries = {}
+        self._fetch_lock = threading.Lock()
+
+    def get(self, server_name):
+        entry = self._entries.get(server_name)
+        return entry['index'] if entry else None
+
+    def is_stale(self, server_name):
+        entry = self._entries.get(server_name)
+        return entry is None or time.monotonic() - entry['fetched_at'] > self.ttl
+
+    def fetch_topics(self, pool, server_name, config):
+        with self._fetch_lock:
+            consumer = pool.acquire(server_name, config, 'consumer')
+            return sorted(consumer.topics())
+
+    def update(self, server_name, topics):
+        entry = self._entries.get(server_name)
+        if entry is None:
+            entry = {'index': TopicIndex(topics)}
+            self._entries[server_name] = entry
+            added, removed = list(entry['index'].names), []
+        else:
+            added, removed = entry['index'].update(topics)
+        entry['fetched_at'] = time.monotonic()
+        return entry['index'], added, removed
+
+    def invalidate(self, server_name):
+        self._entries.pop(server_name, None)
+
+def resolve_offset_ranges(consumer, topic, range_kind='All', start=None, end=None):
+    """
+    Map each partition of topic to a [first, last) offset range. range_kind 'Offsets' clamps
+    start/end to the log, 'Time' resolves millisecond timestamps with offsets_for_times and
+    'All' takes the whole log; every lookup is one batched request for all partitions.
+    A bound left as None means the log start or end.
+    """
+    from kafka import TopicPartition
+    from kafka.errors import KafkaError
+    partitions = consumer.partitions_for_topic(topic)
+    if not partitions:
+        raise KafkaError(f"Topic '{topic}' not found")
+    tps = [TopicPartition(topic, p) for p in sorted(partitions)]
+    begin_offsets = consumer.beginning_offsets(tps)
+    end_offsets = consumer.end_offsets(tps)
+    if range_kind == 'Time':
+        start_offsets = consumer.offsets_for_times({tp: start for tp in tps}) if start is not None else None
+        stop_offsets = consumer.offsets_for_times({tp: end for tp in tps}) if end is not None else None
+    ranges = {}
+    for tp in tps:
+        first, last = begin_offsets[tp], end_offsets[tp]
+        if range_kind == 'Offsets':
+            first = max(first, start) if start is not None else first
+            last = min(last, end) if end is not None else last
+        elif range_kind == 'Time':
+            if start_offsets is not None:
+                first = start_offsets[tp].offset if start_offsets[tp] else last
+            if stop_offsets is not None:
+                last = stop_offsets[tp].offset if stop_offsets[tp] else last
+        ranges[tp] = (first, max(first, last))
+    return ranges
+
+search_modes = ['Substring', 'Regex', 'JSON path', 'Key']
+search_preview_bytes = 64 * 1024
+_search_predicates = {}
+
+def json_path_lookup(document, path):
+    for part in re.findall(r'[^.\[\]]+', path):
+        document = document[int(part)] if isinstance(document, list) else document[part]
+    return document
+
+def compile_search_predicate(mode, pattern):
+    """
+    Build predicate(key, value) over raw record bytes. Substring and regex matching run on
+    bytes without decoding; JSON path patterns look like 'order.items[0].id=42' and only
+    parse values that contain the expected text when it has no JSON-escapable characters.
+    """
+    predicate = _search_predicates.get((mode, pattern))
+    if predicate is not None:
+        return predicate
+    if mode == 'Substring':
+        needle = pattern.encode('utf-8')
+        predicate = lambda key, value: value is not None and needle in value
+    elif mode == 'Regex':
+        regex = re.compile(pattern.encode('utf-8'))
+        predicate = lambda key, value: value is not None and regex.search(value) is not None
+    elif mode == 'Key':
+        expected_key = pattern.encode('utf-8')
+        predicate = lambda key, value: key == expected_key
+    elif mode == 'JSON path':
+        path, separator, expected_text = pattern.partition('=')
+        if not separator:
+            raise ValueError("JSON path pattern must look like 'path=value'")
+        path, expected_text = path.strip(), expected_text.strip()
+        try:
+            expected = json.loads(expected_text)
+        except ValueError:
+            expected = expected_text
+        prefilter = expected_text.encode('utf-8') if isinstance(expected, str) and re.fullmatch(r'[\w.\-+: ]*', expected_text) else None
+        def predicate(key, value):
+            if value is None or (prefilter is not None and prefilter not in value):
+                return False
+            try:
+                found = json_path_lookup(json.loads(value), path)
+            except (ValueError, KeyError, IndexError, TypeError):
+                return False
+            return found == expected or (isinstance(found, (str, int, float)) and str(found) == expected_text)
+    else:
+        raise ValueError(f"Unknown search mode '{mode}'")
+    _search_predicates[(mode, pattern)] = predicate
+    return predicate
+
+def search_batch(mode, pattern, records):
+    """
+    Worker-pool entry point: match (partition, offset, timestamp, key, value) records and
+    return the hits, with values cut to search_preview_bytes.
+    """
+    predicate = compile_search_predicate(mode, pattern)
+    return [
+        (partition, offset, timestamp, key, value if value is None else value[:search_preview_bytes])
+        for partition, offset, timestamp, key, value in records
+        if predicate(key, value)
+    ]
+
+export_formats = ['JSONL', 'Binary']
+export_compressions = ['None', 'gzip', 'lzma']
+export_magic = b'KXP1'
+export_record_header = struct.Struct('>iqqii')
+
+def encode_export_bytes(data):
+    if data is None:
+        return None
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return {'b64': base64.b64encode(data).decode('ascii')}
+
+def decode_export_bytes(data):
+    if data is None or isinstance(data, bytes):
+        return data
+    if isinstance(data, dict):
+        return base64.b64decode(data['b64'])
+    return data.encode('utf-8')
+
+def pack_export_record(partition, offset, timestamp, key, value, headers):
+    """
+    Binary export record: a 4-byte big-endian length, then partition, offset, timestamp and
+    key/value lengths (-1 for None), the key and value bytes, a 2-byte header count and each
+    header as a 2-byte name length, name, 4-byte value length and value.
+    """
+    parts = [export_record_header.pack(
+        partition, offset, timestamp,
+        -1 if key is None else len(key), -1 if value is None else len(value),
+    )]
+    if key:
+        parts.append(key)
+    if value:
+        parts.append(value)
+    headers = headers or []
+    parts.append(struct.pack('>H', len(headers)))
+    for name, header_value in headers:
+        name = name.encode('utf-8')
+        header_value = header_value or b''
+        parts.append(struct.pack('>H', len(name)))
+        parts.append(name)
+        parts.append(struct.pack('>i', len(header_value)))
+        parts.append(header_value)
+    body = b''.join(parts)
+    return struct.pack('>I', len(body)) + body
+
+def json_export_record(partition, offset, timestamp, key, value, headers):
+    record = {
+        'partition': partition,
+        'offset': offset,
+        'timestamp': timestamp,
+        'key': encode_export_bytes(key),
+        'value': encode_export_bytes(value),
+    }
+    if headers:
+        record['headers'] = [[name, encode_export_bytes(header_value)] for name, header_value in headers]
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+class ExportWriter:
+    """
+    Appends encoded records to an export file through a bounded in-memory buffer and an
+    optional streaming compressor. checkpoint() ends the current gzip member/lzma stream,
+    so the file is valid up to the returned size and a resume can truncate to it and
+    continue with a new member.
+    """
+    def __init__(self, path, file_format, compression='None', resume_size=None, buffer_bytes=1024 * 1024):
+        self.file_format = file_format
+        self.compression = compression
+        self.buffer_bytes = buffer_bytes
+        self.encode = pack_export_record if file_format == 'Binary' else json_export_record
+        if resume_size is None:
+            self.file = open(path, 'wb')
+        else:
+            self.file = open(path, 'r+b')
+            self.file.truncate(resume_size)
+            self.file.seek(resume_size)
+        self.buffer = []
+        self.buffered = 0
+        self.compressor = self._new_compressor()
+        if resume_size is None and file_format == 'Binary':
+            self._append(export_magic)
+
+    def _new_compressor(self):
+        if self.compression == 'gzip':
+            return zlib.compressobj(6, zlib.DEFLATED, 31)
+        if self.compression == 'lzma':
+            return lzma.LZMACompressor()
+        return None
+
+    def _append(self, data):
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= self.buffer_bytes:
+            self.flush_buffer()
+
+    def write(self, partition, offset, timestamp, key, value, headers):
+        self._append(self.encode(partition, offset, timestamp, key, value, headers))
+
+    def flush_buffer(self):
+        if not self.buffer:
+            return
+        data = b''.join(self.buffer)
+        self.buffer = []
+        self.buffered = 0
+        self.file.write(self.compressor.compress(data) if self.compressor else data)
+
+    def checkpoint(self):
+        self.flush_buffer()
+        if self.compressor:
+            self.file.write(self.compressor.flush())
+            self.compressor = self._new_compressor()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+def load_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(path, checkpoint):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, path)
+
+def unpack_export_record(buffer, pos):
+    """
+    Decode one binary export record body starting at pos (after its length prefix).
+    """
+    partition, offset, timestamp, key_length, value_length = export_record_header.unpack_from(buffer, pos)
+    pos += export_record_header.size
+    key = None if key_length < 0 else bytes(buffer[pos:pos + key_length])
+    pos += max(key_length, 0)
+    value = None if value_length < 0 else bytes(buffer[pos:pos + value_length])
+    pos += max(value_length, 0)
+    (header_count,) = struct.unpack_from('>H', buffer, pos)
+    pos += 2
+    headers = []
+    for _ in range(header_count):
+        (name_length,) = struct.unpack_from('>H', buffer, pos)
+        name = bytes(buffer[pos + 2:pos + 2 + name_length]).decode('utf-8')
+        pos += 2 + name_length
+        (header_length,) = struct.unpack_from('>i', buffer, pos)
+        headers.append((name, bytes(buffer[pos + 4:pos + 4 + header_length])))
+        pos += 4 + header_length
+    return partition, offset, timestamp, key, value, headers
+
+class ExportFileReader:
+    """
+    Streams (partition, offset, timestamp, key, value, headers) tuples back from an export
+    file in either format. Compression is detected from the leading bytes. Uncompressed
+    binary files are walked through an mmap; compressed files are decompressed as a stream.
+    A truncated trailing record counts as a parse error and ends the file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.parse_errors = 0
+        with open(path, 'rb') as f:
+            head = f.read(6)
+        if head[:2] == b'\x1f\x8b':
+            self.compression = 'gzip'
+        elif head == b'\xfd7zXZ\x00':
+            self.compression = 'lzma'
+        else:
+            self.compression = 'None'
+
+    def __iter__(self):
+        with open(self.path, 'rb') as raw:
+            if self.compression == 'None':
+                if raw.read(len(export_magic)) == export_magic:
+                    yield from self._mapped_records(raw)
+                else:
+                    raw.seek(0)
+                    yield from self._json_records(raw, raw)
+                return
+            stream = gzip.GzipFile(fileobj=raw) if self.compression == 'gzip' else lzma.LZMAFile(raw)
+            with stream:
+                if stream.peek(len(export_magic))[:len(export_magic)] == export_magic:
+                    stream.read(len(export_magic))
+                    yield from self._streamed_records(stream, raw)
+                else:
+                    yield from self._json_records(stream, raw)
+
+    def _mapped_records(self, raw):
+        if self.total_bytes <= len(export_magic):
+            return
+        with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            pos = len(export_magic)
+            end = len(mapped)
+            while pos + 4 <= end:
+                (length,) = struct.unpack_from('>I', mapped, pos)
+                if pos + 4 + length > end:
+                    self.parse_errors += 1
+                    break
+                record = unpack_export_record(mapped, pos + 4)
+                pos += 4 + length
+                self.bytes_read = pos
+                yield record
+
+    def _streamed_records(self, stream, raw):
+        while True:
+            prefix = stream.read(4)
+            if len(prefix) < 4:
+                if prefix:
+                    self.parse_errors += 1
+                break
+            (length,) = struct.unpack('>I', prefix)
+            body = stream.read(length)
+            if len(body) < length:
+                self.parse_errors += 1
+                break
+            self.bytes_read = raw.tell()
+            yield unpack_export_record(body, 0)
+
+    def _json_records(self, stream, raw):
+        for line in stream:
+            self.bytes_read = raw.tell()
+            try:
+                record = json.loads(line)
+                yield (
+                    record['partition'], record['offset'], record['timestamp'],
+                    decode_export_bytes(record['key']), decode_export_bytes(record['value']),
+                    [(name, decode_export_bytes(value)) for name, value in record.get('headers', [])],
+                )
+            except (ValueError, TypeError, KeyError) as e:
+                self.parse_errors += 1
+                logging.debug(f"Skipping unparseable record in {self.path}: {e}")
+
+default_schema_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schemas')
+deserializers = ['Text', 'JSON', 'Avro', 'Protobuf', 'MessagePack']
+confluent_header = struct.Struct('>bI')
+
+def split_confluent_frame(value):
+    """
+    Split a Confluent wire-format value (magic byte 0, 4-byte schema id) into
+    (schema_id, payload); schema_id is None when the value carries no such prefix.
+    """
+    if len(value) >= confluent_header.size and value[0] == 0:
+        _, schema_id = confluent_header.unpack_from(value)
+        return schema_id, value[confluent_header.size:]
+    return None, value
+
+proto_token_pattern = re.compile(r'(message|enum|oneof|service|extend)\s+([\w.]+)\s*\{|\{|\}|([^{};]*);')
+proto_field_pattern = re.compile(r'^\s*(optional|required|repeated)?\s*(map\s*<[^>]*>|[\w.]+)\s+(\w+)\s*=\s*(\d+)')
+
+def parse_proto_schema(text):
+    """
+    Read the message layout out of .proto source: {message: {'number': [name, type, repeated]}},
+    the enum names, and the child messages of every scope in declaration order ('' is the
+    file), which is what Confluent message indexes count through. Nested names are keyed by
+    their last component, so same-named nested messages in different parents share one layout.
+    """
+    text = re.sub(r'//[^\n]*|/\*.*?\*/', '', text, flags=re.S)
+    messages, children, enums, stack = {}, {'': []}, [], []
+    for match in proto_token_pattern.finditer(text):
+        kind, name, statement = match.groups()
+        if kind:
+            if kind == 'message':
+                scope = next((n for k, n in reversed(stack) if k == 'message'), '')
+                children.setdefault(scope, []).append(name)
+                messages[name], children[name] = {}, []
+            elif kind == 'enum':
+                enums.append(name)
+            stack.append((kind, name))
+        elif match.group(0) == '{':
+            stack.append(('block', None))
+        elif match.group(0) == '}':
+            if stack:
+                stack.pop()
+        elif statement and stack and stack[-1][0] in ('message', 'oneof'):
+            field = proto_field_pattern.match(statement)
+            owner = next((n for k, n in reversed(stack) if k == 'message'), None)
+            if field and owner:
+                label, field_type, field_name, number = field.groups()
+                is_map = field_type.startswith('map')
+                # String keys and lists so the layout round-trips through the JSON reader cache
+                messages[owner][number] = [
+                    field_name, None if is_map else field_type.rsplit('.', 1)[-1], label == 'repeated' or is_map]
+    return {'messages': messages, 'children': children, 'enums': enums}
+
+def read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+def zigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+protobuf_fixed = {
+    1: (8, {'double': '<d', 'sfixed64': '<q'}, '<Q'),
+    5: (4, {'float': '<f', 'sfixed32': '<i'}, '<I'),
+}
+protobuf_varint_types = {'int32', 'int64', 'uint32', 'uint64', 'sint32', 'sint64', 'bool', 'enum'}
+protobuf_packed_fixed = {'double': '<d', 'float': '<f', 'fixed64': '<Q', 'sfixed64': '<q', 'fixed32': '<I', 'sfixed32': '<i'}
+
+def convert_varint(raw, field_type):
+    if field_type in ('sint32', 'sint64'):
+        return zigzag(raw)
+    if field_type == 'bool':
+        return bool(raw)
+    return raw - (1 << 64) if raw >= 1 << 63 else raw
+
+def decode_protobuf(data, message, layout):
+    """
+    Decode protobuf wire format, naming fields from layout where the schema declares them
+    and using field numbers otherwise. Undeclared length-delimited fields are shown as
+    text when they are valid UTF-8 and as hex when not.
+    """
+    messages = layout['messages']
+    enums = layout.get('enums', ())
+    fields = messages.get(message, {})
+    decoded = {}
+    pos = 0
+    while pos < len(data):
+        tag, pos = read_varint(data, pos)
+        number, wire_type = tag >> 3, tag & 7
+        name, field_type, repeated = fields.get(str(number), (str(number), None, False))
+        packed = False
+        if wire_type == 0:
+            raw, pos = read_varint(data, pos)
+            value = convert_varint(raw, field_type)
+        elif wire_type in protobuf_fixed:
+            size, formats, default_format = protobuf_fixed[wire_type]
+            value = struct.unpack(formats.get(field_type, default_format), data[pos:pos + size])[0]
+            pos += size
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            chunk = bytes(data[pos:pos + length])
+            pos += length
+            if field_type in messages:
+                value = decode_protobuf(chunk, field_type, layout)
+            elif field_type == 'bytes':
+                value = chunk.hex()
+            elif field_type in protobuf_packed_fixed:
+                value = [item for item, in struct.iter_unpack(protobuf_packed_fixed[field_type], chunk)]
+                packed = True
+            elif field_type in protobuf_varint_types or field_type in enums:
+                value, inner = [], 0
+                while inner < len(chunk):
+                    raw, inner = read_varint(chunk, inner)
+                    value.append(convert_varint(raw, field_type))
+                packed = True
+            else:
+                try:
+                    value = chunk.decode('utf-8')
+                except UnicodeDecodeError:
+                    value = chunk.hex()
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type} for field {number}")
+        if repeated or packed:
+            # Repeated scalars may arrive one per tag (proto2 default) or packed, in any mix
+            values = decoded.setdefault(name, [])
+            if packed:
+                values.extend(value)
+            else:
+                values.append(value)
+        elif name in decoded:
+            # An undeclared field seen twice is repeated
+            if not isinstance(decoded[name], list):
+                decoded[name] = [decoded[name]]
+            decoded[name].append(value)
+        else:
+            decoded[name] = value
+    return decoded
+
+class SchemaRegistry:
+    """
+    Resolves Confluent schema ids from a local mirror directory holding <id>.json files in
+    the registry's GET /schemas/ids/<id> response format. With a url, ids missing from the
+    mirror are fetched once and written into it. Compiled readers (plain dicts) are kept
+    in memory and as JSON under <directory>/compiled, named by a hash of the registry url,
+    the reader kind and the schema text, so a replaced schema or another registry's id
+    never reuses a stale reader. JSON rather than pickle, since the mirror may be shared.
+    """
+    def __init__(self, directory=default_schema_dir, url=None):
+        self.directory = directory
+        self.url = url.rstrip('/') if url else None
+        self._readers = {}
+        self._lock = threading.Lock()
+
+    def schema(self, schema_id):
+        path = os.path.join(self.directory, f"{schema_id}.json")
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            if not self.url:
+                raise LookupError(f"Schema {schema_id} is not in {self.directory}") from None
+        import urllib.request
+        with urllib.request.urlopen(f"{self.url}/schemas/ids/{schema_id}", timeout=10) as response:
+            schema = json.load(response)
+        os.makedirs(self.directory, exist_ok=True)
+        save_checkpoint(path, schema)
+        return schema
+
+    def reader(self, schema_id, kind):
+        key = (schema_id, kind)
+        with self._lock:
+            reader = self._readers.get(key)
+            if reader is None:
+                reader = self._load_reader(schema_id, kind)
+                self._readers[key] = reader
+            return reader
+
+    def _load_reader(self, schema_id, kind):
+        schema = self.schema(schema_id)
+        digest = hashlib.sha256('\0'.join((self.url or '', kind, schema['schema'])).encode('utf-8')).hexdigest()
+        cache_path = os.path.join(self.directory, 'compiled', f"{kind.lower()}-{digest}.json")
+        reader = load_checkpoint(cache_path)
+        if reader is not None:
+            return reader
+        if kind == 'Avro':
+            fastavro = import_optional('fastavro', 'Avro')
+            reader = fastavro.parse_schema(json.loads(schema['schema']))
+        else:
+            reader = parse_proto_schema(schema['schema'])
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            save_checkpoint(cache_path, reader)
+        except (OSError, TypeError, ValueError) as e:
+            logging.debug(f"Could not cache schema {schema_id}: {e}")
+        return reader
+
+_schema_registries = {}
+
+def schema_registry(directory=default_schema_dir, url=None):
+    """
+    Shared registry per (directory, url), so worker processes that are handed only the
+    location keep their compiled readers between batches.
+    """
+    registry = _schema_registries.get((directory, url))
+    if registry is None:
+        registry = _schema_registries[(directory, url)] = SchemaRegistry(directory, url)
+    return registry
+
+def import_optional(module, deserializer):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise ImportError(f"{deserializer} decoding needs the '{module}' package (pip install {module})") from None
+
+def decode_json(value, registry):
+    return json.loads(split_confluent_frame(value)[1])
+
+def decode_avro(value, registry):
+    schema_id, payload = split_confluent_frame(value)
+    if schema_id is None:
+        raise ValueError("No Confluent schema id prefix")
+    fastavro = import_optional('fastavro', 'Avro')
+    return fastavro.schemaless_reader(io.BytesIO(payload), registry.reader(schema_id, 'Avro'))
+
+def decode_protobuf_value(value, registry):
+    schema_id, payload = split_confluent_frame(value)
+    if schema_id is None:
+        return decode_protobuf(payload, None, {'messages': {}, 'children': {}, 'enums': []})
+    layout = registry.reader(schema_id, 'Protobuf')
+    # Message indexes: a zigzag varint count, then one zigzag varint per nesting level;
+    # a single 0 byte is shorthand for the first top-level message
+    count, pos = read_varint(payload, 0)
+    path = []
+    for _ in range(zigzag(count)):
+        index, pos = read_varint(payload, pos)
+        path.append(zigzag(index))
+    message = ''
+    for index in path or [0]:
+        message = layout['children'].get(message, [None])[index]
+    return decode_protobuf(payload[pos:], message, layout)
+
+def decode_msgpack(value, registry):
+    msgpack = import_optional('msgpack', 'MessagePack')
+    return msgpack.unpackb(bytes(value), raw=False, strict_map_key=False)
+
+decoders = {'JSON': decode_json, 'Avro': decode_avro, 'Protobuf': decode_protobuf_value, 'MessagePack': decode_msgpack}
+
+def json_fallback(value):
+    if isinstance(value, (bytes, bytearray)):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value.hex()
+    return str(value)
+
+def format_value(value, deserializer='Text', registry=None, indent=4):
+    """
+    Render a raw record value as (text, is_json). 'Text' pretty-prints JSON when the value
+    parses and falls back to UTF-8; the schema-aware deserializers fall back to an error
+    line followed by the UTF-8 text, so a wrong choice never hides the payload.
+    """
+    if value is None:
+        return "", False
+    if deserializer == 'Text':
+        try:
+            return json.dumps(json.loads(value), indent=indent), True
+        except (ValueError, TypeError):
+            return bytes(value).decode('utf-8', errors='replace'), False
+    try:
+        decoded = decoders[deserializer](value, registry or schema_registry())
+    except Exception as e:
+        text = bytes(value).decode('utf-8', errors='replace')
+        return f"[{deserializer} decode failed: {e}] {text}", False
+    return json.dumps(decoded, indent=indent, default=json_fallback, ensure_ascii=False), True
+
+def format_consumed_message(offset, key, value, deserializer='Text', registry=None):
+    if deserializer == 'Text':
+        decoded = "" if value is None else bytes(value).decode('utf-8', errors='replace')
+    else:
+        decoded, _ = format_value(value, deserializer, registry, indent=None)
+    return f"Offset: {offset}, Key: {key}, Value: {decoded}"
+
+def format_consumed_batch(records, deserializer='Text', registry_location=None):
+    """
+    Worker-pool entry point: format (offset, key, value) records into output lines.
+    registry_location is a (directory, url) pair rather than a registry, so it pickles.
+    """
+    registry = schema_registry(*registry_location) if registry_location else None
+    return [format_consumed_message(offset, key, value, deserializer, registry) for offset, key, value in records]
@@ -3,10 +3,25 @@ import os
 import datetime
 import logging
 import json
+import time
+import queue
+import collections
+import re
+import codecs
+import itertools
+import threading
+import multiprocessing
+import concurrent.futures
+startup_started = time.perf_counter()
 from PyQt5 import QtWidgets, QtGui, QtCore
-from kafka import KafkaProducer, KafkaConsumer
-from kafka.errors import KafkaError
-from kafka.admin import KafkaAdminClient, NewTopic
+from connector_core import (
+    default_servers_file, load_servers, client_kwargs, attach_consumer, RecordFileReader,
+    tuning_defaults, tuning_preset_names, server_tuning, tuning_warnings,
+    LatencyHistogram, client_labels, create_client, ClientPool, TopicIndex, TopicCache, resolve_offset_ranges,
+    search_modes, search_preview_bytes, compile_search_predicate, search_batch,
+    export_formats, export_compressions, ExportWriter, ExportFileReader, load_checkpoint, save_checkpoint,
+    format_consumed_batch, deserializers, default_schema_dir, schema_registry, format_value,
+)
 
 minimal_light_style = """
 QWidget {
@@ -41,7 +56,7 @@ QComboBox, QSpinBox, QInputDialog {
     border-radius: 4px;
     padding: 4px;
 }
-QListWidget {
+QListWidget, QListView {
     background-color: #ffffff;
     color: #333333;
     border: 1px solid #cccccc;
@@ -98,7 +113,7 @@ QComboBox, QSpinBox, QInputDialog {
     border-radius: 4px;
     padding: 4px;
 }
-QListWidget {
+QListWidget, QListView {
     background-color: #3c3c3c;
     color: #f0f0f0;
     border: 1px solid #555555;
@@ -133,63 +148,140 @@ def resource_path(filename):
         # Construct path inside _MEIPASS
         path_in_meipass = os.path.join(base_path, filename)
         if os.path.exists(path_in_meipass):
-            print(f"[DEBUG] Found {filename} in _MEIPASS: {path_in_meipass}")
+            logging.debug(f"Found {filename} in _MEIPASS: {path_in_meipass}")
             return path_in_meipass
         else:
-            print(f"[DEBUG] {filename} not in _MEIPASS, falling back to local resources folder.")
+            logging.debug(f"{filename} not in _MEIPASS, falling back to local resources folder.")
 
     # 2. Otherwise, or if not found above, fallback to a local "resources" folder
     fallback_dir = os.path.join(os.path.dirname(__file__), "resources")
     path_local = os.path.join(fallback_dir, filename)
-    print(f"[DEBUG] Fallback path for {filename}: {path_local}, exists={os.path.exists(path_local)}")
+    logging.debug(f"Fallback path for {filename}: {path_local}")
     return path_local
 
+log_filename = None
+
 def setup_logging(enabled=True):
-    from PyQt5.QtCore import QStandardPaths, QCoreApplication
-    QCoreApplication.setApplicationName("Magic Boar Kafka Connector")
-    QCoreApplication.setOrganizationName("MagicBoar")
-    app_data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
-    if not os.path.exists(app_data_dir):
-        os.makedirs(app_data_dir, exist_ok=True)
-    log_filename = os.path.join(
-        app_data_dir,
-        f"log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-    )
-    if enabled:
+    """
+    The log file is created the first time logging is enabled; later calls only switch
+    logging on or off.
+    """
+    global log_filename
+    if enabled and log_filename is None:
+        from PyQt5.QtCore import QStandardPaths, QCoreApplication
+        QCoreApplication.setApplicationName("Magic Boar Kafka Connector")
+        QCoreApplication.setOrganizationName("MagicBoar")
+        app_data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        if not os.path.exists(app_data_dir):
+            os.makedirs(app_data_dir, exist_ok=True)
+        log_filename = os.path.join(
+            app_data_dir,
+            f"log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
         logging.basicConfig(
             filename=log_filename,
             level=logging.DEBUG,
-            format='%(asctime)s - %(levelname)s - %(message)s'
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            force=True
         )
-        logging.disable(logging.NOTSET)
-    else:
-        logging.basicConfig(level=logging.CRITICAL)
-        logging.disable(logging.CRITICAL)
+    logging.disable(logging.NOTSET if enabled else logging.CRITICAL)
     return log_filename
 
+class StartupProfile:
+    """
+    Time spent in each startup phase, measured from the start of module import. Enabled with
+    --startup-profile or MAGICBOAR_STARTUP_PROFILE=1; the report goes to stderr and the log.
+    """
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.phases = []
+        self.enabled = '--startup-profile' in sys.argv or os.environ.get('MAGICBOAR_STARTUP_PROFILE') == '1'
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        lines = [f"{phase:<16} {elapsed * 1000:8.1f} ms" for phase, elapsed in self.phases]
+        lines.append(f"{'total':<16} {(self.last - self.started) * 1000:8.1f} ms")
+        text = "Startup profile:\n" + "\n".join(lines)
+        print(text, file=sys.stderr)
+        logging.info(text)
+
+startup_profile = StartupProfile(startup_started)
+
+class TaskThread(QtCore.QThread):
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+        self.result = None
+        self.error = None
+    def run(self):
+        try:
+            self.result = self.task()
+        except Exception as e:
+            self.error = str(e)
+
+class TopicRefreshThread(QtCore.QThread):
+    topics_signal = QtCore.pyqtSignal(str, list)
+    def __init__(self, topic_cache, pool, server_name, config):
+        super().__init__()
+        self.topic_cache = topic_cache
+        self.pool = pool
+        self.server_name = server_name
+        self.config = config
+    def run(self):
+        try:
+            topics = self.topic_cache.fetch_topics(self.pool, self.server_name, self.config)
+            self.topics_signal.emit(self.server_name, topics)
+        except Exception as e:
+            logging.error(f"Error refreshing topics for '{self.server_name}': {e}")
+
 class KafkaApp(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         # Set app icon from resource_path
-        icon_file = resource_path("logo.ico")
-        print(f"[DEBUG] Icon path={icon_file}, exists={os.path.exists(icon_file)}")
-        self.setWindowIcon(QtGui.QIcon(icon_file))
+        self.setWindowIcon(QtGui.QIcon(resource_path("logo.ico")))
 
         self.setWindowTitle("Magic Boar Kafka Connector")
         self.setGeometry(100, 100, 1200, 600)
         self.servers = {}
-        self.producer = None
-        self.consumer = None
-        self.admin_client = None
+        self.current_server = None
+        self.background_threads = []
+        self.connect_timeout_ms = 15000
+        self.topic_cache = TopicCache()
+        self.topic_refresh_thread = None
+        self.topic_picker = None
         self.consume_thread = None
+        self.send_thread = None
+        self.send_count = 0
+        self.pending_sends = {}
+        self.max_send_rows = 500
         self.current_config = None
+        self.client_pool = ClientPool()
+        self.pool_timer = QtCore.QTimer(self)
+        self.pool_timer.timeout.connect(self.client_pool.evict)
+        self.pool_timer.start(60 * 1000)
+        self.topic_timer = QtCore.QTimer(self)
+        self.topic_timer.timeout.connect(self.refresh_topics_if_stale)
+        self.topic_timer.start(self.topic_cache.ttl * 1000)
+
+        self.applied_theme = None
 
         self.init_ui()
+        startup_profile.mark("init_ui")
         self.load_servers()
+        startup_profile.mark("load_servers")
         self.load_settings()
+        startup_profile.mark("load_settings")
 
         if self.server_combo.count() > 0:
             self.server_combo.setCurrentIndex(0)
+        startup_profile.mark("select_server")
 
     def init_ui(self):
         self.central_widget = QtWidgets.QWidget()
@@ -219,6 +311,47 @@ class KafkaApp(QtWidgets.QMainWindow):
         self.describe_cluster_action = QtWidgets.QAction('Describe Cluster', self)
         self.describe_cluster_action.triggered.connect(self.describe_cluster)
         self.admin_menu.addAction(self.describe_cluster_action)
+        self.topic_inventory_action = QtWidgets.QAction('Topic Inventory', self)
+        self.topic_inventory_action.triggered.connect(self.topic_inventory)
+        self.admin_menu.addAction(self.topic_inventory_action)
+        self.consumer_lag_action = QtWidgets.QAction('Consumer Lag', self)
+        self.consumer_lag_action.triggered.connect(self.consumer_lag)
+        self.admin_menu.addAction(self.consumer_lag_action)
+
+        self.tools_menu = self.menu_bar.addMenu('Tools')
+        self.bulk_send_action = QtWidgets.QAction('Bulk Send from File', self)
+        self.bulk_send_action.triggered.connect(self.bulk_send)
+        self.tools_menu.addAction(self.bulk_send_action)
+        self.perf_test_action = QtWidgets.QAction('Producer Perf Test', self)
+        self.perf_test_action.triggered.connect(self.perf_test)
+        self.tools_menu.addAction(self.perf_test_action)
+        self.latency_probe_action = QtWidgets.QAction('Latency Probe', self)
+        self.latency_probe_action.triggered.connect(self.latency_probe)
+        self.tools_menu.addAction(self.latency_probe_action)
+        self.search_action = QtWidgets.QAction('Search Topic', self)
+        self.search_action.triggered.connect(self.search_topic)
+        self.tools_menu.addAction(self.search_action)
+        self.export_action = QtWidgets.QAction('Export Topic', self)
+        self.export_action.triggered.connect(self.export_topic)
+        self.tools_menu.addAction(self.export_action)
+        self.replay_action = QtWidgets.QAction('Replay Export', self)
+        self.replay_action.triggered.connect(self.replay_export)
+        self.tools_menu.addAction(self.replay_action)
+        self.copy_action = QtWidgets.QAction('Copy Topic to Server', self)
+        self.copy_action.triggered.connect(self.copy_topic)
+        self.tools_menu.addAction(self.copy_action)
+
+        self.sends_table = QtWidgets.QTableWidget(0, 5)
+        self.sends_table.setHorizontalHeaderLabels(["#", "Topic", "Status", "Result", "Latency (ms)"])
+        self.sends_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.sends_table.verticalHeader().setVisible(False)
+        self.sends_table.horizontalHeader().setStretchLastSection(True)
+        self.sends_dock = QtWidgets.QDockWidget("Sends", self)
+        self.sends_dock.setWidget(self.sends_table)
+        self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.sends_dock)
+        self.sends_dock.hide()
+        self.view_menu = self.menu_bar.addMenu('View')
+        self.view_menu.addAction(self.sends_dock.toggleViewAction())
 
         self.server_layout = QtWidgets.QHBoxLayout()
         self.server_label = QtWidgets.QLabel("Server:")
@@ -252,8 +385,7 @@ class KafkaApp(QtWidgets.QMainWindow):
         self.button_layout.addWidget(self.list_topics_btn)
         self.button_layout.addWidget(self.consume_messages_btn)
 
-        self.output_text = QtWidgets.QTextEdit()
-        self.output_text.setReadOnly(True)
+        self.output_text = LogView()
 
         self.main_vertical_layout.addLayout(self.server_layout)
         self.main_vertical_layout.addLayout(self.button_layout)
@@ -261,49 +393,42 @@ class KafkaApp(QtWidgets.QMainWindow):
 
         self.horizontal_layout.addLayout(self.main_vertical_layout)
 
+    def finish_startup(self):
+        # Runs from the event loop once the window has been shown, so none of this delays first paint
+        startup_profile.mark("first paint")
         self.load_decor_image()
+        startup_profile.mark("decor image")
+        startup_profile.report()
 
     def load_decor_image(self):
         bg_file = resource_path("background.png")
-        print(f"[DEBUG] background path={bg_file}, exists={os.path.exists(bg_file)}")
         if os.path.exists(bg_file):
             pix = QtGui.QPixmap(bg_file)
             if pix.isNull():
-                print("[DEBUG] QPixmap is null, image is invalid or corrupted.")
+                logging.debug("background.png is invalid or corrupted.")
             else:
-                print("[DEBUG] background.png loaded successfully.")
                 self.image_pixmap_original = pix
                 self.update_image_label()
         else:
-            print("[DEBUG] background.png not found, no background image loaded.")
+            logging.debug("background.png not found, no background image loaded.")
 
     def update_image_label(self):
         if hasattr(self, 'image_pixmap_original'):
-            scaled = self.image_pixmap_original.scaled(
-                self.image_label.size(),
-                QtCore.Qt.KeepAspectRatio,
-                QtCore.Qt.SmoothTransformation
-            )
+            size = self.image_label.size()
+            cache_key = f"decor_{size.width()}x{size.height()}"
+            scaled = QtGui.QPixmapCache.find(cache_key)
+            if scaled is None or scaled.isNull():
+                scaled = self.image_pixmap_original.scaled(
+                    size,
+                    QtCore.Qt.KeepAspectRatio,
+                    QtCore.Qt.SmoothTransformation
+                )
+                QtGui.QPixmapCache.insert(cache_key, scaled)
             self.image_label.setPixmap(scaled)
 
     def load_servers(self):
-        self.servers_file = os.path.join(os.path.dirname(__file__), 'servers.conf')
-        if os.path.exists(self.servers_file):
-            with open(self.servers_file, 'r') as f:
-                self.servers = json.load(f)
-        else:
-            self.servers = {
-                'Default Server': {
-                    'bootstrap_servers': 'localhost:9092',
-                    'security_protocol': 'PLAINTEXT',
-                    'sasl_mechanism': '',
-                    'sasl_username': '',
-                    'sasl_password': '',
-                    'ssl_cafile': '',
-                    'ssl_certfile': '',
-                    'ssl_keyfile': '',
-                }
-            }
+        self.servers_file = default_servers_file
+        self.servers = load_servers(self.servers_file)
         self.server_combo.clear()
         self.server_combo.addItems(self.servers.keys())
 
@@ -317,57 +442,113 @@ class KafkaApp(QtWidgets.QMainWindow):
         server_name = self.server_combo.currentText()
         server_config = self.servers.get(server_name)
         if server_config:
-            self.init_kafka_clients(server_config)
+            self.init_kafka_clients(server_config, server_name)
 
-    def init_kafka_clients(self, config):
-        try:
-            if self.producer:
-                self.producer.close()
-            if self.consumer:
-                self.consumer.close()
-            if self.admin_client:
-                self.admin_client.close()
-
-            self.current_config = config
-
-            self.producer = KafkaProducer(
-                bootstrap_servers=config['bootstrap_servers'],
-                security_protocol=config['security_protocol'],
-                sasl_mechanism=config['sasl_mechanism'] or None,
-                sasl_plain_username=config['sasl_username'] or None,
-                sasl_plain_password=config['sasl_password'] or None,
-                ssl_cafile=config['ssl_cafile'] or None,
-                ssl_certfile=config['ssl_certfile'] or None,
-                ssl_keyfile=config['ssl_keyfile'] or None,
-            )
-            self.consumer = KafkaConsumer(
-                bootstrap_servers=config['bootstrap_servers'],
-                security_protocol=config['security_protocol'],
-                sasl_mechanism=config['sasl_mechanism'] or None,
-                sasl_plain_username=config['sasl_username'] or None,
-                sasl_plain_password=config['sasl_password'] or None,
-                ssl_cafile=config['ssl_cafile'] or None,
-                ssl_certfile=config['ssl_certfile'] or None,
-                ssl_keyfile=config['ssl_keyfile'] or None,
-            )
-            self.admin_client = KafkaAdminClient(
-                bootstrap_servers=config['bootstrap_servers'],
-                security_protocol=config['security_protocol'],
-                sasl_mechanism=config['sasl_mechanism'] or None,
-                sasl_plain_username=config['sasl_username'] or None,
-                sasl_plain_password=config['sasl_password'] or None,
-                ssl_cafile=config['ssl_cafile'] or None,
-                ssl_certfile=config['ssl_certfile'] or None,
-                ssl_keyfile=config['ssl_keyfile'] or None,
-            )
-            self.output_text.append(f"Connected to {config['bootstrap_servers']}")
-            logging.info(f"Connected to {config['bootstrap_servers']}")
+    def init_kafka_clients(self, config, server_name=None):
+        # No sockets are opened here; each client type connects in get_client() on first use
+        self.current_server = server_name or self.server_combo.currentText()
+        self.current_config = config
+        self.client_pool.set_active(self.current_server)
+        self.output_text.append(f"Selected {self.current_server} ({config['bootstrap_servers']})")
+        logging.info(f"Selected {self.current_server} ({config['bootstrap_servers']})")
+
+    def run_with_progress(self, text, task, error_prefix):
+        """
+        Run a blocking network call on a TaskThread while a cancellable progress dialog keeps
+        the window responsive. Returns (True, result) on success and (False, None) on error,
+        cancel or timeout; a task that outlives the dialog finishes in the background.
+        """
+        thread = TaskThread(task)
+        progress = QtWidgets.QProgressDialog(text, "Cancel", 0, 0, self)
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        loop = QtCore.QEventLoop()
+        thread.finished.connect(loop.quit)
+        progress.canceled.connect(loop.quit)
+        timeout = QtCore.QTimer(self)
+        timeout.setSingleShot(True)
+        timeout.timeout.connect(loop.quit)
+        timeout.start(self.connect_timeout_ms)
+        thread.start()
+        loop.exec_()
+        timeout.stop()
+        progress.close()
+        if thread.isRunning():
+            reason = "Cancelled" if progress.wasCanceled() else "Timed out"
+            self.background_threads.append(thread)
+            thread.finished.connect(lambda: self.background_threads.remove(thread))
+            error_msg = f"{error_prefix}: {reason.lower()}"
+        elif thread.error:
+            error_msg = f"{error_prefix}: {thread.error}"
+        else:
+            return True, thread.result
+        self.output_text.append(error_msg)
+        logging.error(error_msg)
+        self.print_sad_emoticon()
+        return False, None
+
+    def get_client(self, kind):
+        """
+        Return the current server's client of the given kind ('producer', 'consumer' or 'admin'),
+        connecting it in the background on first use. Returns None if that fails.
+        """
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
+            return None
+        server_name, config = self.current_server, self.current_config
+        client = self.client_pool.peek(server_name, config, kind)
+        if client is not None:
+            return client
+        bootstrap = config['bootstrap_servers']
+        label = client_labels[kind]
+        ok, client = self.run_with_progress(
+            f"Connecting {label} to {bootstrap}...",
+            lambda: self.client_pool.acquire(server_name, config, kind),
+            "Error connecting to server"
+        )
+        if ok:
+            self.output_text.append(f"Connected {label} to {bootstrap}")
+            logging.info(f"Connected {label} to {bootstrap}")
             self.print_happy_emoticon()
-        except Exception as e:
-            error_msg = f"Error connecting to server: {e}"
-            self.output_text.append(error_msg)
-            logging.error(error_msg)
-            self.print_sad_emoticon()
+        return client
+
+    def load_topic_index(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
+            return None
+        server_name, config = self.current_server, self.current_config
+        index = self.topic_cache.get(server_name)
+        if index is None:
+            ok, topics = self.run_with_progress(
+                f"Loading topics from {config['bootstrap_servers']}...",
+                lambda: self.topic_cache.fetch_topics(self.client_pool, server_name, config),
+                "Error loading topics"
+            )
+            if not ok:
+                return None
+            index, _, _ = self.topic_cache.update(server_name, topics)
+        elif self.topic_cache.is_stale(server_name):
+            self.refresh_topics()
+        return index
+
+    def refresh_topics(self):
+        if not self.current_config or (self.topic_refresh_thread and self.topic_refresh_thread.isRunning()):
+            return
+        self.topic_refresh_thread = TopicRefreshThread(self.topic_cache, self.client_pool, self.current_server, self.current_config)
+        self.topic_refresh_thread.topics_signal.connect(self.topics_refreshed)
+        self.topic_refresh_thread.start()
+
+    def refresh_topics_if_stale(self):
+        if self.current_server and self.topic_cache.get(self.current_server) is not None \
+                and self.topic_cache.is_stale(self.current_server):
+            self.refresh_topics()
+
+    def topics_refreshed(self, server_name, topics):
+        _, added, removed = self.topic_cache.update(server_name, topics)
+        if added or removed:
+            logging.info(f"Topics on '{server_name}': {len(added)} added, {len(removed)} removed.")
+        if self.topic_picker:
+            self.topic_picker.refilter()
 
     def add_server(self):
         server_dialog = ServerDialog(self)
@@ -385,6 +566,8 @@ class KafkaApp(QtWidgets.QMainWindow):
             new_server_name, new_server_config = server_dialog.get_server_info()
             del self.servers[server_name]
             self.servers[new_server_name] = new_server_config
+            self.client_pool.rename(server_name, new_server_name)
+            self.topic_cache.invalidate(server_name)
             self.server_combo.setItemText(self.server_combo.currentIndex(), new_server_name)
             self.save_servers()
             self.server_selected()
@@ -400,38 +583,33 @@ class KafkaApp(QtWidgets.QMainWindow):
         )
         if reply == QtWidgets.QMessageBox.Yes:
             del self.servers[server_name]
+            self.client_pool.discard(server_name)
+            self.topic_cache.invalidate(server_name)
             self.server_combo.removeItem(self.server_combo.currentIndex())
             self.save_servers()
             if self.server_combo.count() > 0:
                 self.server_selected()
             else:
-                self.producer = None
-                self.consumer = None
-                self.admin_client = None
+                self.current_server = None
+                self.current_config = None
 
-    def select_topic(self):
-        if not self.consumer:
-            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
+    def select_topic(self, title="Topic"):
+        index = self.load_topic_index()
+        if index is None:
             return None
-        try:
-            topics = list(self.consumer.topics())
-            if not topics:
-                QtWidgets.QMessageBox.warning(self, "No Topics", "No topics available.")
-                return None
-            topic, ok = QtWidgets.QInputDialog.getItem(self, "Topic", "Select:", topics, 0, False)
-            if ok:
-                return topic
+        if not index.names:
+            QtWidgets.QMessageBox.warning(self, "No Topics", "No topics available.")
             return None
-        except Exception as e:
-            self.output_text.append(f"Error: {e}")
-            logging.error(f"Error: {e}")
-            self.print_sad_emoticon()
+        self.topic_picker = TopicPickerDialog(index, title, self)
+        self.topic_picker.refresh_btn.clicked.connect(self.refresh_topics)
+        try:
+            if self.topic_picker.exec_():
+                return self.topic_picker.selected_topic()
             return None
+        finally:
+            self.topic_picker = None
 
     def send_payload(self):
-        if not self.producer:
-            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
-            return
         topic = self.select_topic()
         if topic:
             payload, ok = QtWidgets.QInputDialog.getMultiLineText(self, "Payload", "Enter:")
@@ -444,25 +622,109 @@ class KafkaApp(QtWidgets.QMainWindow):
                     QtWidgets.QMessageBox.No
                 )
                 if confirm == QtWidgets.QMessageBox.Yes:
-                    try:
-                        future = self.producer.send(topic, value=payload.encode('utf-8'))
-                        result = future.get(timeout=10)
-                        self.output_text.append(f"Sent to '{topic}'")
-                        logging.info(f"Sent to '{topic}'. {result}")
-                        self.print_happy_emoticon()
-                    except KafkaError as e:
-                        self.output_text.append(f"Error: {e}")
-                        logging.error(f"Error sending payload: {e}")
-                        self.print_sad_emoticon()
-                    except Exception as e:
-                        self.output_text.append(f"Error: {e}")
-                        logging.error(f"Error sending payload: {e}")
-                        self.print_sad_emoticon()
+                    self.track_send(topic, payload.encode('utf-8'))
 
-    def overview_messages(self):
-        if not self.consumer:
+    def track_send(self, topic, value):
+        producer = self.get_client('producer')
+        if not producer:
+            return
+        if not self.send_thread:
+            self.send_thread = SendThread()
+            self.send_thread.delivery_signal.connect(self.send_delivered)
+            self.send_thread.start()
+        self.send_count += 1
+        send_id = self.send_count
+        row = self.sends_table.rowCount()
+        self.sends_table.insertRow(row)
+        items = [QtWidgets.QTableWidgetItem(text) for text in (str(send_id), topic, "pending", "", "")]
+        for column, item in enumerate(items):
+            self.sends_table.setItem(row, column, item)
+        self.pending_sends[send_id] = items
+        while self.sends_table.rowCount() > self.max_send_rows:
+            self.pending_sends.pop(int(self.sends_table.item(0, 0).text()), None)
+            self.sends_table.removeRow(0)
+        self.sends_table.scrollToBottom()
+        self.sends_dock.show()
+        self.send_thread.send(send_id, producer, topic, value)
+
+    def send_delivered(self, send_id, ok, detail, latency_ms):
+        items = self.pending_sends.pop(send_id, None)
+        topic = items[1].text() if items else '?'
+        if items:
+            items[2].setText("acked" if ok else "failed")
+            items[3].setText(detail)
+            items[4].setText(f"{latency_ms:.1f}")
+        if ok:
+            self.output_text.append(f"Sent to '{topic}' ({detail}) in {latency_ms:.1f} ms")
+            logging.info(f"Sent to '{topic}'. {detail}")
+            self.print_happy_emoticon()
+        else:
+            self.output_text.append(f"Error: {detail}")
+            logging.error(f"Error sending payload: {detail}")
+            self.print_sad_emoticon()
+
+    def bulk_send(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
+            return
+        topic = self.select_topic()
+        if topic:
+            bulk_dialog = BulkSendDialog(self.current_config, topic, self)
+            bulk_dialog.exec_()
+
+    def perf_test(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
+            return
+        topic = self.select_topic()
+        if topic:
+            perf_dialog = PerfTestDialog(self.current_config, topic, self)
+            perf_dialog.exec_()
+
+    def latency_probe(self):
+        if not self.current_config:
             QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
             return
+        topic = self.select_topic()
+        if topic:
+            probe_dialog = LatencyProbeDialog(self.current_config, topic, self)
+            probe_dialog.exec_()
+
+    def search_topic(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Config", "No current config available.")
+            return
+        topic = self.select_topic("Search Topic")
+        if topic:
+            search_dialog = SearchDialog(self.current_config, topic, self)
+            search_dialog.exec_()
+
+    def export_topic(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Config", "No current config available.")
+            return
+        topic = self.select_topic("Export Topic")
+        if topic:
+            export_dialog = ExportDialog(self.current_config, topic, self)
+            export_dialog.exec_()
+
+    def replay_export(self):
+        topic = self.select_topic("Replay Into")
+        producer = self.get_client('producer') if topic else None
+        if producer:
+            replay_dialog = ReplayDialog(self.current_config, producer, topic, self)
+            replay_dialog.exec_()
+
+    def copy_topic(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Config", "No current config available.")
+            return
+        topic = self.select_topic("Copy Topic")
+        if topic:
+            copy_dialog = CopyDialog(self.servers, self.current_server, topic, self)
+            copy_dialog.exec_()
+
+    def overview_messages(self):
         if not self.current_config:
             QtWidgets.QMessageBox.warning(self, "No Config", "No current config available.")
             return
@@ -484,34 +746,25 @@ class KafkaApp(QtWidgets.QMainWindow):
                     logging.error(f"Error overviewing messages: {e}")
                     self.print_sad_emoticon()
 
-    def display_message(self, message):
-        self.output_text.append(message)
+    def display_messages(self, messages):
+        # One model insert per batch keeps UI cost tied to the flush rate, not the message rate
+        self.output_text.append_lines(messages)
 
     def list_topics(self):
-        if not self.consumer:
-            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
+        index = self.load_topic_index()
+        if index is None:
             return
-        try:
-            topics = list(self.consumer.topics())
-            if topics:
-                self.output_text.append("Topics:")
-                for topic in topics:
-                    self.output_text.append(f"- {topic}")
-                logging.info("Listed topics.")
-                self.print_happy_emoticon()
-            else:
-                self.output_text.append("No topics.")
-                logging.info("No topics.")
-                self.print_sad_emoticon()
-        except Exception as e:
-            self.output_text.append(f"Error: {e}")
-            logging.error(f"Error listing topics: {e}")
+        if index.names:
+            self.output_text.append("Topics:")
+            self.output_text.append_lines([f"- {topic}" for topic in index.names])
+            logging.info("Listed topics.")
+            self.print_happy_emoticon()
+        else:
+            self.output_text.append("No topics.")
+            logging.info("No topics.")
             self.print_sad_emoticon()
 
     def consume_messages(self):
-        if not self.consumer:
-            QtWidgets.QMessageBox.warning(self, "No Connection", "Not connected to any server.")
-            return
         if not self.current_config:
             QtWidgets.QMessageBox.warning(self, "No Config", "No current config available.")
             return
@@ -525,24 +778,25 @@ class KafkaApp(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.No
             )
             if confirm == QtWidgets.QMessageBox.Yes:
+                start_at, ok = QtWidgets.QInputDialog.getItem(self, "Consume", "Start from:", ['Earliest', 'Latest'], 0, False)
+                if not ok:
+                    return
                 try:
-                    from kafka import KafkaConsumer
-                    temp_consumer = KafkaConsumer(
-                        topic,
-                        bootstrap_servers=self.current_config['bootstrap_servers'],
-                        security_protocol=self.current_config['security_protocol'],
-                        sasl_mechanism=self.current_config['sasl_mechanism'] or None,
-                        sasl_plain_username=self.current_config['sasl_username'] or None,
-                        sasl_plain_password=self.current_config['sasl_password'] or None,
-                        ssl_cafile=self.current_config['ssl_cafile'] or None,
-                        ssl_certfile=self.current_config['ssl_certfile'] or None,
-                        ssl_keyfile=self.current_config['ssl_keyfile'] or None,
-                        auto_offset_reset='earliest',
-                        enable_auto_commit=True
-                    )
-                    self.output_text.append(f"Consuming '{topic}' (Stop below)")
-                    self.consume_thread = ConsumeThread(temp_consumer)
-                    self.consume_thread.message_signal.connect(self.display_message)
+                    workers = self.settings.get('consume_workers', 0)
+                    deserializer = self.topic_deserializer(topic)
+                    if workers:
+                        self.consume_thread = ParallelConsumeThread(
+                            self.current_config, topic, start_at.lower(), self.settings.get('consume_fetchers', 4), workers,
+                            deserializer=deserializer, registry_location=self.schema_registry_location())
+                    else:
+                        temp_consumer = attach_consumer(self.current_config, topic, start_at.lower())
+                        self.consume_thread = ConsumeThread(
+                            temp_consumer, deserializer=deserializer, registry_location=self.schema_registry_location())
+                    decoded_as = "" if deserializer == 'Text' else f" as {deserializer}"
+                    self.output_text.append(f"Consuming '{topic}'{decoded_as} (Stop below)")
+                    self.consume_thread.batch_signal.connect(self.display_messages)
+                    if workers:
+                        self.consume_thread.batch_signal.connect(self.consume_thread.batch_delivered)
                     self.consume_thread.start()
                     self.stop_consume_btn = QtWidgets.QPushButton("Stop")
                     self.stop_consume_btn.clicked.connect(self.stop_consuming)
@@ -565,6 +819,20 @@ class KafkaApp(QtWidgets.QMainWindow):
             logging.info("Stopped consuming.")
             self.print_happy_emoticon()
 
+    def topic_deserializer(self, topic):
+        return self.settings.get('topic_deserializers', {}).get(topic, 'Text')
+
+    def set_topic_deserializer(self, topic, deserializer):
+        choices = self.settings.setdefault('topic_deserializers', {})
+        if deserializer == 'Text':
+            choices.pop(topic, None)
+        else:
+            choices[topic] = deserializer
+        self.save_settings()
+
+    def schema_registry_location(self):
+        return (self.settings.get('schema_dir') or default_schema_dir, self.settings.get('schema_registry_url') or None)
+
     def open_settings(self):
         settings_dialog = SettingsDialog(self)
         if settings_dialog.exec_():
@@ -580,7 +848,13 @@ class KafkaApp(QtWidgets.QMainWindow):
                 'theme': 'Light',
                 'font_family': 'Segoe UI',
                 'font_size': 12,
-                'logging_enabled': True
+                'logging_enabled': True,
+                'log_max_lines': 100000,
+                'log_max_bytes': 64 * 1024 * 1024,
+                'highlight_max_chars': 2 * 1024 * 1024,
+                'large_message_bytes': 1024 * 1024,
+                'consume_fetchers': 4,
+                'consume_workers': 0
             }
         setup_logging(enabled=self.settings.get('logging_enabled', True))
         self.apply_settings()
@@ -591,15 +865,19 @@ class KafkaApp(QtWidgets.QMainWindow):
 
     def apply_settings(self):
         theme = self.settings.get('theme', 'Light')
-        if theme == 'Dark':
-            self.setStyleSheet(minimal_dark_style)
-        else:
-            self.setStyleSheet(minimal_light_style)
+        # Re-polishing every widget is the slowest part of applying settings, so only do it on a theme change
+        if theme != self.applied_theme:
+            self.setStyleSheet(minimal_dark_style if theme == 'Dark' else minimal_light_style)
+            self.applied_theme = theme
 
         font_family = self.settings.get('font_family', 'Segoe UI')
         font_size = self.settings.get('font_size', 12)
         font = QtGui.QFont(font_family, font_size)
         self.output_text.setFont(font)
+        self.output_text.set_limits(
+            self.settings.get('log_max_lines', 100000),
+            self.settings.get('log_max_bytes', 64 * 1024 * 1024)
+        )
 
         if self.settings.get('logging_enabled', True):
             logging.disable(logging.NOTSET)
@@ -615,7 +893,7 @@ class KafkaApp(QtWidgets.QMainWindow):
         self.output_text.append(sad_emoticon)
 
     def create_topic(self):
-        if not self.admin_client:
+        if not self.current_config:
             QtWidgets.QMessageBox.warning(self, "No Server", "No server selected.")
             return
         topic_name, ok = QtWidgets.QInputDialog.getText(self, "Create Topic", "Name:")
@@ -627,9 +905,16 @@ class KafkaApp(QtWidgets.QMainWindow):
         replication_factor, ok = QtWidgets.QInputDialog.getInt(self, "Replicas", "Count:", 1, 1)
         if not ok:
             return
+        admin_client = self.get_client('admin')
+        if not admin_client:
+            return
         try:
+            from kafka.admin import NewTopic
             new_topic = NewTopic(name=topic_name.strip(), num_partitions=num_partitions, replication_factor=replication_factor)
-            self.admin_client.create_topics(new_topics=[new_topic], validate_only=False)
+            admin_client.create_topics(new_topics=[new_topic], validate_only=False)
+            index = self.topic_cache.get(self.current_server)
+            if index is not None:
+                index.add(topic_name.strip())
             self.output_text.append(f"Created '{topic_name}'.")
             logging.info(f"Created '{topic_name}'.")
             self.print_happy_emoticon()
@@ -639,16 +924,12 @@ class KafkaApp(QtWidgets.QMainWindow):
             self.print_sad_emoticon()
 
     def delete_topic(self):
-        if not self.admin_client:
-            QtWidgets.QMessageBox.warning(self, "No Server", "No server selected.")
+        admin_client = self.get_client('admin')
+        if not admin_client:
             return
         try:
-            topics = list(self.consumer.topics())
-            if not topics:
-                QtWidgets.QMessageBox.warning(self, "No Topics", "None.")
-                return
-            topic, ok = QtWidgets.QInputDialog.getItem(self, "Delete Topic", "Select:", topics, 0, False)
-            if ok and topic:
+            topic = self.select_topic("Delete Topic")
+            if topic:
                 confirm = QtWidgets.QMessageBox.question(
                     self,
                     'Delete',
@@ -657,7 +938,8 @@ class KafkaApp(QtWidgets.QMainWindow):
                     QtWidgets.QMessageBox.No
                 )
                 if confirm == QtWidgets.QMessageBox.Yes:
-                    self.admin_client.delete_topics([topic])
+                    admin_client.delete_topics([topic])
+                    self.topic_cache.get(self.current_server).remove(topic)
                     self.output_text.append(f"Deleted '{topic}'.")
                     logging.info(f"Deleted '{topic}'.")
                     self.print_happy_emoticon()
@@ -666,12 +948,26 @@ class KafkaApp(QtWidgets.QMainWindow):
             logging.error(f"Error deleting topic: {e}")
             self.print_sad_emoticon()
 
-    def describe_cluster(self):
-        if not self.admin_client:
+    def topic_inventory(self):
+        if not self.current_config:
+            QtWidgets.QMessageBox.warning(self, "No Server", "No server selected.")
+            return
+        inventory_dialog = TopicInventoryDialog(self.current_config, self)
+        inventory_dialog.exec_()
+
+    def consumer_lag(self):
+        if not self.current_config:
             QtWidgets.QMessageBox.warning(self, "No Server", "No server selected.")
             return
+        lag_dialog = ConsumerLagDialog(self.client_pool, self.current_server, self.current_config, self)
+        lag_dialog.exec_()
+
+    def describe_cluster(self):
+        admin_client = self.get_client('admin')
+        if not admin_client:
+            return
         try:
-            cluster_info = self.admin_client.describe_cluster()
+            cluster_info = admin_client.describe_cluster()
             self.output_text.append("Cluster Info:")
             for key, value in cluster_info.items():
                 self.output_text.append(f"{key}: {value}")
@@ -682,13 +978,109 @@ class KafkaApp(QtWidgets.QMainWindow):
             logging.error(f"Error describing cluster: {e}")
             self.print_sad_emoticon()
 
+    def closeEvent(self, event):
+        if getattr(self, 'consume_thread', None):
+            self.stop_consuming()
+        if self.send_thread:
+            self.send_thread.stop()
+            self.send_thread.wait()
+        for thread in self.background_threads:
+            thread.wait()
+        if self.topic_refresh_thread:
+            self.topic_refresh_thread.wait()
+        self.client_pool.close_all()
+        super().closeEvent(event)
+
+class TopicPickerDialog(QtWidgets.QDialog):
+    def __init__(self, topic_index, title="Topic", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setGeometry(300, 200, 500, 500)
+        self.topic_index = topic_index
+        self.last_query = None
+        self.last_mode = None
+        self.last_version = None
+        self.last_results = []
+        self.init_ui()
+        self.refilter()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QVBoxLayout(self)
+        filter_layout = QtWidgets.QHBoxLayout()
+        self.filter_edit = QtWidgets.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter topics")
+        self.filter_edit.textChanged.connect(self.refilter)
+        self.filter_edit.returnPressed.connect(self.accept)
+        filter_layout.addWidget(self.filter_edit)
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItems(TopicIndex.modes)
+        self.mode_combo.currentIndexChanged.connect(self.refilter)
+        filter_layout.addWidget(self.mode_combo)
+        self.refresh_btn = QtWidgets.QPushButton("Refresh")
+        filter_layout.addWidget(self.refresh_btn)
+        self.layout.addLayout(filter_layout)
+        self.topic_model = QtCore.QStringListModel(self)
+        self.topic_list = QtWidgets.QListView()
+        self.topic_list.setUniformItemSizes(True)
+        self.topic_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.topic_list.setModel(self.topic_model)
+        self.topic_list.doubleClicked.connect(self.accept)
+        self.layout.addWidget(self.topic_list)
+        self.count_label = QtWidgets.QLabel()
+        self.layout.addWidget(self.count_label)
+        self.button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
+            QtCore.Qt.Horizontal, self)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        self.layout.addWidget(self.button_box)
+
+    def refilter(self):
+        query = self.filter_edit.text().strip()
+        mode = self.mode_combo.currentText()
+        within = None
+        # Typing more characters can only narrow the previous matches
+        if (self.last_query and query.startswith(self.last_query) and mode == self.last_mode
+                and self.topic_index.version == self.last_version):
+            within = self.last_results
+        results = self.topic_index.filter(query, mode, within)
+        self.last_query, self.last_mode, self.last_version = query, mode, self.topic_index.version
+        self.last_results = results
+        self.topic_model.setStringList(results)
+        if results:
+            self.topic_list.setCurrentIndex(self.topic_model.index(0))
+        self.count_label.setText(f"{len(results)} of {len(self.topic_index.names)} topics")
+
+    def selected_topic(self):
+        index = self.topic_list.currentIndex()
+        return index.data() if index.isValid() else None
+
 class ServerDialog(QtWidgets.QDialog):
+    tuning_labels = {
+        'fetch_min_bytes': "Fetch Min:",
+        'fetch_max_wait_ms': "Fetch Wait:",
+        'fetch_max_bytes': "Fetch Max:",
+        'max_partition_fetch_bytes': "Partition Fetch:",
+        'max_poll_records': "Poll Records:",
+        'receive_buffer_bytes': "Recv Buffer:",
+        'linger_ms': "Linger:",
+        'batch_size': "Batch Size:",
+        'compression_type': "Compression:",
+        'acks': "Acks:",
+        'buffer_memory': "Buffer Memory:",
+    }
+    tuning_choices = {
+        'compression_type': ['none', 'gzip', 'snappy', 'lz4', 'zstd'],
+        'acks': ['0', '1', 'all'],
+    }
+
     def __init__(self, parent=None, server_name='', server_config=None):
         super().__init__(parent)
         self.setWindowTitle("Server Configuration")
-        self.setGeometry(200, 200, 400, 400)
+        self.setGeometry(200, 200, 400, 700)
         self.server_name = server_name
         self.server_config = server_config or {}
+        self.loading_tuning = False
         self.init_ui()
 
     def init_ui(self):
@@ -714,6 +1106,34 @@ class ServerDialog(QtWidgets.QDialog):
         self.layout.addRow("SSL Cert:", self.ssl_certfile_edit)
         self.ssl_keyfile_edit = QtWidgets.QLineEdit(self.server_config.get('ssl_keyfile', ''))
         self.layout.addRow("SSL Key:", self.ssl_keyfile_edit)
+
+        self.tuning_combo = QtWidgets.QComboBox()
+        self.tuning_combo.addItems(tuning_preset_names)
+        self.layout.addRow("Tuning:", self.tuning_combo)
+        self.tuning_widgets = {}
+        for key in tuning_defaults:
+            if key in self.tuning_choices:
+                widget = QtWidgets.QComboBox()
+                widget.addItems(self.tuning_choices[key])
+                widget.currentTextChanged.connect(self.tuning_edited)
+            else:
+                widget = QtWidgets.QSpinBox()
+                widget.setRange(0, 2 ** 31 - 1)
+                widget.setSuffix(" ms" if key.endswith('_ms') else " records" if key == 'max_poll_records' else " bytes")
+                if key == 'receive_buffer_bytes':
+                    widget.setSpecialValueText("OS default")
+                widget.valueChanged.connect(self.tuning_edited)
+            widget.setToolTip(key)
+            self.tuning_widgets[key] = widget
+            self.layout.addRow(self.tuning_labels[key], widget)
+        self.tuning_warning_label = QtWidgets.QLabel()
+        self.tuning_warning_label.setWordWrap(True)
+        self.tuning_warning_label.setStyleSheet("QLabel {color: #C05000;}")
+        self.layout.addRow(self.tuning_warning_label)
+        self.load_tuning(server_tuning(self.server_config))
+        self.tuning_combo.setCurrentText(self.server_config.get('tuning_preset', 'Default'))
+        self.tuning_combo.currentTextChanged.connect(self.preset_selected)
+
         self.button_box = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
             QtCore.Qt.Horizontal, self)
@@ -721,6 +1141,53 @@ class ServerDialog(QtWidgets.QDialog):
         self.button_box.rejected.connect(self.reject)
         self.layout.addRow(self.button_box)
 
+    def load_tuning(self, tuning):
+        self.loading_tuning = True
+        for key, widget in self.tuning_widgets.items():
+            if isinstance(widget, QtWidgets.QComboBox):
+                widget.setCurrentText(str(tuning[key]))
+            else:
+                widget.setValue(tuning[key])
+        self.loading_tuning = False
+        self.update_tuning_warnings()
+
+    def current_tuning(self):
+        return {
+            key: widget.currentText() if isinstance(widget, QtWidgets.QComboBox) else widget.value()
+            for key, widget in self.tuning_widgets.items()
+        }
+
+    def preset_selected(self, preset):
+        if preset != 'Custom':
+            self.load_tuning(server_tuning({'tuning_preset': preset}))
+
+    def tuning_edited(self):
+        if self.loading_tuning:
+            return
+        # Any hand edit turns the profile into a custom one, keeping the values as shown
+        if self.tuning_combo.currentText() != 'Custom':
+            self.tuning_combo.blockSignals(True)
+            self.tuning_combo.setCurrentText('Custom')
+            self.tuning_combo.blockSignals(False)
+        self.update_tuning_warnings()
+
+    def update_tuning_warnings(self):
+        self.tuning_warning_label.setText("\n".join(tuning_warnings(self.current_tuning())))
+
+    def accept(self):
+        warnings = tuning_warnings(self.current_tuning())
+        if warnings:
+            confirm = QtWidgets.QMessageBox.question(
+                self,
+                'Tuning',
+                "\n".join(warnings) + "\n\nSave anyway?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No
+            )
+            if confirm != QtWidgets.QMessageBox.Yes:
+                return
+        super().accept()
+
     def get_server_info(self):
         server_name = self.server_name_edit.text()
         server_config = {
@@ -732,193 +1199,3692 @@ class ServerDialog(QtWidgets.QDialog):
             'ssl_cafile': self.ssl_cafile_edit.text(),
             'ssl_certfile': self.ssl_certfile_edit.text(),
             'ssl_keyfile': self.ssl_keyfile_edit.text(),
+            'tuning_preset': self.tuning_combo.currentText(),
         }
+        if server_config['tuning_preset'] == 'Custom':
+            server_config['tuning'] = self.current_tuning()
         return server_name, server_config
 
 class MessagesDialog(QtWidgets.QDialog):
     def __init__(self, consumer_config, topic, parent=None):
         super().__init__(parent)
         self.setWindowTitle(f"Messages: {topic}")
-        self.setGeometry(300, 200, 600, 400)
+        self.setGeometry(300, 200, 800, 600)
         self.consumer_config = consumer_config
         self.topic = topic
-        self.highlighter = None
+        settings = getattr(parent, 'settings', {})
+        self.highlight_max_chars = settings.get('highlight_max_chars', 2 * 1024 * 1024)
+        self.large_message_bytes = settings.get('large_message_bytes', 1024 * 1024)
+        self.deserializer = parent.topic_deserializer(topic) if hasattr(parent, 'topic_deserializer') else 'Text'
+        location = parent.schema_registry_location() if hasattr(parent, 'schema_registry_location') else (default_schema_dir, None)
+        self.registry = schema_registry(*location)
+        self.watermarks = {}
+        self.scroll_to_tail = False
+        self.current_key = None
+        self.large_value = None
+        self.payload_cache = PayloadCache()
         self.init_ui()
         self.fetch_messages()
 
     def init_ui(self):
         self.layout = QtWidgets.QVBoxLayout(self)
-        self.message_list = QtWidgets.QListWidget()
-        self.message_list.currentItemChanged.connect(self.display_message)
+
+        self.seek_layout = QtWidgets.QHBoxLayout()
+        self.partition_combo = QtWidgets.QComboBox()
+        self.partition_combo.currentIndexChanged.connect(self.partition_selected)
+        self.seek_layout.addWidget(QtWidgets.QLabel("Partition:"))
+        self.seek_layout.addWidget(self.partition_combo)
+        self.offset_edit = QtWidgets.QLineEdit()
+        self.offset_edit.setPlaceholderText("Offset")
+        self.offset_edit.returnPressed.connect(self.seek_offset)
+        self.seek_layout.addWidget(self.offset_edit)
+        self.offset_btn = QtWidgets.QPushButton("Go")
+        self.offset_btn.clicked.connect(self.seek_offset)
+        self.seek_layout.addWidget(self.offset_btn)
+        self.time_edit = QtWidgets.QDateTimeEdit(QtCore.QDateTime.currentDateTime())
+        self.time_edit.setCalendarPopup(True)
+        self.time_edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.seek_layout.addWidget(self.time_edit)
+        self.time_btn = QtWidgets.QPushButton("Go to Time")
+        self.time_btn.clicked.connect(self.seek_time)
+        self.seek_layout.addWidget(self.time_btn)
+        self.head_btn = QtWidgets.QPushButton("Head")
+        self.head_btn.clicked.connect(self.seek_head)
+        self.seek_layout.addWidget(self.head_btn)
+        self.tail_btn = QtWidgets.QPushButton("Tail")
+        self.tail_btn.clicked.connect(self.seek_tail)
+        self.seek_layout.addWidget(self.tail_btn)
+        self.layout.addLayout(self.seek_layout)
+
+        self.message_model = PagedMessageModel(self)
+        self.message_list = QtWidgets.QListView()
+        self.message_list.setUniformItemSizes(True)
+        self.message_list.setModel(self.message_model)
+        self.message_list.selectionModel().currentChanged.connect(self.display_message)
+        self.message_list.verticalScrollBar().valueChanged.connect(self.viewport_moved)
         self.layout.addWidget(self.message_list)
         self.message_text = QtWidgets.QTextEdit()
         self.message_text.setReadOnly(True)
         self.message_text.setStyleSheet("QTextEdit {color: #CCE8FF; font-weight: bold;}")
-        self.layout.addWidget(self.message_text)
+        self.highlighter = JsonHighlighter(self.message_text.document())
+        self.large_model = LargePayloadModel(self)
+        self.large_view = QtWidgets.QListView()
+        self.large_view.setUniformItemSizes(True)
+        self.large_view.setModel(self.large_model)
+        self.large_view.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.payload_stack = QtWidgets.QStackedWidget()
+        self.payload_stack.addWidget(self.message_text)
+        self.payload_stack.addWidget(self.large_view)
+        self.layout.addWidget(self.payload_stack)
+        self.status_layout = QtWidgets.QHBoxLayout()
+        self.status_label = QtWidgets.QLabel("Loading partitions...")
+        self.status_layout.addWidget(self.status_label, 1)
+        self.status_layout.addWidget(QtWidgets.QLabel("Decode:"))
+        self.deserializer_combo = QtWidgets.QComboBox()
+        self.deserializer_combo.addItems(deserializers)
+        self.deserializer_combo.setCurrentText(self.deserializer)
+        self.deserializer_combo.currentTextChanged.connect(self.deserializer_changed)
+        self.status_layout.addWidget(self.deserializer_combo)
+        self.hex_checkbox = QtWidgets.QCheckBox("Hex")
+        self.hex_checkbox.toggled.connect(self.redisplay_message)
+        self.status_layout.addWidget(self.hex_checkbox)
+        self.layout.addLayout(self.status_layout)
         self.close_button = QtWidgets.QPushButton("Close")
         self.close_button.clicked.connect(self.accept)
         self.layout.addWidget(self.close_button)
 
     def fetch_messages(self):
-        self.overview_thread = OverviewThread(self.consumer_config, self.topic)
+        self.overview_thread = OverviewThread(self.consumer_config, self.topic, self.message_model.page_size)
         self.overview_thread.message_signal.connect(self.add_message)
+        self.overview_thread.partitions_signal.connect(self.partitions_loaded)
+        self.overview_thread.page_signal.connect(self.message_model.page_loaded)
+        self.overview_thread.seek_signal.connect(self.seek_loaded)
         self.overview_thread.finished.connect(self.fetch_finished)
+        self.message_model.page_requested.connect(self.overview_thread.request_page)
+        self.overview_thread.is_page_wanted = self.message_model.is_page_wanted
         self.overview_thread.start()
+        self.format_thread = FormatThread()
+        self.format_thread.formatted_signal.connect(self.payload_formatted)
+        self.format_thread.start()
 
     def add_message(self, message):
-        if isinstance(message, str):
-            self.message_list.addItem("Error: " + message)
+        self.status_label.setText("Error: " + message)
+
+    def partitions_loaded(self, watermarks):
+        self.watermarks = watermarks
+        current = self.partition_combo.currentData()
+        self.partition_combo.blockSignals(True)
+        self.partition_combo.clear()
+        for partition in sorted(watermarks):
+            begin, end = watermarks[partition]
+            self.partition_combo.addItem(f"{partition} ({begin}-{end})", partition)
+        if current in watermarks:
+            self.partition_combo.setCurrentIndex(self.partition_combo.findData(current))
+        self.partition_combo.blockSignals(False)
+        self.partition_selected()
+        if self.scroll_to_tail:
+            self.scroll_to_tail = False
+            self.show_tail()
+
+    def partition_selected(self):
+        partition = self.partition_combo.currentData()
+        if partition is None:
+            return
+        begin, end = self.watermarks[partition]
+        self.message_model.set_range(partition, begin, end)
+        self.status_label.setText(f"Partition {partition}: offsets {begin} to {end - 1}, {end - begin} records")
+
+    def viewport_moved(self):
+        index = self.message_list.indexAt(QtCore.QPoint(0, 0))
+        if not index.isValid():
+            return
+        row = index.row()
+        if self.message_model.near_window_edge(row):
+            # Slide the window so the offset at the top stays put; the re-scroll lands mid-window
+            row = self.message_model.move_window(self.message_model.window_start + row)
+            self.message_list.scrollTo(self.message_model.index(row), QtWidgets.QAbstractItemView.PositionAtTop)
+        self.message_model.set_focus_row(row)
+
+    def scroll_to_offset(self, offset):
+        if not self.message_model.begin <= offset < self.message_model.end:
+            self.status_label.setText(f"Offset {offset} is outside the partition range.")
+            return
+        row = self.message_model.row_for_offset(offset)
+        if row is None:
+            row = self.message_model.move_window(offset)
+        index = self.message_model.index(row)
+        self.message_list.scrollTo(index, QtWidgets.QAbstractItemView.PositionAtTop)
+        self.message_list.setCurrentIndex(index)
+
+    def seek_offset(self):
+        try:
+            offset = int(self.offset_edit.text().strip())
+        except ValueError:
+            self.status_label.setText("Offset must be a number.")
+            return
+        self.scroll_to_offset(offset)
+
+    def seek_head(self):
+        self.message_model.move_window(self.message_model.begin)
+        self.message_list.scrollToTop()
+
+    def show_tail(self):
+        self.message_model.move_window(self.message_model.end - 1)
+        self.message_list.scrollToBottom()
+
+    def seek_tail(self):
+        # Refresh the end offsets first so the tail includes newly produced records
+        self.scroll_to_tail = True
+        self.overview_thread.request_watermarks()
+
+    def seek_time(self):
+        partition = self.partition_combo.currentData()
+        if partition is None:
+            return
+        timestamp_ms = self.time_edit.dateTime().toMSecsSinceEpoch()
+        self.overview_thread.request_time(partition, timestamp_ms)
+
+    def seek_loaded(self, partition, offset):
+        if partition != self.partition_combo.currentData():
+            return
+        if offset is None:
+            self.status_label.setText("No records at or after that time.")
+            self.show_tail()
         else:
-            offset = str(message.offset)
-            key = str(message.key) if message.key else ''
-            item_text = f"Offset: {offset}, Key: {key}"
-            item = QtWidgets.QListWidgetItem(item_text)
-            value = message.value
-            if value is not None:
-                value = value.decode('utf-8', errors='replace')
-            else:
-                value = ""
-            item.setData(QtCore.Qt.UserRole, value)
-            self.message_list.addItem(item)
+            self.scroll_to_offset(offset)
 
     def display_message(self, current, previous):
-        if current:
-            value = current.data(QtCore.Qt.UserRole)
-            if value is None:
-                value = ""
-            try:
-                json_value = json.loads(value)
-                pretty_json = json.dumps(json_value, indent=4)
-                self.message_text.setPlainText(pretty_json)
-                self.highlighter = JsonHighlighter(self.message_text.document())
-            except (json.JSONDecodeError, TypeError):
-                self.message_text.setPlainText(value)
-                self.highlighter = None
-        else:
+        record = current.data(QtCore.Qt.UserRole) if current.isValid() else None
+        if record is None:
+            self.current_key = None
+            self.highlighter.enabled = False
             self.message_text.clear()
-            self.highlighter = None
+            return
+        value = record.value
+        if value is not None and (self.hex_checkbox.isChecked() or len(value) > self.large_message_bytes):
+            if self.hex_checkbox.isChecked() or self.deserializer == 'Text':
+                self.current_key = None
+                self.show_large_payload(value)
+                return
+            # Decode to compact JSON off the UI thread; the large view pretty-prints it in chunks
+            self.current_key = (record.partition, record.offset, self.deserializer, 'large')
+            self.large_value = value
+            self.highlighter.enabled = False
+            self.payload_stack.setCurrentWidget(self.message_text)
+            self.message_text.setPlainText(f"Decoding {len(value)} bytes as {self.deserializer}...")
+            self.format_thread.request(self.current_key, value, self.deserializer, self.registry, indent=None)
+            return
+        self.payload_stack.setCurrentWidget(self.message_text)
+        self.current_key = (record.partition, record.offset, self.deserializer)
+        cached = self.payload_cache.get(self.current_key)
+        if cached is not None:
+            self.show_payload(*cached)
+        else:
+            self.highlighter.enabled = False
+            self.message_text.setPlainText("Formatting...")
+            self.format_thread.request(self.current_key, record.value, self.deserializer, self.registry)
 
-    def fetch_finished(self):
-        pass
+    def payload_formatted(self, key, text, is_json):
+        if key[-1] == 'large':
+            if key == self.current_key:
+                self.show_decoded_large_payload(text, is_json)
+            return
+        self.payload_cache.put(key, (text, is_json))
+        if key == self.current_key:
+            self.show_payload(text, is_json)
 
-class OverviewThread(QtCore.QThread):
-    message_signal = QtCore.pyqtSignal(object)
-    finished = QtCore.pyqtSignal()
-    def __init__(self, consumer_config, topic):
-        super().__init__()
-        self.consumer_config = consumer_config
-        self.topic = topic
-    def run(self):
-        try:
-            from kafka import KafkaConsumer
-            temp_consumer = KafkaConsumer(
-                self.topic,
-                bootstrap_servers=self.consumer_config['bootstrap_servers'],
-                security_protocol=self.consumer_config['security_protocol'],
-                sasl_mechanism=self.consumer_config['sasl_mechanism'] or None,
-                sasl_plain_username=self.consumer_config['sasl_username'] or None,
-                sasl_plain_password=self.consumer_config['sasl_password'] or None,
-                ssl_cafile=self.consumer_config['ssl_cafile'] or None,
-                ssl_certfile=self.consumer_config['ssl_certfile'] or None,
-                ssl_keyfile=self.consumer_config['ssl_keyfile'] or None,
-                auto_offset_reset='earliest',
-                enable_auto_commit=False
-            )
-            count = 0
-            for message in temp_consumer:
-                self.message_signal.emit(message)
-                logging.debug(f"Message: {message}")
-                count += 1
-                if count >= 10:
-                    break
-            temp_consumer.close()
-            logging.info(f"Overviewed {count} messages from '{self.topic}'.")
-        except Exception as e:
-            error_msg = f"Overview error: {e}"
-            self.message_signal.emit(error_msg)
-            logging.error(error_msg)
-        finally:
-            self.finished.emit()
+    def show_payload(self, text, is_json):
+        # The flag is read while setPlainText re-highlights, so it must be set first
+        self.highlighter.enabled = is_json and len(text) <= self.highlight_max_chars
+        self.message_text.setPlainText(text)
 
-class JsonHighlighter(QtGui.QSyntaxHighlighter):
-    def __init__(self, document):
-        super().__init__(document)
-        self.rules = []
-        string_format = QtGui.QTextCharFormat()
-        string_format.setForeground(QtGui.QColor('green'))
-        self.rules.append((QtCore.QRegExp(r'\".*?\"(?=:)'), string_format))
-        self.rules.append((QtCore.QRegExp(r'(?<=:\s)\".*?\"'), string_format))
-        number_format = QtGui.QTextCharFormat()
-        number_format.setForeground(QtGui.QColor('magenta'))
-        self.rules.append((QtCore.QRegExp(r'\b[0-9]+\b'), number_format))
-        bool_format = QtGui.QTextCharFormat()
-        bool_format.setForeground(QtGui.QColor('red'))
-        self.rules.append((QtCore.QRegExp(r'\b(true|false|null)\b'), bool_format))
-        brace_format = QtGui.QTextCharFormat()
-        brace_format.setForeground(QtGui.QColor('blue'))
-        self.rules.append((QtCore.QRegExp(r'[\{\}\[\]]'), brace_format))
-        colon_format = QtGui.QTextCharFormat()
-        colon_format.setForeground(QtGui.QColor('black'))
-        self.rules.append((QtCore.QRegExp(r':'), colon_format))
-        comma_format = QtGui.QTextCharFormat()
-        comma_format.setForeground(QtGui.QColor('black'))
-        self.rules.append((QtCore.QRegExp(r','), comma_format))
+    def show_large_payload(self, value):
+        if self.hex_checkbox.isChecked() or looks_binary(value):
+            mode = 'hex'
+        elif bytes(value[:64]).lstrip()[:1] in (b'{', b'['):
+            mode = 'json'
+        else:
+            mode = 'text'
+        self.large_model.set_payload(value, mode)
+        self.large_view.scrollToTop()
+        self.payload_stack.setCurrentWidget(self.large_view)
+        self.status_label.setText(f"Large message: {len(value)} bytes, {mode} view")
 
-    def highlightBlock(self, text):
-        for pattern, fmt in self.rules:
-            expression = QtCore.QRegExp(pattern)
-            index = expression.indexIn(text)
-            while index >= 0:
-                length = expression.matchedLength()
-                self.setFormat(index, length, fmt)
-                index = expression.indexIn(text, index + length)
+    def show_decoded_large_payload(self, text, is_json):
+        if is_json:
+            self.large_model.set_payload(text.encode('utf-8'), 'json')
+            self.large_view.scrollToTop()
+            self.payload_stack.setCurrentWidget(self.large_view)
+            self.status_label.setText(
+                f"Large message: {len(self.large_value)} bytes, decoded as {self.deserializer}, json view")
+        else:
+            self.show_large_payload(self.large_value)
+            self.status_label.setText(
+                f"Large message: {len(self.large_value)} bytes, {self.deserializer} decode failed, showing raw payload")
+        self.large_value = None
 
-class ConsumeThread(QtCore.QThread):
-    message_signal = QtCore.pyqtSignal(str)
-    def __init__(self, consumer):
-        super().__init__()
-        self.consumer = consumer
-        self._is_running = True
-    def run(self):
-        try:
-            for message in self.consumer:
-                if not self._is_running:
-                    break
-                value = message.value
-                if value is not None:
-                    try:
-                        decoded = value.decode('utf-8', errors='replace')
-                    except Exception:
-                        decoded = str(value)
-                else:
-                    decoded = ""
-                msg = f"Offset: {message.offset}, Key: {message.key}, Value: {decoded}"
-                self.message_signal.emit(msg)
-                logging.debug(f"Message: {message}")
-        except Exception as e:
-            self.message_signal.emit(f"Error: {e}")
-            logging.error(f"Error consuming messages: {e}")
-    def stop(self):
-        self._is_running = False
-        self.consumer.close()
+    def redisplay_message(self):
+        self.display_message(self.message_list.currentIndex(), None)
+
+    def deserializer_changed(self, deserializer):
+        self.deserializer = deserializer
+        if hasattr(self.parent(), 'set_topic_deserializer'):
+            self.parent().set_topic_deserializer(self.topic, deserializer)
+        self.redisplay_message()
+
+    def fetch_finished(self):
+        pass
+
+    def done(self, result):
+        self.overview_thread.stop()
+        self.format_thread.stop()
+        self.overview_thread.wait()
+        self.format_thread.wait()
+        super().done(result)
+
+class PagedMessageModel(QtCore.QAbstractListModel):
+    """
+    Virtual list over the offset range of one partition. Records are fetched in fixed-size
+    pages aligned to absolute offsets; only pages near the viewport are kept in memory.
+    The view only ever sees a window of at most window_rows offsets starting at
+    window_start, because Qt's list layout costs time in the row count; the dialog moves
+    the window when the user jumps or scrolls near its edge.
+    """
+    page_requested = QtCore.pyqtSignal(int, int, int)
+    page_size = 100
+    max_cached_pages = 6
+    window_rows = 20000
 
-class SettingsDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Settings")
-        self.setGeometry(200, 200, 300, 200)
-        self.parent = parent
-        self.selected_font = None
-        self.init_ui()
+        self.partition = None
+        self.begin = 0
+        self.end = 0
+        self.window_start = 0
+        self.generation = 0
+        self.focus_page = 0
+        self.pages = {}
+        self.pending = set()
 
-    def init_ui(self):
-        self.layout = QtWidgets.QFormLayout(self)
-        self.theme_combo = QtWidgets.QComboBox()
-        self.theme_combo.addItems(['Light', 'Dark'])
-        self.theme_combo.setCurrentText(self.parent.settings.get('theme', 'Light'))
-        self.layout.addRow("Theme:", self.theme_combo)
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(0, min(self.end - self.window_start, self.window_rows))
 
-        self.font_btn = QtWidgets.QPushButton("Font")
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        offset = self.window_start + index.row()
+        page = offset // self.page_size
+        records = self.pages.get(page)
+        if records is None:
+            self.request_page(page)
+            return f"Offset: {offset} (loading...)" if role == QtCore.Qt.DisplayRole else None
+        record = records.get(offset)
+        if role == QtCore.Qt.DisplayRole:
+            if record is None:
+                return f"Offset: {offset} (no record)"
+            key = str(record.key) if record.key else ''
+            if record.timestamp is None or record.timestamp < 0:
+                return f"Offset: {offset}, Key: {key}"
+            timestamp = datetime.datetime.fromtimestamp(record.timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
+            return f"Offset: {offset}, Key: {key}, Time: {timestamp}"
+        if role == QtCore.Qt.UserRole:
+            return record
+        return None
+
+    def set_range(self, partition, begin, end):
+        if partition == self.partition and begin == self.begin and end >= self.end:
+            if end > self.end:
+                # The last page may have been fetched while it was still partial
+                self.pages.pop((self.end - 1) // self.page_size, None)
+                first_row = self.rowCount()
+                self.end = end
+                last_row = self.rowCount() - 1
+                if last_row >= first_row:
+                    self.beginInsertRows(QtCore.QModelIndex(), first_row, last_row)
+                    self.endInsertRows()
+            return
+        self.beginResetModel()
+        self.partition = partition
+        self.begin = begin
+        self.end = end
+        self.window_start = begin
+        self.generation += 1
+        self.focus_page = begin // self.page_size
+        self.pages.clear()
+        self.pending.clear()
+        self.endResetModel()
+
+    def row_for_offset(self, offset):
+        if self.begin <= offset < self.end and 0 <= offset - self.window_start < self.window_rows:
+            return offset - self.window_start
+        return None
+
+    def move_window(self, offset):
+        """
+        Centre the row window on offset (clamped to the partition) and return its row.
+        """
+        start = max(self.begin, min(offset - self.window_rows // 2, self.end - self.window_rows))
+        if start != self.window_start:
+            self.beginResetModel()
+            self.window_start = start
+            self.endResetModel()
+        return offset - self.window_start
+
+    def near_window_edge(self, row):
+        margin = self.window_rows // 10
+        return ((row < margin and self.window_start > self.begin) or
+                (row >= self.rowCount() - margin and self.window_start + self.rowCount() < self.end))
+
+    def set_focus_row(self, row):
+        self.focus_page = (self.window_start + row) // self.page_size
+
+    def is_page_wanted(self, generation, page):
+        # Called from the fetch thread to drop requests the user has already scrolled past
+        return generation == self.generation and abs(page - self.focus_page) <= self.max_cached_pages // 2
+
+    def request_page(self, page):
+        if page in self.pending or page in self.pages:
+            return
+        first_page = self.begin // self.page_size
+        last_page = (self.end - 1) // self.page_size
+        if not first_page <= page <= last_page:
+            return
+        self.pending.add(page)
+        self.page_requested.emit(self.generation, self.partition, page)
+
+    def page_loaded(self, generation, partition, page, records):
+        if generation != self.generation:
+            return
+        self.pending.discard(page)
+        if records is None:
+            # Request was skipped by the fetcher; it is re-requested when it becomes visible again
+            return
+        self.pages[page] = {record.offset: record for record in records}
+        while len(self.pages) > self.max_cached_pages:
+            farthest = max(self.pages, key=lambda p: abs(p - self.focus_page))
+            del self.pages[farthest]
+        first_row = max(page * self.page_size - self.window_start, 0)
+        last_row = min((page + 1) * self.page_size - self.window_start, self.rowCount()) - 1
+        if last_row >= first_row:
+            self.dataChanged.emit(self.index(first_row), self.index(last_row))
+        if page <= self.focus_page + 1:
+            self.request_page(page + 1)
+
+def looks_binary(data, sample_size=4096):
+    sample = bytes(data[:sample_size])
+    if b'\x00' in sample:
+        return True
+    try:
+        # final=False tolerates a multi-byte character cut off at the end of the sample
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return False
+    except UnicodeDecodeError:
+        return True
+
+def hex_line(data, row, width=16):
+    start = row * width
+    chunk = bytes(data[start:start + width])
+    hex_part = ' '.join(f'{b:02x}' for b in chunk)
+    text_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
+    return f"{start:08x}  {hex_part:<{width * 3 - 1}}  {text_part}"
+
+def wrap_lines(lines, width):
+    for line in lines:
+        if len(line) <= width:
+            yield line
+            continue
+        # Slice by index: re-slicing the remainder would copy it on every row
+        for start in range(0, len(line), width):
+            yield line[start:start + width]
+
+def iter_text_lines(data, chunk_size=64 * 1024, max_pending=64 * 1024):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    for start in range(0, len(data), chunk_size):
+        pending += decoder.decode(data[start:start + chunk_size])
+        lines = pending.split('\n')
+        pending = lines.pop()
+        yield from lines
+        # Keep a newline-free blob from growing the carry-over buffer without bound
+        while len(pending) > max_pending:
+            yield pending[:max_pending]
+            pending = pending[max_pending:]
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+json_whitespace_pattern = re.compile(rb'\s*')
+# Strings use the unrolled [^"\\]*(?:\\.[^"\\]*)* form: one alternation per character is very slow on long tokens.
+# Scalars are limited to JSON literals and numbers so free text never scans as a token.
+json_token_pattern = re.compile(
+    rb'\s*(?:("[^"\\]*(?:\\.[^"\\]*)*")|([{}\[\],:])'
+    rb'|(true|false|null|-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)(?![^\s{}\[\],:]))')
+json_long_token_bytes = 64 * 1024
+
+def iter_pretty_json_lines(data, indent=4, probe_bytes=4096):
+    """
+    Yield the lines of an indented rendering of a JSON document by scanning its tokens
+    straight from the buffer, so the formatted text is never built as a whole.
+    Lines are held back until probe_bytes of input scan cleanly: a bad token or trailing data
+    before that renders the whole payload as text, later ones pass the rest through as text.
+    """
+    closers = {b'{': b'}', b'[': b']'}
+    stack = []
+    ready = []
+    line = []
+    line_start = 0
+    pos = 0
+    committed = complete = False
+    while pos < len(data):
+        if ready and pos >= probe_bytes:
+            committed = True
+            yield from ready
+            ready = []
+        match = json_token_pattern.match(data, pos)
+        if not match:
+            break
+        pos = match.end()
+        if match.lastindex == 1 and match.end(1) - match.start(1) > json_long_token_bytes:
+            # Stream long strings (e.g. base64 blobs) in pieces rather than decoding the whole token
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            start, end = match.span(1)
+            for piece_start in range(start, end, json_long_token_bytes):
+                piece_end = min(piece_start + json_long_token_bytes, end)
+                line.append(decoder.decode(data[piece_start:piece_end], final=piece_end == end))
+                if piece_end < end:
+                    ready.append(''.join(line))
+                    line, line_start = [], piece_end
+        else:
+            string, punct, scalar = match.groups()
+            if punct is None:
+                line.append((string or scalar).decode('utf-8', errors='replace'))
+            elif punct == b':':
+                line.append(': ')
+            elif punct == b',':
+                line.append(',')
+                ready.append(''.join(line))
+                line, line_start = [' ' * indent * len(stack)], pos
+            elif punct in closers:
+                following = json_token_pattern.match(data, pos)
+                if following and following.group(2) == closers[punct]:
+                    line.append((punct + closers[punct]).decode())
+                    pos = following.end()
+                else:
+                    line.append(punct.decode())
+                    ready.append(''.join(line))
+                    stack.append(closers[punct])
+                    line, line_start = [' ' * indent * len(stack)], pos
+                    continue
+            else:
+                if not stack or stack.pop() != punct:
+                    break
+                if ''.join(line).strip():
+                    ready.append(''.join(line))
+                line, line_start = [' ' * indent * len(stack), punct.decode()], match.start(2)
+        if not stack:
+            complete = True
+            break
+    if complete:
+        ready.append(''.join(line))
+        line_start = json_whitespace_pattern.match(data, pos).end()
+        if line_start == len(data):
+            yield from ready
+            return
+    if not committed:
+        yield from iter_text_lines(data)
+        return
+    # Keep what already rendered and pass the rest through from the start of the pending line
+    yield from ready
+    yield from iter_text_lines(data[line_start:])
+
+class LargePayloadModel(QtCore.QAbstractListModel):
+    """
+    Line model for multi-megabyte payloads. Hex rows are computed on demand from the raw
+    buffer; text and JSON lines are generated in chunks through fetchMore as the view scrolls.
+    """
+    chunk_lines = 500
+    max_line_chars = 4096
+    hex_width = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.payload = memoryview(b'')
+        self.mode = 'text'
+        self.lines = []
+        self.line_source = iter(())
+        self.exhausted = True
+
+    def set_payload(self, value, mode):
+        self.beginResetModel()
+        self.payload = memoryview(value)
+        self.mode = mode
+        self.lines = []
+        if mode == 'hex':
+            self.line_source = iter(())
+            self.exhausted = True
+        else:
+            source = iter_pretty_json_lines(self.payload) if mode == 'json' else iter_text_lines(self.payload)
+            self.line_source = wrap_lines(source, self.max_line_chars)
+            self.exhausted = False
+        self.endResetModel()
+        self.fetchMore(QtCore.QModelIndex())
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.mode == 'hex':
+            return (len(self.payload) + self.hex_width - 1) // self.hex_width
+        return len(self.lines)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+        if self.mode == 'hex':
+            return hex_line(self.payload, index.row(), self.hex_width)
+        return self.lines[index.row()]
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self.exhausted:
+            return
+        chunk = list(itertools.islice(self.line_source, self.chunk_lines))
+        if len(chunk) < self.chunk_lines:
+            self.exhausted = True
+        if chunk:
+            first_row = len(self.lines)
+            self.beginInsertRows(QtCore.QModelIndex(), first_row, first_row + len(chunk) - 1)
+            self.lines.extend(chunk)
+            self.endInsertRows()
+
+class OverviewThread(QtCore.QThread):
+    message_signal = QtCore.pyqtSignal(object)
+    partitions_signal = QtCore.pyqtSignal(dict)
+    page_signal = QtCore.pyqtSignal(int, int, int, object)
+    seek_signal = QtCore.pyqtSignal(int, object)
+    finished = QtCore.pyqtSignal()
+    def __init__(self, consumer_config, topic, page_size=100):
+        super().__init__()
+        self.consumer_config = consumer_config
+        self.topic = topic
+        self.page_size = page_size
+        # Newest requests first: pages for the current viewport win over ones scrolled past
+        self.requests = queue.LifoQueue()
+        self.is_page_wanted = lambda generation, page: True
+        self.begin_offsets = {}
+        self.end_offsets = {}
+        self._is_running = True
+    def request_page(self, generation, partition, page):
+        self.requests.put(('page', generation, partition, page))
+    def request_watermarks(self):
+        self.requests.put(('watermarks',))
+    def request_time(self, partition, timestamp_ms):
+        self.requests.put(('time', partition, timestamp_ms))
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        temp_consumer = None
+        try:
+            temp_consumer = attach_consumer(self.consumer_config)
+            self.load_watermarks(temp_consumer)
+            while self._is_running:
+                try:
+                    request = self.requests.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                try:
+                    if request[0] == 'page':
+                        _, generation, partition, page = request
+                        records = None
+                        if self.is_page_wanted(generation, page):
+                            records = self.fetch_page(temp_consumer, partition, page)
+                        self.page_signal.emit(generation, partition, page, records)
+                    elif request[0] == 'watermarks':
+                        self.load_watermarks(temp_consumer)
+                    elif request[0] == 'time':
+                        self.find_offset_for_time(temp_consumer, request[1], request[2])
+                except Exception as e:
+                    error_msg = f"Overview error: {e}"
+                    self.message_signal.emit(error_msg)
+                    logging.error(error_msg)
+        except Exception as e:
+            error_msg = f"Overview error: {e}"
+            self.message_signal.emit(error_msg)
+            logging.error(error_msg)
+        finally:
+            if temp_consumer:
+                temp_consumer.close()
+            self.finished.emit()
+    def load_watermarks(self, consumer):
+        from kafka import TopicPartition
+        partitions = consumer.partitions_for_topic(self.topic) or set()
+        tps = [TopicPartition(self.topic, p) for p in partitions]
+        begin_offsets = consumer.beginning_offsets(tps)
+        end_offsets = consumer.end_offsets(tps)
+        watermarks = {tp.partition: (begin_offsets[tp], end_offsets[tp]) for tp in tps}
+        self.begin_offsets = {partition: begin for partition, (begin, end) in watermarks.items()}
+        self.end_offsets = {partition: end for partition, (begin, end) in watermarks.items()}
+        self.partitions_signal.emit(watermarks)
+        logging.info(f"Loaded offsets for {len(watermarks)} partitions of '{self.topic}'.")
+    def fetch_page(self, consumer, partition, page):
+        from kafka import TopicPartition
+        tp = TopicPartition(self.topic, partition)
+        # Pages are aligned to absolute offsets, so the first one usually starts before the log start
+        start = max(page * self.page_size, self.begin_offsets.get(partition, 0))
+        stop = min(page * self.page_size + self.page_size, self.end_offsets.get(partition, start + self.page_size))
+        if start >= stop:
+            return []
+        consumer.assign([tp])
+        consumer.seek(tp, start)
+        records = []
+        empty_polls = 0
+        while self._is_running and consumer.position(tp) < stop and empty_polls < 3:
+            batch = consumer.poll(timeout_ms=500, max_records=self.page_size).get(tp, [])
+            if not batch:
+                empty_polls += 1
+                continue
+            empty_polls = 0
+            records.extend(record for record in batch if start <= record.offset < stop)
+        logging.debug(f"Fetched {len(records)} messages from '{self.topic}' [{partition}] page {page}")
+        return records
+    def find_offset_for_time(self, consumer, partition, timestamp_ms):
+        from kafka import TopicPartition
+        tp = TopicPartition(self.topic, partition)
+        result = consumer.offsets_for_times({tp: timestamp_ms}).get(tp)
+        self.seek_signal.emit(partition, result.offset if result else None)
+
+class PayloadCache:
+    """
+    LRU of formatted payloads keyed by (partition, offset), bounded by total characters.
+    """
+    def __init__(self, max_chars=32 * 1024 * 1024):
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_chars -= len(old[0])
+        self._entries[key] = entry
+        self.total_chars += len(entry[0])
+        while self.total_chars > self.max_chars and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_chars -= len(evicted[0])
+
+class FormatThread(QtCore.QThread):
+    formatted_signal = QtCore.pyqtSignal(object, str, bool)
+    def __init__(self):
+        super().__init__()
+        self.requests = queue.Queue()
+        self._is_running = True
+    def request(self, key, value, deserializer='Text', registry=None, indent=4):
+        self.requests.put((key, value, deserializer, registry, indent))
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        while self._is_running:
+            try:
+                request = self.requests.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            # Only the newest selection is on screen; skip the ones scrolled past
+            while True:
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+            key, value, deserializer, registry, indent = request
+            try:
+                text, is_json = format_value(value, deserializer, registry, indent)
+            except Exception as e:
+                text, is_json = f"Format error: {e}", False
+                logging.error(text)
+            self.formatted_signal.emit(key, text, is_json)
+
+class JsonHighlighter(QtGui.QSyntaxHighlighter):
+    """
+    Colours pretty-printed JSON in a single pass per block using one precompiled pattern.
+    Create it once per document and toggle `enabled` instead of rebuilding it per payload.
+    """
+    token_pattern = re.compile(
+        r'(?P<string>"(?:[^"\\]|\\.)*")'
+        r'|(?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)'
+        r'|(?P<keyword>\b(?:true|false|null)\b)'
+        r'|(?P<brace>[{}\[\]])'
+        r'|(?P<punct>[:,])'
+    )
+
+    def __init__(self, document):
+        super().__init__(document)
+        self.enabled = True
+        self.formats = {}
+        for group, color in (('string', 'green'), ('number', 'magenta'), ('keyword', 'red'),
+                             ('brace', 'blue'), ('punct', 'black')):
+            fmt = QtGui.QTextCharFormat()
+            fmt.setForeground(QtGui.QColor(color))
+            self.formats[group] = fmt
+
+    def highlightBlock(self, text):
+        if not self.enabled:
+            return
+        formats = self.formats
+        for match in self.token_pattern.finditer(text):
+            start, end = match.span()
+            self.setFormat(start, end - start, formats[match.lastgroup])
+
+class SendThread(QtCore.QThread):
+    """
+    Hands records to the producer off the GUI thread and reports each delivery through
+    delivery_signal from the producer's callbacks, so many sends can be in flight at once.
+    """
+    delivery_signal = QtCore.pyqtSignal(int, bool, str, float)
+    def __init__(self):
+        super().__init__()
+        self.requests = queue.Queue()
+        self._is_running = True
+    def send(self, send_id, producer, topic, value, key=None, headers=None, partition=None):
+        self.requests.put((send_id, producer, topic, value, key, headers, partition, time.monotonic()))
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        while self._is_running:
+            try:
+                send_id, producer, topic, value, key, headers, partition, started = self.requests.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                # send() only blocks here, e.g. while waiting for topic metadata
+                future = producer.send(topic, value=value, key=key, headers=headers, partition=partition)
+                future.add_callback(self.delivered, send_id, started)
+                future.add_errback(self.failed, send_id, started)
+            except Exception as e:
+                self.failed(send_id, started, e)
+    def delivered(self, send_id, started, metadata):
+        latency_ms = (time.monotonic() - started) * 1000
+        self.delivery_signal.emit(send_id, True, f"partition {metadata.partition}, offset {metadata.offset}", latency_ms)
+    def failed(self, send_id, started, error):
+        latency_ms = (time.monotonic() - started) * 1000
+        self.delivery_signal.emit(send_id, False, str(error), latency_ms)
+
+class ConsumeThread(QtCore.QThread):
+    batch_signal = QtCore.pyqtSignal(list)
+    def __init__(self, consumer, batch_size=500, flush_interval_ms=33, deserializer='Text', registry_location=None):
+        super().__init__()
+        self.consumer = consumer
+        self.deserializer = deserializer
+        self.registry_location = registry_location
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self._is_running = True
+    def run(self):
+        batch = []
+        last_flush = time.monotonic()
+        try:
+            while self._is_running:
+                elapsed_ms = (time.monotonic() - last_flush) * 1000
+                timeout_ms = max(1, int(self.flush_interval_ms - elapsed_ms))
+                records = self.consumer.poll(timeout_ms=timeout_ms, max_records=self.batch_size)
+                for partition_records in records.values():
+                    batch.extend(self.format_records(partition_records))
+                    if len(batch) >= self.batch_size:
+                        self.flush(batch)
+                        batch = []
+                        last_flush = time.monotonic()
+                if (time.monotonic() - last_flush) * 1000 >= self.flush_interval_ms:
+                    if batch:
+                        self.flush(batch)
+                        batch = []
+                    last_flush = time.monotonic()
+        except Exception as e:
+            batch.append(f"Error: {e}")
+            logging.error(f"Error consuming messages: {e}")
+        finally:
+            if batch:
+                self.flush(batch)
+            self.consumer.close()
+    def format_records(self, messages):
+        records = [(message.offset, message.key, message.value) for message in messages]
+        return format_consumed_batch(records, self.deserializer, self.registry_location)
+    def flush(self, batch):
+        self.batch_signal.emit(batch)
+        logging.debug(f"Emitted batch of {len(batch)} messages")
+    def stop(self):
+        # The consumer is closed by run() once the current poll returns
+        self._is_running = False
+
+class ParallelConsumeThread(QtCore.QThread):
+    """
+    Consumes a topic with several fetcher threads, each owning an assigned consumer for a
+    share of the partitions, and formats poll batches in a process pool. Each fetcher's
+    batches are merged in submission order, which keeps every partition in offset order;
+    the UI only receives formatted lines, at most once per flush interval. Every poll batch
+    holds a slot from submission until the UI calls batch_delivered() for the signal that
+    carried its lines, so a slow UI throttles fetching instead of queueing signals.
+    """
+    batch_signal = QtCore.pyqtSignal(list)
+    def __init__(self, config, topic, start_at='earliest', fetchers=4, workers=2, batch_size=500, flush_interval_ms=33,
+                 deserializer='Text', registry_location=None):
+        super().__init__()
+        self.config = config
+        self.topic = topic
+        self.deserializer = deserializer
+        self.registry_location = registry_location
+        self.start_at = start_at
+        self.fetchers = fetchers
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.pending = []
+        self.errors = []
+        self.slots = None
+        # Slots held by each emitted batch, in emit order; queued signals arrive in that order
+        self.undelivered = collections.deque()
+        self._is_running = True
+    def run(self):
+        executor = None
+        fetchers = []
+        try:
+            from kafka import TopicPartition
+            from kafka.errors import KafkaError
+            consumer = attach_consumer(self.config)
+            try:
+                partitions = consumer.partitions_for_topic(self.topic)
+            finally:
+                consumer.close()
+            if not partitions:
+                raise KafkaError(f"Topic '{self.topic}' not found")
+            tps = [TopicPartition(self.topic, p) for p in sorted(partitions)]
+            executor = concurrent.futures.ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            slots = self.slots = threading.Semaphore(self.workers * 4)
+            fetcher_count = min(self.fetchers, len(tps))
+            self.pending = [collections.deque() for _ in range(fetcher_count)]
+            fetchers = [
+                threading.Thread(target=self.fetch_partitions, args=(tps[i::fetcher_count], executor, slots, self.pending[i]), daemon=True)
+                for i in range(fetcher_count)
+            ]
+            for fetcher in fetchers:
+                fetcher.start()
+            while self._is_running:
+                time.sleep(self.flush_interval_ms / 1000)
+                self.merge(slots)
+                if not any(fetcher.is_alive() for fetcher in fetchers) and not any(self.pending):
+                    break
+        except Exception as e:
+            self.emit_lines([f"Error: {e}"], 0)
+            logging.error(f"Error consuming messages: {e}")
+        finally:
+            self._is_running = False
+            for fetcher in fetchers:
+                fetcher.join()
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+    def fetch_partitions(self, tps, executor, slots, pending):
+        consumer = None
+        try:
+            consumer = attach_consumer(self.config)
+            consumer.assign(tps)
+            if self.start_at == 'latest':
+                consumer.seek_to_end(*tps)
+            else:
+                consumer.seek_to_beginning(*tps)
+            while self._is_running:
+                for partition_records in consumer.poll(timeout_ms=100, max_records=self.batch_size).values():
+                    while not slots.acquire(timeout=0.1):
+                        if not self._is_running:
+                            return
+                    records = [(message.offset, message.key, message.value) for message in partition_records]
+                    pending.append(executor.submit(format_consumed_batch, records, self.deserializer, self.registry_location))
+        except Exception as e:
+            self.errors.append(str(e))
+            logging.error(f"Error consuming messages: {e}")
+        finally:
+            if consumer:
+                consumer.close()
+    def merge(self, slots):
+        lines = []
+        merged = 0
+        for pending in self.pending:
+            while pending and pending[0].done():
+                future = pending.popleft()
+                merged += 1
+                try:
+                    lines.extend(future.result())
+                except Exception as e:
+                    lines.append(f"Error: {e}")
+        while self.errors:
+            lines.append(f"Error: {self.errors.pop(0)}")
+        if lines:
+            self.emit_lines(lines, merged)
+        elif merged:
+            for _ in range(merged):
+                slots.release()
+    def emit_lines(self, lines, slot_count):
+        self.undelivered.append(slot_count)
+        self.batch_signal.emit(lines)
+        logging.debug(f"Emitted batch of {len(lines)} messages")
+    def batch_delivered(self, lines=None):
+        # Connected after the display slot, so it runs on the UI thread once a batch is shown
+        if self.undelivered:
+            for _ in range(self.undelivered.popleft()):
+                self.slots.release()
+    def stop(self):
+        self._is_running = False
+
+class LineRingBuffer:
+    """
+    Fixed-capacity ring of text lines, bounded by line count and by total UTF-8 bytes.
+    Oldest lines are evicted first; indexing is O(1).
+    """
+    def __init__(self, max_lines, max_bytes=0):
+        self.max_lines = max(1, max_lines)
+        self.max_bytes = max_bytes
+        self._lines = [None] * self.max_lines
+        self._sizes = [0] * self.max_lines
+        self._start = 0
+        self._count = 0
+        self.total_bytes = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        return self._lines[(self._start + row) % self.max_lines]
+
+    def overflow(self, sizes):
+        # Number of lines that must be evicted from the front to make room for `sizes`
+        drop = max(0, self._count + len(sizes) - self.max_lines)
+        if self.max_bytes:
+            total = self.total_bytes + sum(sizes)
+            for row in range(drop):
+                total -= self._sizes[(self._start + row) % self.max_lines]
+            while total > self.max_bytes and drop < self._count:
+                total -= self._sizes[(self._start + drop) % self.max_lines]
+                drop += 1
+        return drop
+
+    def pop_front(self, count):
+        for _ in range(min(count, self._count)):
+            self._lines[self._start] = None
+            self.total_bytes -= self._sizes[self._start]
+            self._sizes[self._start] = 0
+            self._start = (self._start + 1) % self.max_lines
+            self._count -= 1
+
+    def extend(self, lines, sizes):
+        for line, size in zip(lines, sizes):
+            slot = (self._start + self._count) % self.max_lines
+            self._lines[slot] = line
+            self._sizes[slot] = size
+            self.total_bytes += size
+            self._count += 1
+
+    def tail(self, count):
+        return [self[row] for row in range(max(0, self._count - count), self._count)]
+
+
+class LogModel(QtCore.QAbstractListModel):
+    max_display_chars = 4000
+
+    def __init__(self, max_lines=100000, max_bytes=64 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.buffer = LineRingBuffer(max_lines, max_bytes)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.buffer)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            line = self.buffer[index.row()]
+            if len(line) > self.max_display_chars:
+                line = line[:self.max_display_chars] + " …"
+            return line.replace("\n", " ")
+        if role == QtCore.Qt.UserRole:
+            return self.buffer[index.row()]
+        return None
+
+    def append_lines(self, lines):
+        lines = lines[-self.buffer.max_lines:]
+        sizes = [len(line.encode('utf-8', errors='replace')) for line in lines]
+        if self.buffer.max_bytes:
+            # A single batch larger than the byte cap keeps only its newest lines
+            total = sum(sizes)
+            first = 0
+            while total > self.buffer.max_bytes and first < len(lines) - 1:
+                total -= sizes[first]
+                first += 1
+            lines, sizes = lines[first:], sizes[first:]
+        if not lines:
+            return
+        drop = self.buffer.overflow(sizes)
+        if drop:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, drop - 1)
+            self.buffer.pop_front(drop)
+            self.endRemoveRows()
+        first_row = len(self.buffer)
+        self.beginInsertRows(QtCore.QModelIndex(), first_row, first_row + len(lines) - 1)
+        self.buffer.extend(lines, sizes)
+        self.endInsertRows()
+
+    def set_limits(self, max_lines, max_bytes):
+        if max_lines == self.buffer.max_lines and max_bytes == self.buffer.max_bytes:
+            return
+        self.beginResetModel()
+        kept = self.buffer.tail(max_lines)
+        self.buffer = LineRingBuffer(max_lines, max_bytes)
+        self.endResetModel()
+        self.append_lines(kept)
+
+    def clear(self):
+        self.beginResetModel()
+        self.buffer = LineRingBuffer(self.buffer.max_lines, self.buffer.max_bytes)
+        self.endResetModel()
+
+
+class LogView(QtWidgets.QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_model = LogModel(parent=self)
+        self.setModel(self.log_model)
+        # Uniform rows let the view lay out and paint only the visible slice
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QtWidgets.QListView.Batched)
+        self.setBatchSize(200)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        copy_action = QtWidgets.QAction("Copy", self)
+        copy_action.setShortcut(QtGui.QKeySequence.Copy)
+        copy_action.setShortcutContext(QtCore.Qt.WidgetShortcut)
+        copy_action.triggered.connect(self.copy_selection)
+        self.addAction(copy_action)
+        select_all_action = QtWidgets.QAction("Select All", self)
+        select_all_action.setShortcut(QtGui.QKeySequence.SelectAll)
+        select_all_action.setShortcutContext(QtCore.Qt.WidgetShortcut)
+        select_all_action.triggered.connect(self.selectAll)
+        self.addAction(select_all_action)
+        clear_action = QtWidgets.QAction("Clear", self)
+        clear_action.triggered.connect(self.log_model.clear)
+        self.addAction(clear_action)
+
+    def append(self, text):
+        self.append_lines(text.split("\n"))
+
+    def append_lines(self, lines):
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_lines(lines)
+        if at_bottom:
+            self.scrollToBottom()
+
+    def set_limits(self, max_lines, max_bytes):
+        self.log_model.set_limits(max_lines, max_bytes)
+
+    def copy_selection(self):
+        rows = sorted(index.row() for index in self.selectionModel().selectedIndexes())
+        if rows:
+            text = "\n".join(self.log_model.data(self.log_model.index(row), QtCore.Qt.UserRole) for row in rows)
+            QtWidgets.QApplication.clipboard().setText(text)
+
+class BulkSendDialog(QtWidgets.QDialog):
+    def __init__(self, config, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Bulk Send: {topic}")
+        self.setGeometry(250, 200, 500, 450)
+        self.config = config
+        self.topic = topic
+        self.bulk_thread = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        file_layout = QtWidgets.QHBoxLayout()
+        self.file_edit = QtWidgets.QLineEdit()
+        self.browse_btn = QtWidgets.QPushButton("Browse")
+        self.browse_btn.clicked.connect(self.browse_file)
+        file_layout.addWidget(self.file_edit)
+        file_layout.addWidget(self.browse_btn)
+        self.layout.addRow("File:", file_layout)
+        self.format_combo = QtWidgets.QComboBox()
+        self.format_combo.addItems(RecordFileReader.formats)
+        self.layout.addRow("Format:", self.format_combo)
+        self.key_field_edit = QtWidgets.QLineEdit()
+        self.key_field_edit.setPlaceholderText("none")
+        self.layout.addRow("Key Field:", self.key_field_edit)
+        self.value_field_edit = QtWidgets.QLineEdit()
+        self.value_field_edit.setPlaceholderText("whole record")
+        self.layout.addRow("Value Field:", self.value_field_edit)
+        self.headers_field_edit = QtWidgets.QLineEdit()
+        self.headers_field_edit.setPlaceholderText("none")
+        self.layout.addRow("Headers Field:", self.headers_field_edit)
+        self.partition_field_edit = QtWidgets.QLineEdit()
+        self.partition_field_edit.setPlaceholderText("by key")
+        self.layout.addRow("Partition Field:", self.partition_field_edit)
+        self.linger_spin = QtWidgets.QSpinBox()
+        self.linger_spin.setRange(0, 10000)
+        self.linger_spin.setValue(20)
+        self.linger_spin.setSuffix(" ms")
+        self.layout.addRow("Linger:", self.linger_spin)
+        self.batch_spin = QtWidgets.QSpinBox()
+        self.batch_spin.setRange(1, 16 * 1024 * 1024)
+        self.batch_spin.setValue(256 * 1024)
+        self.batch_spin.setSuffix(" bytes")
+        self.layout.addRow("Batch Size:", self.batch_spin)
+        self.compression_combo = QtWidgets.QComboBox()
+        self.compression_combo.addItems(['none', 'gzip', 'snappy', 'lz4', 'zstd'])
+        self.layout.addRow("Compression:", self.compression_combo)
+        if self.config.get('tuning_preset', 'Default') != 'Default':
+            tuning = server_tuning(self.config)
+            self.linger_spin.setValue(tuning['linger_ms'])
+            self.batch_spin.setValue(tuning['batch_size'])
+            self.compression_combo.setCurrentText(tuning['compression_type'])
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.layout.addRow(self.progress_bar)
+        self.stats_label = QtWidgets.QLabel("Idle.")
+        self.stats_label.setWordWrap(True)
+        self.layout.addRow(self.stats_label)
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_send)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_send)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        self.button_layout.addWidget(self.start_btn)
+        self.button_layout.addWidget(self.cancel_btn)
+        self.button_layout.addWidget(self.close_btn)
+        self.layout.addRow(self.button_layout)
+
+    def browse_file(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Records File", "", "Records (*.jsonl *.json *.csv *.txt);;All Files (*)")
+        if path:
+            self.file_edit.setText(path)
+            if path.lower().endswith('.csv'):
+                self.format_combo.setCurrentText('CSV')
+
+    def start_send(self):
+        path = self.file_edit.text().strip()
+        if not os.path.isfile(path):
+            QtWidgets.QMessageBox.warning(self, "No File", "Select a file to send.")
+            return
+        fields = {
+            'key': self.key_field_edit.text().strip(),
+            'value': self.value_field_edit.text().strip(),
+            'headers': self.headers_field_edit.text().strip(),
+            'partition': self.partition_field_edit.text().strip(),
+        }
+        reader = RecordFileReader(path, self.format_combo.currentText(), fields)
+        compression = self.compression_combo.currentText()
+        producer_options = {
+            'linger_ms': self.linger_spin.value(),
+            'batch_size': self.batch_spin.value(),
+            'compression_type': None if compression == 'none' else compression,
+        }
+        self.bulk_thread = BulkSendThread(self.config, self.topic, reader, producer_options)
+        self.bulk_thread.progress_signal.connect(self.show_progress)
+        self.bulk_thread.finished.connect(self.send_finished)
+        self.start_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.bulk_thread.start()
+        logging.info(f"Bulk send of {path} to '{self.topic}' started.")
+
+    def cancel_send(self):
+        if self.bulk_thread:
+            self.bulk_thread.stop()
+            self.stats_label.setText("Cancelling...")
+
+    def show_progress(self, stats):
+        self.progress_bar.setValue(int(stats['progress'] * 1000))
+        text = (f"Sent {stats['sent']}, acked {stats['acked']}, errors {stats['errors']}, "
+                f"skipped {stats['parse_errors']}\n"
+                f"Acked {stats['records_per_sec']:.0f} records/s, {stats['bytes_per_sec'] / 1024:.1f} KB/s, "
+                f"{stats['elapsed']:.1f} s")
+        if stats.get('error'):
+            text += f"\nError: {stats['error']}"
+        self.stats_label.setText(text)
+
+    def send_finished(self):
+        self.start_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.bulk_thread = None
+
+    def done(self, result):
+        if self.bulk_thread:
+            self.bulk_thread.stop()
+            self.bulk_thread.wait()
+        super().done(result)
+
+class BulkSendThread(QtCore.QThread):
+    progress_signal = QtCore.pyqtSignal(dict)
+    report_interval = 0.25
+    def __init__(self, config, topic, reader, producer_options):
+        super().__init__()
+        self.config = config
+        self.topic = topic
+        self.reader = reader
+        self.producer_options = producer_options
+        self.sent = 0
+        # Only the producer's I/O thread writes these, from delivery callbacks
+        self.acked = 0
+        self.acked_bytes = 0
+        self.errors = 0
+        self.error = None
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        producer = None
+        started = time.monotonic()
+        try:
+            from kafka import KafkaProducer
+            producer = KafkaProducer(**client_kwargs(self.config, 'producer', **self.producer_options))
+            last_report = started
+            for key, value, headers, partition in self.reader:
+                if not self._is_running:
+                    break
+                # send() blocks once buffer_memory is full, which bounds memory use
+                future = producer.send(self.topic, value=value, key=key, headers=headers, partition=partition)
+                future.add_callback(self.delivered)
+                future.add_errback(self.failed)
+                self.sent += 1
+                now = time.monotonic()
+                if now - last_report >= self.report_interval:
+                    self.report(now - started)
+                    last_report = now
+            producer.flush()
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Bulk send error: {e}")
+        finally:
+            if producer:
+                producer.close(timeout=10)
+            self.report(time.monotonic() - started)
+            logging.info(f"Bulk send to '{self.topic}' finished: {self.sent} sent, {self.acked} acked, {self.errors} errors.")
+    def delivered(self, metadata):
+        self.acked += 1
+        # Serialized sizes are -1 for a missing key or value
+        self.acked_bytes += max(metadata.serialized_key_size, 0) + max(metadata.serialized_value_size, 0)
+    def failed(self, error):
+        self.errors += 1
+        self.error = str(error)
+    def report(self, elapsed):
+        elapsed = max(elapsed, 1e-6)
+        self.progress_signal.emit({
+            'sent': self.sent,
+            'acked': self.acked,
+            'errors': self.errors,
+            'parse_errors': self.reader.parse_errors,
+            'elapsed': elapsed,
+            'records_per_sec': self.acked / elapsed,
+            'bytes_per_sec': self.acked_bytes / elapsed,
+            'progress': self.reader.bytes_read / self.reader.total_bytes if self.reader.total_bytes else 1.0,
+            'error': self.error,
+        })
+
+class PerfTestDialog(QtWidgets.QDialog):
+    def __init__(self, config, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Producer Perf Test: {topic}")
+        self.setGeometry(250, 200, 560, 600)
+        self.config = config
+        self.topic = topic
+        self.perf_thread = None
+        self.result = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        self.records_spin = QtWidgets.QSpinBox()
+        self.records_spin.setRange(1, 2 ** 31 - 1)
+        self.records_spin.setValue(100000)
+        self.layout.addRow("Records:", self.records_spin)
+        self.size_spin = QtWidgets.QSpinBox()
+        self.size_spin.setRange(1, 16 * 1024 * 1024)
+        self.size_spin.setValue(1024)
+        self.size_spin.setSuffix(" bytes")
+        self.layout.addRow("Record Size:", self.size_spin)
+        self.rate_spin = QtWidgets.QSpinBox()
+        self.rate_spin.setRange(0, 10000000)
+        self.rate_spin.setSpecialValueText("unthrottled")
+        self.rate_spin.setSuffix(" records/s")
+        self.layout.addRow("Target Rate:", self.rate_spin)
+        self.keys_spin = QtWidgets.QSpinBox()
+        self.keys_spin.setRange(0, 2 ** 31 - 1)
+        self.keys_spin.setSpecialValueText("no keys")
+        self.layout.addRow("Key Cardinality:", self.keys_spin)
+        self.acks_combo = QtWidgets.QComboBox()
+        self.acks_combo.addItems(['1', 'all', '0'])
+        self.layout.addRow("Acks:", self.acks_combo)
+        self.compression_combo = QtWidgets.QComboBox()
+        self.compression_combo.addItems(['none', 'gzip', 'snappy', 'lz4', 'zstd'])
+        self.layout.addRow("Compression:", self.compression_combo)
+        self.linger_spin = QtWidgets.QSpinBox()
+        self.linger_spin.setRange(0, 10000)
+        self.linger_spin.setValue(5)
+        self.linger_spin.setSuffix(" ms")
+        self.layout.addRow("Linger:", self.linger_spin)
+        self.batch_spin = QtWidgets.QSpinBox()
+        self.batch_spin.setRange(1, 16 * 1024 * 1024)
+        self.batch_spin.setValue(64 * 1024)
+        self.batch_spin.setSuffix(" bytes")
+        self.layout.addRow("Batch Size:", self.batch_spin)
+        if self.config.get('tuning_preset', 'Default') != 'Default':
+            tuning = server_tuning(self.config)
+            self.acks_combo.setCurrentText(tuning['acks'])
+            self.compression_combo.setCurrentText(tuning['compression_type'])
+            self.linger_spin.setValue(tuning['linger_ms'])
+            self.batch_spin.setValue(tuning['batch_size'])
+        self.threads_spin = QtWidgets.QSpinBox()
+        self.threads_spin.setRange(1, 64)
+        self.threads_spin.setValue(1)
+        self.layout.addRow("Producer Threads:", self.threads_spin)
+        self.results_text = QtWidgets.QPlainTextEdit()
+        self.results_text.setReadOnly(True)
+        self.layout.addRow(self.results_text)
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_test)
+        self.stop_btn = QtWidgets.QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_test)
+        self.export_btn = QtWidgets.QPushButton("Export JSON")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_result)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        for btn in (self.start_btn, self.stop_btn, self.export_btn, self.close_btn):
+            self.button_layout.addWidget(btn)
+        self.layout.addRow(self.button_layout)
+
+    def start_test(self):
+        acks = self.acks_combo.currentText()
+        compression = self.compression_combo.currentText()
+        options = {
+            'num_records': self.records_spin.value(),
+            'record_size': self.size_spin.value(),
+            'target_rate': self.rate_spin.value(),
+            'key_cardinality': self.keys_spin.value(),
+            'threads': self.threads_spin.value(),
+            'acks': acks if acks == 'all' else int(acks),
+            'compression_type': None if compression == 'none' else compression,
+            'linger_ms': self.linger_spin.value(),
+            'batch_size': self.batch_spin.value(),
+        }
+        self.perf_thread = PerfTestThread(self.config, self.topic, options)
+        self.perf_thread.progress_signal.connect(self.show_progress)
+        self.perf_thread.result_signal.connect(self.show_result)
+        self.perf_thread.finished.connect(self.test_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.export_btn.setEnabled(False)
+        self.results_text.setPlainText("Starting...")
+        self.perf_thread.start()
+
+    def stop_test(self):
+        if self.perf_thread:
+            self.perf_thread.stop()
+
+    def show_progress(self, stats):
+        self.results_text.setPlainText(
+            f"Sent {stats['sent']}, acked {stats['acked']}, errors {stats['errors']} in {stats['elapsed']:.1f} s\n"
+            f"{stats['records_per_sec']:.0f} records/s, {stats['mb_per_sec']:.2f} MB/s\n"
+            f"{stats['latency']}"
+        )
+
+    def show_result(self, result):
+        self.result = result
+        summary = result['results']
+        latency = result['latency']
+        lines = [
+            f"Records acked: {summary['acked']} of {summary['sent']} sent, {summary['errors']} errors",
+            f"Elapsed: {summary['elapsed_s']:.2f} s",
+            f"Throughput: {summary['records_per_sec']:.0f} records/s, {summary['mb_per_sec']:.2f} MB/s",
+            f"Latency: mean {latency['mean_us'] / 1000:.2f} ms, min {latency['min_us'] / 1000:.2f} ms, max {latency['max_us'] / 1000:.2f} ms",
+            f"  p50   {latency['p50_us'] / 1000:.2f} ms",
+            f"  p95   {latency['p95_us'] / 1000:.2f} ms",
+            f"  p99   {latency['p99_us'] / 1000:.2f} ms",
+            f"  p99.9 {latency['p999_us'] / 1000:.2f} ms",
+        ]
+        if summary.get('error'):
+            lines.append(f"Last error: {summary['error']}")
+        self.results_text.setPlainText("\n".join(lines))
+        self.export_btn.setEnabled(True)
+
+    def test_finished(self):
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.perf_thread = None
+
+    def export_result(self):
+        if not self.result:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Results", "perf_result.json", "JSON (*.json)")
+        if path:
+            with open(path, 'w') as f:
+                json.dump(self.result, f, indent=4)
+            logging.info(f"Exported perf test results to {path}")
+
+    def done(self, result):
+        if self.perf_thread:
+            self.perf_thread.stop()
+            self.perf_thread.wait()
+        super().done(result)
+
+class PerfTestThread(QtCore.QThread):
+    """
+    Drives one KafkaProducer per worker thread with a paced or unthrottled send loop and
+    records per-record send-to-ack latency from the delivery callbacks.
+    """
+    progress_signal = QtCore.pyqtSignal(dict)
+    result_signal = QtCore.pyqtSignal(dict)
+    report_interval = 0.5
+    def __init__(self, config, topic, options):
+        super().__init__()
+        self.config = config
+        self.topic = topic
+        self.options = options
+        self.histogram = LatencyHistogram()
+        self.sent = 0
+        self.acked = 0
+        self.errors = 0
+        self.error = None
+        self._counter_lock = threading.Lock()
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        options = self.options
+        threads = options['threads']
+        per_thread = [options['num_records'] // threads + (1 if i < options['num_records'] % threads else 0) for i in range(threads)]
+        payload = os.urandom(options['record_size'])
+        started = time.monotonic()
+        workers = [threading.Thread(target=self.produce, args=(count, i, threads, payload), daemon=True)
+                   for i, count in enumerate(per_thread)]
+        for worker in workers:
+            worker.start()
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(self.report_interval / len(workers))
+            self.progress_signal.emit(self.stats(time.monotonic() - started))
+        elapsed = time.monotonic() - started
+        stats = self.stats(elapsed)
+        result = {
+            'topic': self.topic,
+            'bootstrap_servers': self.config['bootstrap_servers'],
+            'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'config': dict(options),
+            'results': {
+                'sent': stats['sent'],
+                'acked': stats['acked'],
+                'errors': stats['errors'],
+                'elapsed_s': elapsed,
+                'records_per_sec': stats['records_per_sec'],
+                'mb_per_sec': stats['mb_per_sec'],
+                'error': self.error,
+            },
+            'latency': self.histogram.to_dict(),
+        }
+        self.result_signal.emit(result)
+        logging.info(f"Perf test on '{self.topic}': {stats['records_per_sec']:.0f} records/s, {self.histogram.format_summary()}")
+    def produce(self, count, worker_index, worker_count, payload):
+        options = self.options
+        producer = None
+        try:
+            from kafka import KafkaProducer
+            producer = KafkaProducer(**client_kwargs(
+                self.config, 'producer',
+                acks=options['acks'],
+                compression_type=options['compression_type'],
+                linger_ms=options['linger_ms'],
+                batch_size=options['batch_size'],
+            ))
+            cardinality = options['key_cardinality']
+            interval = worker_count / options['target_rate'] if options['target_rate'] else 0
+            next_send = time.perf_counter()
+            for n in range(count):
+                if not self._is_running:
+                    break
+                if interval:
+                    # Pace against an absolute schedule so short stalls are caught up, not lost
+                    next_send += interval
+                    delay = next_send - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                key = str((n * worker_count + worker_index) % cardinality).encode() if cardinality else None
+                # Time from the intended send, so stalls inside send() (full buffer, metadata)
+                # and behind-schedule sends count towards the latency (no coordinated omission)
+                started = next_send if interval else time.perf_counter()
+                future = producer.send(self.topic, value=payload, key=key)
+                future.add_callback(self.delivered, started)
+                future.add_errback(self.failed)
+                with self._counter_lock:
+                    self.sent += 1
+            producer.flush()
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Perf test producer error: {e}")
+        finally:
+            if producer:
+                producer.close(timeout=10)
+    def delivered(self, started, metadata):
+        self.histogram.record((time.perf_counter() - started) * 1000000)
+        with self._counter_lock:
+            self.acked += 1
+    def failed(self, error):
+        with self._counter_lock:
+            self.errors += 1
+        self.error = str(error)
+    def stats(self, elapsed):
+        elapsed = max(elapsed, 1e-6)
+        return {
+            'sent': self.sent,
+            'acked': self.acked,
+            'errors': self.errors,
+            'elapsed': elapsed,
+            'records_per_sec': self.acked / elapsed,
+            'mb_per_sec': self.acked * self.options['record_size'] / elapsed / (1024 * 1024),
+            'latency': self.histogram.format_summary(),
+        }
+
+class LatencyProbeDialog(QtWidgets.QDialog):
+    def __init__(self, config, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Latency Probe: {topic}")
+        self.setGeometry(250, 200, 600, 600)
+        self.config = config
+        self.topic = topic
+        self.probe_thread = None
+        self.result = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        self.rate_spin = QtWidgets.QSpinBox()
+        self.rate_spin.setRange(1, 100000)
+        self.rate_spin.setValue(100)
+        self.rate_spin.setSuffix(" probes/s")
+        self.layout.addRow("Rate:", self.rate_spin)
+        self.padding_spin = QtWidgets.QSpinBox()
+        self.padding_spin.setRange(0, 1024 * 1024)
+        self.padding_spin.setSuffix(" bytes")
+        self.layout.addRow("Padding:", self.padding_spin)
+        self.duration_spin = QtWidgets.QSpinBox()
+        self.duration_spin.setRange(0, 7 * 24 * 3600)
+        self.duration_spin.setValue(60)
+        self.duration_spin.setSpecialValueText("until stopped")
+        self.duration_spin.setSuffix(" s")
+        self.layout.addRow("Duration:", self.duration_spin)
+        self.results_text = QtWidgets.QPlainTextEdit()
+        self.results_text.setReadOnly(True)
+        self.results_text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.layout.addRow(self.results_text)
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_probe)
+        self.stop_btn = QtWidgets.QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_probe)
+        self.export_btn = QtWidgets.QPushButton("Export JSON")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_result)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        for btn in (self.start_btn, self.stop_btn, self.export_btn, self.close_btn):
+            self.button_layout.addWidget(btn)
+        self.layout.addRow(self.button_layout)
+
+    def start_probe(self):
+        options = {
+            'rate': self.rate_spin.value(),
+            'padding': self.padding_spin.value(),
+            'duration_s': self.duration_spin.value(),
+        }
+        self.probe_thread = LatencyProbeThread(self.config, self.topic, options)
+        self.probe_thread.progress_signal.connect(self.show_progress)
+        self.probe_thread.finished.connect(self.probe_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.export_btn.setEnabled(False)
+        self.results_text.setPlainText("Attaching consumer...")
+        self.probe_thread.start()
+
+    def stop_probe(self):
+        if self.probe_thread:
+            self.probe_thread.stop()
+            self.results_text.appendPlainText("Draining in-flight probes...")
+
+    def show_progress(self, result):
+        self.result = result
+        stats = result['results']
+        lines = [
+            f"Sent {stats['sent']}, acked {stats['acked']}, received {stats['received']} in {stats['elapsed_s']:.1f} s",
+            f"Missing {stats['missing']}, reordered {stats['reordered']}, duplicates {stats['duplicates']}, "
+            f"send errors {stats['errors']}",
+            "",
+            f"Produce (send -> ack): {result['summaries']['ack']}",
+            f"End to end (send -> consume): {result['summaries']['end_to_end']}",
+            "",
+            "End-to-end distribution:",
+            result['bars'],
+        ]
+        if stats.get('error'):
+            lines.append(f"Last error: {stats['error']}")
+        self.results_text.setPlainText("\n".join(lines))
+
+    def probe_finished(self):
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.export_btn.setEnabled(self.result is not None)
+        self.probe_thread = None
+
+    def export_result(self):
+        if not self.result:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Probe Results", "latency_probe.json", "JSON (*.json)")
+        if path:
+            export = {k: v for k, v in self.result.items() if k not in ('bars', 'summaries')}
+            with open(path, 'w') as f:
+                json.dump(export, f, indent=4)
+            logging.info(f"Exported latency probe results to {path}")
+
+    def done(self, result):
+        if self.probe_thread:
+            self.probe_thread.stop()
+            self.probe_thread.wait()
+        super().done(result)
+
+class LatencyProbeThread(QtCore.QThread):
+    """
+    Writes sequence-numbered probe records through a producer of its own (so other sends in
+    the app neither delay its flush nor skew its numbers) and reads them back with
+    an assigned consumer. Produce-ack latency shows the producer/broker leg; send-to-consume
+    latency adds fetch and consumer time, so comparing the two localises the slow side.
+    Timestamps come from this process's monotonic clock, so there is no clock skew.
+    """
+    progress_signal = QtCore.pyqtSignal(dict)
+    report_interval = 0.5
+    drain_timeout = 5.0
+    max_tracked_missing = 100000
+    def __init__(self, config, topic, options):
+        super().__init__()
+        self.config = config
+        self.topic = topic
+        self.options = options
+        self.run_id = f"probe-{os.getpid()}-{int(time.time() * 1000)}"
+        self.ack_histogram = LatencyHistogram()
+        self.e2e_histogram = LatencyHistogram()
+        self.sent = 0
+        self.acked = 0
+        self.errors = 0
+        self.error = None
+        self.received = 0
+        self.reordered = 0
+        self.duplicates = 0
+        self.highest_seq = -1
+        self.missing = set()
+        self.untracked_missing = 0
+        self.producing_done = threading.Event()
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        consumer = None
+        started = time.monotonic()
+        try:
+            consumer = attach_consumer(self.config, self.topic, 'latest')
+            # Resolve the end offsets now so no probe is produced before the consumer's start point
+            for tp in consumer.assignment():
+                consumer.position(tp)
+            producer_thread = threading.Thread(target=self.produce, daemon=True)
+            producer_thread.start()
+            run_key = self.run_id.encode()
+            last_report = started
+            drain_deadline = None
+            while True:
+                if self.producing_done.is_set():
+                    if self.received >= self.acked:
+                        break
+                    if drain_deadline is None:
+                        drain_deadline = time.monotonic() + self.drain_timeout
+                    elif time.monotonic() > drain_deadline:
+                        break
+                records = consumer.poll(timeout_ms=100)
+                now_ns = time.monotonic_ns()
+                for partition_records in records.values():
+                    for record in partition_records:
+                        if record.key == run_key:
+                            self.observe(record.value, now_ns)
+                now = time.monotonic()
+                if now - last_report >= self.report_interval:
+                    self.progress_signal.emit(self.snapshot(now - started))
+                    last_report = now
+            producer_thread.join()
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Latency probe error: {e}")
+        finally:
+            self._is_running = False
+            self.producing_done.set()
+            if consumer:
+                consumer.close()
+            self.progress_signal.emit(self.snapshot(time.monotonic() - started))
+            logging.info(f"Latency probe on '{self.topic}': end to end {self.e2e_histogram.format_summary()}")
+    def produce(self):
+        producer = None
+        try:
+            from kafka import KafkaProducer
+            producer = KafkaProducer(**client_kwargs(self.config, 'producer'))
+            interval = 1.0 / self.options['rate']
+            padding = 'x' * self.options['padding']
+            deadline = time.monotonic() + self.options['duration_s'] if self.options['duration_s'] else None
+            next_send = time.perf_counter()
+            seq = 0
+            key = self.run_id.encode()
+            while self._is_running and (deadline is None or time.monotonic() < deadline):
+                next_send += interval
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sent_ns = time.monotonic_ns()
+                value = json.dumps({'probe': self.run_id, 'seq': seq, 'sent_ns': sent_ns, 'pad': padding}).encode()
+                future = producer.send(self.topic, value=value, key=key)
+                future.add_callback(self.delivered, sent_ns)
+                future.add_errback(self.failed)
+                self.sent += 1
+                seq += 1
+            producer.flush()
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Latency probe producer error: {e}")
+        finally:
+            if producer:
+                producer.close(timeout=10)
+            self.producing_done.set()
+    def delivered(self, sent_ns, metadata):
+        self.ack_histogram.record((time.monotonic_ns() - sent_ns) / 1000)
+        self.acked += 1
+    def failed(self, error):
+        self.errors += 1
+        self.error = str(error)
+    def observe(self, value, now_ns):
+        try:
+            probe = json.loads(value)
+            seq = probe['seq']
+            sent_ns = probe['sent_ns']
+        except (ValueError, TypeError, KeyError):
+            return
+        if seq > self.highest_seq:
+            for missing_seq in range(self.highest_seq + 1, seq):
+                if len(self.missing) < self.max_tracked_missing:
+                    self.missing.add(missing_seq)
+                else:
+                    self.untracked_missing += 1
+            self.highest_seq = seq
+        elif seq in self.missing:
+            self.missing.discard(seq)
+            self.reordered += 1
+        else:
+            self.duplicates += 1
+            return
+        self.received += 1
+        self.e2e_histogram.record((now_ns - sent_ns) / 1000)
+    def snapshot(self, elapsed):
+        return {
+            'run_id': self.run_id,
+            'topic': self.topic,
+            'bootstrap_servers': self.config['bootstrap_servers'],
+            'config': dict(self.options),
+            'results': {
+                'elapsed_s': elapsed,
+                'sent': self.sent,
+                'acked': self.acked,
+                'errors': self.errors,
+                'received': self.received,
+                'missing': len(self.missing) + self.untracked_missing,
+                'reordered': self.reordered,
+                'duplicates': self.duplicates,
+                'error': self.error,
+            },
+            'ack_latency': self.ack_histogram.to_dict(),
+            'end_to_end_latency': self.e2e_histogram.to_dict(),
+            'summaries': {
+                'ack': self.ack_histogram.format_summary(),
+                'end_to_end': self.e2e_histogram.format_summary(),
+            },
+            'bars': self.e2e_histogram.format_bars(),
+        }
+
+class TopicInventoryModel(QtCore.QAbstractTableModel):
+    headers = ["Topic", "Partitions", "Replication", "Records"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.row_of = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if role == QtCore.Qt.UserRole:
+            # Sort key: numbers sort numerically, unknown record counts sort first
+            return (row['topic'], len(row['partitions']), row['replication'],
+                    -1 if row['records'] is None else row['records'])[column]
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return row['topic']
+            if column == 1:
+                return str(len(row['partitions']))
+            if column == 2:
+                return str(row['replication'])
+            return "..." if row['records'] is None else f"{row['records']:,}"
+        if role == QtCore.Qt.TextAlignmentRole and column > 0:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def apply_metadata(self, topics):
+        """
+        Merge a metadata snapshot {topic: {partition: {'leader', 'replicas'}}} into the table:
+        changed rows are updated in place, new topics appended and vanished ones removed.
+        """
+        removed = [i for i, row in enumerate(self.rows) if row['topic'] not in topics]
+        for row_index in reversed(removed):
+            self.beginRemoveRows(QtCore.QModelIndex(), row_index, row_index)
+            del self.rows[row_index]
+            self.endRemoveRows()
+        if removed:
+            self.row_of = {row['topic']: i for i, row in enumerate(self.rows)}
+        new_rows = []
+        for name, partitions in topics.items():
+            replication = max((len(p['replicas']) for p in partitions.values()), default=0)
+            row_index = self.row_of.get(name)
+            if row_index is None:
+                new_rows.append({'topic': name, 'partitions': {
+                    p: dict(meta, begin=None, end=None) for p, meta in partitions.items()
+                }, 'replication': replication, 'records': None})
+                continue
+            row = self.rows[row_index]
+            for partition, meta in partitions.items():
+                row['partitions'].setdefault(partition, {'begin': None, 'end': None}).update(meta)
+            for partition in set(row['partitions']) - set(partitions):
+                del row['partitions'][partition]
+            row['replication'] = replication
+            row['records'] = self.count_records(row)
+            self.dataChanged.emit(self.index(row_index, 1), self.index(row_index, 3))
+        if new_rows:
+            first = len(self.rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_rows) - 1)
+            for row in new_rows:
+                self.row_of[row['topic']] = len(self.rows)
+                self.rows.append(row)
+            self.endInsertRows()
+
+    def count_records(self, row):
+        partitions = row['partitions'].values()
+        if any(p['end'] is None for p in partitions):
+            return None
+        return sum(p['end'] - p['begin'] for p in partitions)
+
+    def apply_offsets(self, offsets):
+        for name, partition_offsets in offsets.items():
+            row_index = self.row_of.get(name)
+            if row_index is None:
+                continue
+            row = self.rows[row_index]
+            for partition, (begin, end) in partition_offsets.items():
+                if partition in row['partitions']:
+                    row['partitions'][partition].update(begin=begin, end=end)
+            records = self.count_records(row)
+            if records != row['records']:
+                row['records'] = records
+                self.dataChanged.emit(self.index(row_index, 3), self.index(row_index, 3))
+
+class TopicInventoryDialog(QtWidgets.QDialog):
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Topic Inventory: {config['bootstrap_servers']}")
+        self.setGeometry(250, 150, 900, 700)
+        self.config = config
+        self.inventory_thread = None
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QVBoxLayout(self)
+        top_layout = QtWidgets.QHBoxLayout()
+        self.filter_edit = QtWidgets.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter topics")
+        top_layout.addWidget(self.filter_edit)
+        self.refresh_btn = QtWidgets.QPushButton("Refresh")
+        self.refresh_btn.clicked.connect(self.refresh)
+        top_layout.addWidget(self.refresh_btn)
+        self.layout.addLayout(top_layout)
+        self.inventory_model = TopicInventoryModel(self)
+        self.proxy_model = QtCore.QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.inventory_model)
+        self.proxy_model.setSortRole(QtCore.Qt.UserRole)
+        self.proxy_model.setFilterKeyColumn(0)
+        self.proxy_model.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+        self.topic_table = QtWidgets.QTableView()
+        self.topic_table.setModel(self.proxy_model)
+        self.topic_table.setSortingEnabled(True)
+        self.topic_table.sortByColumn(0, QtCore.Qt.AscendingOrder)
+        self.topic_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.topic_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.topic_table.verticalHeader().setVisible(False)
+        self.topic_table.verticalHeader().setDefaultSectionSize(24)
+        self.topic_table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.topic_table.selectionModel().currentRowChanged.connect(self.show_partitions)
+        self.layout.addWidget(self.topic_table, 3)
+        self.partition_table = QtWidgets.QTableWidget(0, 6)
+        self.partition_table.setHorizontalHeaderLabels(["Partition", "Leader", "Replicas", "Begin", "End", "Records"])
+        self.partition_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.partition_table.verticalHeader().setVisible(False)
+        self.partition_table.horizontalHeader().setStretchLastSection(True)
+        self.layout.addWidget(self.partition_table, 2)
+        self.status_label = QtWidgets.QLabel()
+        self.layout.addWidget(self.status_label)
+        self.close_button = QtWidgets.QPushButton("Close")
+        self.close_button.clicked.connect(self.accept)
+        self.layout.addWidget(self.close_button)
+
+    def refresh(self):
+        if self.inventory_thread:
+            return
+        self.inventory_thread = TopicInventoryThread(self.config)
+        self.inventory_thread.metadata_signal.connect(self.metadata_loaded)
+        self.inventory_thread.offsets_signal.connect(self.offsets_loaded)
+        self.inventory_thread.status_signal.connect(self.status_label.setText)
+        self.inventory_thread.finished.connect(self.refresh_finished)
+        self.refresh_btn.setEnabled(False)
+        self.status_label.setText("Loading metadata...")
+        self.inventory_thread.start()
+
+    def metadata_loaded(self, topics):
+        self.inventory_model.apply_metadata(topics)
+        self.show_partitions(self.topic_table.currentIndex(), None)
+
+    def offsets_loaded(self, offsets):
+        self.inventory_model.apply_offsets(offsets)
+        current = self.topic_table.currentIndex()
+        if current.isValid():
+            row = self.inventory_model.rows[self.proxy_model.mapToSource(current).row()]
+            if row['topic'] in offsets:
+                self.show_partitions(current, None)
+
+    def refresh_finished(self):
+        self.refresh_btn.setEnabled(True)
+        self.inventory_thread = None
+
+    def show_partitions(self, current, previous):
+        self.partition_table.setRowCount(0)
+        if not current.isValid():
+            return
+        source = self.proxy_model.mapToSource(current)
+        row = self.inventory_model.rows[source.row()]
+        partitions = row['partitions']
+        self.partition_table.setRowCount(len(partitions))
+        for table_row, partition in enumerate(sorted(partitions)):
+            meta = partitions[partition]
+            known = meta['end'] is not None
+            values = [
+                partition, meta.get('leader', ''), ','.join(str(r) for r in meta.get('replicas', [])),
+                meta['begin'] if known else '', meta['end'] if known else '',
+                f"{meta['end'] - meta['begin']:,}" if known else '...',
+            ]
+            for column, value in enumerate(values):
+                self.partition_table.setItem(table_row, column, QtWidgets.QTableWidgetItem(str(value)))
+
+    def done(self, result):
+        if self.inventory_thread:
+            self.inventory_thread.stop()
+            self.inventory_thread.wait()
+        super().done(result)
+
+class TopicInventoryThread(QtCore.QThread):
+    """
+    Loads all topic metadata with one describe_topics call, then record estimates with
+    beginning_offsets/end_offsets over large partition batches (kafka-python groups each
+    batch into one ListOffsets request per broker), emitting results per batch.
+    """
+    metadata_signal = QtCore.pyqtSignal(dict)
+    offsets_signal = QtCore.pyqtSignal(dict)
+    status_signal = QtCore.pyqtSignal(str)
+    offsets_batch_size = 5000
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        admin = None
+        consumer = None
+        started = time.monotonic()
+        try:
+            from kafka import KafkaAdminClient, TopicPartition
+            admin = KafkaAdminClient(**client_kwargs(self.config, 'admin'))
+            topics = {}
+            for topic_meta in admin.describe_topics():
+                topics[topic_meta['topic']] = {
+                    p['partition']: {'leader': p['leader'], 'replicas': list(p['replicas'])}
+                    for p in topic_meta['partitions']
+                }
+            self.metadata_signal.emit(topics)
+            tps = [TopicPartition(topic, p) for topic, partitions in topics.items() for p in partitions]
+            consumer = attach_consumer(self.config)
+            done = 0
+            for start in range(0, len(tps), self.offsets_batch_size):
+                if not self._is_running:
+                    break
+                batch = tps[start:start + self.offsets_batch_size]
+                begin_offsets = consumer.beginning_offsets(batch)
+                end_offsets = consumer.end_offsets(batch)
+                offsets = {}
+                for tp in batch:
+                    offsets.setdefault(tp.topic, {})[tp.partition] = (begin_offsets[tp], end_offsets[tp])
+                self.offsets_signal.emit(offsets)
+                done += len(batch)
+                self.status_signal.emit(f"Offsets for {done} of {len(tps)} partitions...")
+            self.status_signal.emit(f"{len(topics)} topics, {len(tps)} partitions in {time.monotonic() - started:.1f} s")
+            logging.info(f"Loaded inventory of {len(topics)} topics and {len(tps)} partitions.")
+        except Exception as e:
+            error_msg = f"Inventory error: {e}"
+            self.status_signal.emit(error_msg)
+            logging.error(error_msg)
+        finally:
+            if consumer:
+                consumer.close()
+            if admin:
+                admin.close()
+
+class ConsumerLagModel(QtCore.QAbstractTableModel):
+    """
+    Lag per partition, topic or group. Each snapshot is diffed against the rows on screen:
+    only rows whose values changed emit dataChanged, new keys are appended and vanished
+    keys removed. Lag rate is the change in lag per second since the previous snapshot.
+    """
+    headers = ["Group", "Topic", "Partition", "Committed", "End", "Lag", "Lag Δ/s"]
+    levels = ['Partition', 'Topic', 'Group']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.level = 'Partition'
+        self.snapshot = {}
+        self.rates = {}
+        self.snapshot_time = None
+        self.rows = []
+        self.row_of = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        values = self.rows[index.row()]['values']
+        value = values[index.column()]
+        if role == QtCore.Qt.UserRole:
+            return -1 if value is None else value
+        if role == QtCore.Qt.DisplayRole:
+            if value is None:
+                return ""
+            if index.column() == 6:
+                return f"{value:+.1f}"
+            return f"{value:,}" if isinstance(value, int) and index.column() > 2 else str(value)
+        if role == QtCore.Qt.TextAlignmentRole and index.column() > 2:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        if role == QtCore.Qt.ForegroundRole and index.column() == 6 and value:
+            return QtGui.QColor('red') if value > 0 else QtGui.QColor('green')
+        return None
+
+    def set_level(self, level):
+        self.level = level
+        self.beginResetModel()
+        self.rows = []
+        self.row_of = {}
+        self.endResetModel()
+        self.render()
+
+    def apply_snapshot(self, snapshot, snapshot_time):
+        if self.snapshot_time is not None:
+            elapsed = max(snapshot_time - self.snapshot_time, 1e-6)
+            self.rates = {key: (lag - self.snapshot[key][2]) / elapsed
+                          for key, (_, _, lag) in snapshot.items() if key in self.snapshot}
+        self.snapshot = snapshot
+        self.snapshot_time = snapshot_time
+        self.render()
+
+    def aggregate(self):
+        if self.level == 'Partition':
+            return {key: [key[0], key[1], key[2], committed, end, lag, self.rates.get(key)]
+                    for key, (committed, end, lag) in self.snapshot.items()}
+        rows = {}
+        for key, (_, _, lag) in self.snapshot.items():
+            row_key = key[:2] if self.level == 'Topic' else key[:1]
+            row = rows.get(row_key)
+            if row is None:
+                row = rows[row_key] = [key[0], key[1] if self.level == 'Topic' else None, None, None, None, 0, None]
+            row[5] += lag
+            if key in self.rates:
+                row[6] = (row[6] or 0) + self.rates[key]
+        return rows
+
+    def render(self):
+        values_by_key = self.aggregate()
+        removed = [i for i, row in enumerate(self.rows) if row['key'] not in values_by_key]
+        for row_index in reversed(removed):
+            self.beginRemoveRows(QtCore.QModelIndex(), row_index, row_index)
+            del self.rows[row_index]
+            self.endRemoveRows()
+        if removed:
+            self.row_of = {row['key']: i for i, row in enumerate(self.rows)}
+        new_rows = []
+        for key, values in values_by_key.items():
+            row_index = self.row_of.get(key)
+            if row_index is None:
+                new_rows.append({'key': key, 'values': values})
+            elif self.rows[row_index]['values'] != values:
+                self.rows[row_index]['values'] = values
+                self.dataChanged.emit(self.index(row_index, 0), self.index(row_index, len(self.headers) - 1))
+        if new_rows:
+            first = len(self.rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_rows) - 1)
+            for row in new_rows:
+                self.row_of[row['key']] = len(self.rows)
+                self.rows.append(row)
+            self.endInsertRows()
+
+class ConsumerLagDialog(QtWidgets.QDialog):
+    def __init__(self, pool, server_name, config, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Consumer Lag: {server_name}")
+        self.setGeometry(250, 150, 1000, 650)
+        self.lag_thread = LagThread(pool, server_name, config)
+        self.init_ui()
+        self.lag_thread.snapshot_signal.connect(self.snapshot_loaded)
+        self.lag_thread.status_signal.connect(self.status_label.setText)
+        self.lag_thread.start()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QVBoxLayout(self)
+        top_layout = QtWidgets.QHBoxLayout()
+        self.filter_edit = QtWidgets.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter groups")
+        top_layout.addWidget(self.filter_edit)
+        self.level_combo = QtWidgets.QComboBox()
+        self.level_combo.addItems(ConsumerLagModel.levels)
+        top_layout.addWidget(QtWidgets.QLabel("Per:"))
+        top_layout.addWidget(self.level_combo)
+        self.interval_spin = QtWidgets.QSpinBox()
+        self.interval_spin.setRange(2, 3600)
+        self.interval_spin.setValue(self.lag_thread.interval)
+        self.interval_spin.setSuffix(" s")
+        self.interval_spin.valueChanged.connect(self.interval_changed)
+        top_layout.addWidget(QtWidgets.QLabel("Refresh:"))
+        top_layout.addWidget(self.interval_spin)
+        self.refresh_btn = QtWidgets.QPushButton("Refresh Now")
+        self.refresh_btn.clicked.connect(self.lag_thread.refresh_now)
+        top_layout.addWidget(self.refresh_btn)
+        self.layout.addLayout(top_layout)
+        self.lag_model = ConsumerLagModel(self)
+        self.level_combo.currentTextChanged.connect(self.lag_model.set_level)
+        self.proxy_model = QtCore.QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.lag_model)
+        self.proxy_model.setSortRole(QtCore.Qt.UserRole)
+        self.proxy_model.setFilterKeyColumn(0)
+        self.proxy_model.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+        self.lag_table = QtWidgets.QTableView()
+        self.lag_table.setModel(self.proxy_model)
+        self.lag_table.setSortingEnabled(True)
+        self.lag_table.sortByColumn(5, QtCore.Qt.DescendingOrder)
+        self.lag_table.verticalHeader().setVisible(False)
+        self.lag_table.verticalHeader().setDefaultSectionSize(24)
+        self.lag_table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.lag_table.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.Stretch)
+        self.layout.addWidget(self.lag_table)
+        self.status_label = QtWidgets.QLabel("Loading consumer groups...")
+        self.layout.addWidget(self.status_label)
+        self.close_button = QtWidgets.QPushButton("Close")
+        self.close_button.clicked.connect(self.accept)
+        self.layout.addWidget(self.close_button)
+
+    def interval_changed(self, value):
+        self.lag_thread.interval = value
+
+    def snapshot_loaded(self, snapshot, snapshot_time):
+        self.lag_model.apply_snapshot(snapshot, snapshot_time)
+
+    def done(self, result):
+        self.lag_thread.stop()
+        self.lag_thread.wait()
+        super().done(result)
+
+class LagThread(QtCore.QThread):
+    """
+    Periodically lists consumer groups through the pooled admin client and fetches their
+    committed offsets concurrently, one request per group (the admin API has no batched
+    form), on a small thread pool whose workers each own an admin client. End offsets for
+    all involved partitions are then fetched in one batched call.
+    """
+    snapshot_signal = QtCore.pyqtSignal(dict, float)
+    status_signal = QtCore.pyqtSignal(str)
+    group_fetch_workers = 8
+    def __init__(self, pool, server_name, config, interval=10):
+        super().__init__()
+        self.pool = pool
+        self.server_name = server_name
+        self.config = config
+        self.interval = interval
+        self.executor = None
+        self.worker_state = threading.local()
+        self.worker_admins = []
+        self._admins_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+        self._refresh_requested.set()
+    def refresh_now(self):
+        self._refresh_requested.set()
+    def run(self):
+        consumer = None
+        try:
+            self.executor = concurrent.futures.ThreadPoolExecutor(self.group_fetch_workers)
+            consumer = attach_consumer(self.config)
+            while self._is_running:
+                try:
+                    self.refresh(consumer)
+                except Exception as e:
+                    error_msg = f"Lag refresh error: {e}"
+                    self.status_signal.emit(error_msg)
+                    logging.error(error_msg)
+                self._refresh_requested.wait(self.interval)
+                self._refresh_requested.clear()
+        except Exception as e:
+            error_msg = f"Lag dashboard error: {e}"
+            self.status_signal.emit(error_msg)
+            logging.error(error_msg)
+        finally:
+            if self.executor:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+            for admin in self.worker_admins:
+                try:
+                    admin.close()
+                except Exception as e:
+                    logging.error(f"Error closing client: {e}")
+            if consumer:
+                consumer.close()
+    def group_offsets(self, group):
+        if not self._is_running:
+            return {}
+        admin = getattr(self.worker_state, 'admin', None)
+        if admin is None:
+            admin = self.worker_state.admin = create_client('admin', self.config)
+            with self._admins_lock:
+                self.worker_admins.append(admin)
+        return admin.list_consumer_group_offsets(group)
+    def refresh(self, consumer):
+        started = time.monotonic()
+        admin = self.pool.acquire(self.server_name, self.config, 'admin')
+        groups = [group for group, protocol in admin.list_consumer_groups() if protocol in ('consumer', '')]
+        committed = {}
+        failed = []
+        futures = {self.executor.submit(self.group_offsets, group): group for group in groups}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            if not self._is_running:
+                return
+            group = futures[future]
+            try:
+                group_offsets = future.result()
+            except Exception as e:
+                # One unreadable group (e.g. not authorized) is left out instead of failing the refresh
+                failed.append(group)
+                logging.error(f"Error fetching offsets for group {group}: {e}")
+                continue
+            for tp, offset_meta in group_offsets.items():
+                if offset_meta.offset >= 0:
+                    committed[(group, tp)] = offset_meta.offset
+            if done % 50 == 0:
+                self.status_signal.emit(f"Committed offsets for {done} of {len(groups)} groups...")
+        end_offsets = consumer.end_offsets(list({tp for _, tp in committed}))
+        snapshot = {}
+        for (group, tp), offset in committed.items():
+            end = end_offsets.get(tp)
+            if end is not None:
+                snapshot[(group, tp.topic, tp.partition)] = (offset, end, max(end - offset, 0))
+        self.snapshot_signal.emit(snapshot, time.monotonic())
+        total_lag = sum(lag for _, _, lag in snapshot.values())
+        failed_text = f", {len(failed)} skipped ({', '.join(sorted(failed)[:5])}{', ...' if len(failed) > 5 else ''})" if failed else ""
+        self.status_signal.emit(
+            f"{len(groups)} groups{failed_text}, {len(snapshot)} partitions, total lag {total_lag:,} "
+            f"(refreshed in {time.monotonic() - started:.1f} s at {datetime.datetime.now().strftime('%H:%M:%S')})"
+        )
+
+class OffsetRangeWidget(QtWidgets.QWidget):
+    """
+    Picks the whole log, an offset range or a time range; selection() returns the
+    (range_kind, start, end) arguments of resolve_offset_ranges.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.range_combo = QtWidgets.QComboBox()
+        self.range_combo.addItems(['All', 'Offsets', 'Time'])
+        self.range_combo.currentTextChanged.connect(self.range_changed)
+        layout.addWidget(self.range_combo)
+        self.from_offset_edit = QtWidgets.QLineEdit()
+        self.from_offset_edit.setPlaceholderText("From offset")
+        self.from_offset_edit.setValidator(QtGui.QRegExpValidator(QtCore.QRegExp(r"\d+"), self))
+        self.to_offset_edit = QtWidgets.QLineEdit()
+        self.to_offset_edit.setPlaceholderText("To offset (exclusive)")
+        self.to_offset_edit.setValidator(QtGui.QRegExpValidator(QtCore.QRegExp(r"\d+"), self))
+        now = QtCore.QDateTime.currentDateTime()
+        self.from_time_edit = QtWidgets.QDateTimeEdit(now.addSecs(-3600))
+        self.to_time_edit = QtWidgets.QDateTimeEdit(now)
+        for widget in (self.from_time_edit, self.to_time_edit):
+            widget.setCalendarPopup(True)
+            widget.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        for widget in (self.from_offset_edit, self.to_offset_edit, self.from_time_edit, self.to_time_edit):
+            layout.addWidget(widget)
+        self.range_changed(self.range_combo.currentText())
+
+    def range_changed(self, range_kind):
+        for widget in (self.from_offset_edit, self.to_offset_edit):
+            widget.setVisible(range_kind == 'Offsets')
+        for widget in (self.from_time_edit, self.to_time_edit):
+            widget.setVisible(range_kind == 'Time')
+
+    def selection(self):
+        range_kind = self.range_combo.currentText()
+        start = end = None
+        if range_kind == 'Offsets':
+            start = int(self.from_offset_edit.text()) if self.from_offset_edit.text() else None
+            end = int(self.to_offset_edit.text()) if self.to_offset_edit.text() else None
+        elif range_kind == 'Time':
+            start = self.from_time_edit.dateTime().toMSecsSinceEpoch()
+            end = self.to_time_edit.dateTime().toMSecsSinceEpoch()
+        return range_kind, start, end
+
+class SearchHitsModel(QtCore.QAbstractTableModel):
+    headers = ["Partition", "Offset", "Timestamp", "Key", "Value"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hits = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.hits)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+        partition, offset, timestamp, key, value = self.hits[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(partition)
+        if column == 1:
+            return str(offset)
+        if column == 2:
+            return datetime.datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        data = key if column == 3 else value
+        if data is None:
+            return ""
+        return data[:200].decode('utf-8', errors='replace').replace('\n', ' ')
+
+    def append_hits(self, hits):
+        first = len(self.hits)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(hits) - 1)
+        self.hits.extend(hits)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.hits = []
+        self.endResetModel()
+
+class SearchDialog(QtWidgets.QDialog):
+    def __init__(self, config, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Search: {topic}")
+        self.setGeometry(200, 100, 1100, 800)
+        self.config = config
+        self.topic = topic
+        self.search_thread = None
+        self.progress_rows = {}
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QVBoxLayout(self)
+        form_layout = QtWidgets.QFormLayout()
+        match_layout = QtWidgets.QHBoxLayout()
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItems(search_modes)
+        self.mode_combo.currentTextChanged.connect(self.mode_changed)
+        match_layout.addWidget(self.mode_combo)
+        self.pattern_edit = QtWidgets.QLineEdit()
+        match_layout.addWidget(self.pattern_edit)
+        form_layout.addRow("Match:", match_layout)
+        self.range_widget = OffsetRangeWidget()
+        form_layout.addRow("Range:", self.range_widget)
+        workers_layout = QtWidgets.QHBoxLayout()
+        self.readers_spin = QtWidgets.QSpinBox()
+        self.readers_spin.setRange(1, 64)
+        self.readers_spin.setValue(4)
+        workers_layout.addWidget(QtWidgets.QLabel("Readers:"))
+        workers_layout.addWidget(self.readers_spin)
+        self.workers_spin = QtWidgets.QSpinBox()
+        self.workers_spin.setRange(1, 64)
+        self.workers_spin.setValue(os.cpu_count() or 2)
+        workers_layout.addWidget(QtWidgets.QLabel("Match processes:"))
+        workers_layout.addWidget(self.workers_spin)
+        self.max_hits_spin = QtWidgets.QSpinBox()
+        self.max_hits_spin.setRange(1, 1000000)
+        self.max_hits_spin.setValue(10000)
+        workers_layout.addWidget(QtWidgets.QLabel("Max hits:"))
+        workers_layout.addWidget(self.max_hits_spin)
+        workers_layout.addStretch()
+        form_layout.addRow(workers_layout)
+        self.layout.addLayout(form_layout)
+        self.mode_changed(self.mode_combo.currentText())
+
+        self.splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical)
+        self.hits_model = SearchHitsModel(self)
+        self.hits_table = QtWidgets.QTableView()
+        self.hits_table.setModel(self.hits_model)
+        self.hits_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.hits_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.hits_table.verticalHeader().setVisible(False)
+        self.hits_table.verticalHeader().setDefaultSectionSize(24)
+        self.hits_table.horizontalHeader().setStretchLastSection(True)
+        self.hits_table.selectionModel().currentRowChanged.connect(self.show_hit)
+        self.splitter.addWidget(self.hits_table)
+        self.hit_text = QtWidgets.QPlainTextEdit()
+        self.hit_text.setReadOnly(True)
+        self.splitter.addWidget(self.hit_text)
+        self.progress_table = QtWidgets.QTableWidget(0, 5)
+        self.progress_table.setHorizontalHeaderLabels(["Partition", "Start", "End", "Position", "Hits"])
+        self.progress_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.progress_table.verticalHeader().setVisible(False)
+        self.progress_table.horizontalHeader().setStretchLastSection(True)
+        self.splitter.addWidget(self.progress_table)
+        self.splitter.setSizes([400, 150, 150])
+        self.layout.addWidget(self.splitter)
+        self.status_label = QtWidgets.QLabel()
+        self.layout.addWidget(self.status_label)
+
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Search")
+        self.start_btn.clicked.connect(self.start_search)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_search)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        for btn in (self.start_btn, self.cancel_btn, self.close_btn):
+            self.button_layout.addWidget(btn)
+        self.layout.addLayout(self.button_layout)
+
+    def mode_changed(self, mode):
+        placeholders = {
+            'Substring': "Text to find in values",
+            'Regex': "Regular expression over values",
+            'JSON path': "order.id=X",
+            'Key': "Exact record key",
+        }
+        self.pattern_edit.setPlaceholderText(placeholders[mode])
+
+    def start_search(self):
+        mode = self.mode_combo.currentText()
+        pattern = self.pattern_edit.text()
+        if not pattern:
+            QtWidgets.QMessageBox.warning(self, "Search", "Enter something to search for.")
+            return
+        try:
+            compile_search_predicate(mode, pattern)
+        except (ValueError, re.error) as e:
+            QtWidgets.QMessageBox.warning(self, "Search", f"Invalid pattern: {e}")
+            return
+        range_kind, start, end = self.range_widget.selection()
+        options = {
+            'mode': mode,
+            'pattern': pattern,
+            'range': range_kind,
+            'start': start,
+            'end': end,
+            'readers': self.readers_spin.value(),
+            'workers': self.workers_spin.value(),
+            'max_hits': self.max_hits_spin.value(),
+        }
+        self.hits_model.clear()
+        self.hit_text.clear()
+        self.progress_table.setRowCount(0)
+        self.progress_rows = {}
+        self.search_thread = SearchThread(self.config, self.topic, options)
+        self.search_thread.hits_signal.connect(self.hits_model.append_hits)
+        self.search_thread.progress_signal.connect(self.show_progress)
+        self.search_thread.status_signal.connect(self.status_label.setText)
+        self.search_thread.finished.connect(self.search_finished)
+        self.start_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.status_label.setText("Resolving partition ranges...")
+        self.search_thread.start()
+
+    def cancel_search(self):
+        if self.search_thread:
+            self.search_thread.stop()
+            self.status_label.setText("Cancelling...")
+
+    def show_progress(self, progress):
+        for partition, values in progress.items():
+            row = self.progress_rows.get(partition)
+            if row is None:
+                row = self.progress_rows[partition] = self.progress_table.rowCount()
+                self.progress_table.insertRow(row)
+                self.progress_table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(partition)))
+            for column, value in enumerate(values, 1):
+                item = self.progress_table.item(row, column)
+                if item is None:
+                    self.progress_table.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+                elif item.text() != str(value):
+                    item.setText(str(value))
+
+    def show_hit(self, current, previous):
+        if not current.isValid():
+            return
+        partition, offset, timestamp, key, value = self.hits_model.hits[current.row()]
+        text, _ = format_value(value)
+        if value is not None and len(value) >= search_preview_bytes:
+            text += f"\n\n[Truncated to {search_preview_bytes // 1024} KB]"
+        self.hit_text.setPlainText(text)
+
+    def search_finished(self):
+        self.start_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.search_thread = None
+
+    def done(self, result):
+        if self.search_thread:
+            self.search_thread.stop()
+            self.search_thread.wait()
+        super().done(result)
+
+class SearchThread(QtCore.QThread):
+    """
+    Scans a topic range with one assigned consumer per group of partitions. Readers hand
+    record batches to a process pool for matching, so decoding and predicates run outside
+    this process's GIL; hits and per-partition positions are reported on a short interval.
+    In-flight batches are bounded, so a slow matcher throttles the readers instead of
+    buffering the topic in memory.
+    """
+    hits_signal = QtCore.pyqtSignal(list)
+    progress_signal = QtCore.pyqtSignal(dict)
+    status_signal = QtCore.pyqtSignal(str)
+    batch_records = 1000
+    report_interval = 0.25
+    def __init__(self, config, topic, options):
+        super().__init__()
+        self.config = config
+        self.topic = topic
+        self.options = options
+        self.lock = threading.Lock()
+        self.ranges = {}
+        self.positions = {}
+        self.hit_counts = {}
+        self.pending_hits = []
+        self.total_hits = 0
+        self.scanned = 0
+        self.error = None
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def resolve_ranges(self):
+        consumer = attach_consumer(self.config)
+        try:
+            self.ranges = resolve_offset_ranges(
+                consumer, self.topic, self.options['range'], self.options['start'], self.options['end'])
+        finally:
+            consumer.close()
+        for tp, (first, last) in self.ranges.items():
+            self.positions[tp.partition] = first
+            self.hit_counts[tp.partition] = 0
+    def run(self):
+        started = time.monotonic()
+        executor = None
+        try:
+            self.resolve_ranges()
+            self.report()
+            pending = [tp for tp, (first, last) in self.ranges.items() if first < last]
+            workers = self.options['workers']
+            executor = concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            slots = threading.Semaphore(workers * 2)
+            reader_count = min(self.options['readers'], len(pending))
+            readers = [
+                threading.Thread(target=self.read_partitions, args=(pending[i::reader_count], executor, slots), daemon=True)
+                for i in range(reader_count)
+            ]
+            for reader in readers:
+                reader.start()
+            while any(reader.is_alive() for reader in readers):
+                time.sleep(self.report_interval)
+                self.report()
+            executor.shutdown(wait=True, cancel_futures=not self._is_running)
+            executor = None
+            self.report()
+            if self.error:
+                raise self.error
+            if self.total_hits >= self.options['max_hits']:
+                state = "Hit limit reached"
+            else:
+                state = "Finished" if self._is_running else "Cancelled"
+            self.status_signal.emit(
+                f"{state}: {self.total_hits:,} hits in {self.scanned:,} records "
+                f"across {len(self.ranges)} partitions in {time.monotonic() - started:.1f} s"
+            )
+            logging.info(f"Searched '{self.topic}': {self.total_hits} hits in {self.scanned} records.")
+        except Exception as e:
+            error_msg = f"Search error: {e}"
+            self.status_signal.emit(error_msg)
+            logging.error(error_msg)
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+    def read_partitions(self, tps, executor, slots):
+        consumer = None
+        try:
+            consumer = attach_consumer(self.config)
+            consumer.assign(tps)
+            for tp in tps:
+                consumer.seek(tp, self.ranges[tp][0])
+            remaining = set(tps)
+            while remaining and self._is_running:
+                batches = consumer.poll(timeout_ms=500, max_records=self.batch_records)
+                for tp, records in batches.items():
+                    last = self.ranges[tp][1]
+                    chunk = [(r.partition, r.offset, r.timestamp, r.key, r.value) for r in records if r.offset < last]
+                    if chunk:
+                        while not slots.acquire(timeout=0.2):
+                            if not self._is_running:
+                                return
+                        future = executor.submit(search_batch, self.options['mode'], self.options['pattern'], chunk)
+                        future.add_done_callback(lambda f, tp=tp, count=len(chunk): self.batch_matched(f, tp, count, slots))
+                    with self.lock:
+                        self.positions[tp.partition] = min(records[-1].offset + 1, last)
+                    if records[-1].offset + 1 >= last:
+                        remaining.discard(tp)
+                        consumer.pause(tp)
+                if not batches:
+                    for tp in list(remaining):
+                        if consumer.position(tp) >= self.ranges[tp][1]:
+                            remaining.discard(tp)
+                            with self.lock:
+                                self.positions[tp.partition] = self.ranges[tp][1]
+        except Exception as e:
+            self.error = e
+            self._is_running = False
+        finally:
+            if consumer:
+                consumer.close()
+    def batch_matched(self, future, tp, count, slots):
+        slots.release()
+        if future.cancelled():
+            return
+        try:
+            hits = future.result()
+        except Exception as e:
+            self.error = e
+            self._is_running = False
+            return
+        with self.lock:
+            self.scanned += count
+            if hits:
+                hits = hits[:max(self.options['max_hits'] - self.total_hits, 0)]
+                self.pending_hits.extend(hits)
+                self.total_hits += len(hits)
+                self.hit_counts[tp.partition] += len(hits)
+                if self.total_hits >= self.options['max_hits']:
+                    self._is_running = False
+    def report(self):
+        with self.lock:
+            hits, self.pending_hits = self.pending_hits, []
+            progress = {
+                tp.partition: (first, last, self.positions[tp.partition], self.hit_counts[tp.partition])
+                for tp, (first, last) in self.ranges.items()
+            }
+            scanned, total_hits = self.scanned, self.total_hits
+        if hits:
+            self.hits_signal.emit(hits)
+        self.progress_signal.emit(progress)
+        if self._is_running:
+            self.status_signal.emit(f"Scanned {scanned:,} records, {total_hits:,} hits...")
+
+class ExportDialog(QtWidgets.QDialog):
+    def __init__(self, config, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Export: {topic}")
+        self.setGeometry(250, 200, 650, 300)
+        self.config = config
+        self.topic = topic
+        self.export_thread = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        path_layout = QtWidgets.QHBoxLayout()
+        self.path_edit = QtWidgets.QLineEdit(f"{self.topic}.jsonl")
+        path_layout.addWidget(self.path_edit)
+        self.browse_btn = QtWidgets.QPushButton("Browse")
+        self.browse_btn.clicked.connect(self.browse)
+        path_layout.addWidget(self.browse_btn)
+        self.layout.addRow("File:", path_layout)
+        self.format_combo = QtWidgets.QComboBox()
+        self.format_combo.addItems(export_formats)
+        self.layout.addRow("Format:", self.format_combo)
+        self.compression_combo = QtWidgets.QComboBox()
+        self.compression_combo.addItems(export_compressions)
+        self.layout.addRow("Compression:", self.compression_combo)
+        self.range_widget = OffsetRangeWidget()
+        self.layout.addRow("Range:", self.range_widget)
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.layout.addRow(self.progress_bar)
+        self.status_label = QtWidgets.QLabel()
+        self.layout.addRow(self.status_label)
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_export)
+        self.stop_btn = QtWidgets.QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_export)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        for btn in (self.start_btn, self.stop_btn, self.close_btn):
+            self.button_layout.addWidget(btn)
+        self.layout.addRow(self.button_layout)
+
+    def browse(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export To", self.path_edit.text(), "All Files (*)")
+        if path:
+            self.path_edit.setText(path)
+
+    def start_export(self):
+        path = self.path_edit.text().strip()
+        if not path:
+            return
+        resume = False
+        checkpoint = load_checkpoint(path + '.checkpoint')
+        if checkpoint and checkpoint.get('topic') == self.topic and os.path.exists(path):
+            state = "complete" if checkpoint.get('complete') else "interrupted"
+            answer = QtWidgets.QMessageBox.question(
+                self,
+                'Export',
+                f"'{path}' has an {state} export of {checkpoint['records']:,} records. Resume it?\n"
+                f"No starts over and overwrites the file.",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No | QtWidgets.QMessageBox.Cancel,
+                QtWidgets.QMessageBox.Yes
+            )
+            if answer == QtWidgets.QMessageBox.Cancel:
+                return
+            resume = answer == QtWidgets.QMessageBox.Yes
+        elif os.path.exists(path):
+            confirm = QtWidgets.QMessageBox.question(
+                self,
+                'Export',
+                f"Overwrite '{path}'?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No
+            )
+            if confirm != QtWidgets.QMessageBox.Yes:
+                return
+        range_kind, start, end = self.range_widget.selection()
+        options = {
+            'format': self.format_combo.currentText(),
+            'compression': self.compression_combo.currentText(),
+            'range': range_kind,
+            'start': start,
+            'end': end,
+            'resume': resume,
+        }
+        self.export_thread = ExportThread(self.config, self.topic, path, options)
+        self.export_thread.progress_signal.connect(self.show_progress)
+        self.export_thread.status_signal.connect(self.status_label.setText)
+        self.export_thread.finished.connect(self.export_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.status_label.setText("Resuming export..." if resume else "Resolving partition ranges...")
+        self.export_thread.start()
+
+    def stop_export(self):
+        if self.export_thread:
+            self.export_thread.stop()
+
+    def show_progress(self, progress):
+        self.progress_bar.setMaximum(100)
+        self.progress_bar.setValue(int(progress['done'] * 100 / progress['total']) if progress['total'] else 100)
+        self.status_label.setText(
+            f"{progress['records']:,} records, {progress['file_size'] / (1024 * 1024):.1f} MB written, "
+            f"{progress['rate']:,.0f} records/s, {progress['partitions_done']} of {progress['partitions']} partitions done"
+        )
+
+    def export_finished(self):
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.export_thread = None
+
+    def done(self, result):
+        if self.export_thread:
+            self.export_thread.stop()
+            self.export_thread.wait()
+        super().done(result)
+
+class ExportThread(QtCore.QThread):
+    """
+    Copies a topic range to an export file with one assigned consumer. Records go straight
+    from each poll batch to the ExportWriter buffer, so memory is bounded by max_records and
+    the write buffer. Every checkpoint_interval the writer is flushed and the next offset of
+    each partition is saved next to the file as <path>.checkpoint for resuming.
+    """
+    progress_signal = QtCore.pyqtSignal(dict)
+    status_signal = QtCore.pyqtSignal(str)
+    batch_records = 2000
+    report_interval = 0.5
+    checkpoint_interval = 5.0
+    def __init__(self, config, topic, path, options):
+        super().__init__()
+        self.config = config
+        self.topic = topic
+        self.path = path
+        self.options = options
+        self.checkpoint_state = None
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def run(self):
+        from kafka import TopicPartition
+        consumer = None
+        writer = None
+        started = time.monotonic()
+        try:
+            consumer = attach_consumer(self.config)
+            checkpoint = load_checkpoint(self.path + '.checkpoint') if self.options['resume'] else None
+            if checkpoint:
+                if checkpoint['topic'] != self.topic:
+                    raise ValueError(f"Checkpoint belongs to topic '{checkpoint['topic']}'")
+                ranges = {TopicPartition(self.topic, int(p)): tuple(r) for p, r in checkpoint['ranges'].items()}
+                positions = {int(p): offset for p, offset in checkpoint['positions'].items()}
+                writer = ExportWriter(self.path, checkpoint['format'], checkpoint['compression'], checkpoint['file_size'])
+                records_written = resumed = checkpoint['records']
+            else:
+                ranges = resolve_offset_ranges(
+                    consumer, self.topic, self.options['range'], self.options['start'], self.options['end'])
+                positions = {tp.partition: first for tp, (first, last) in ranges.items()}
+                writer = ExportWriter(self.path, self.options['format'], self.options['compression'])
+                records_written = resumed = 0
+            self.checkpoint_state = {
+                'topic': self.topic,
+                'format': writer.file_format,
+                'compression': writer.compression,
+                'ranges': {str(tp.partition): list(r) for tp, r in ranges.items()},
+                'records': records_written,
+            }
+            self.save_checkpoint(writer, positions, records_written)
+            remaining = {tp for tp, (first, last) in ranges.items() if positions[tp.partition] < last}
+            consumer.assign(list(remaining))
+            for tp in remaining:
+                consumer.seek(tp, positions[tp.partition])
+            last_report = last_checkpoint = time.monotonic()
+            while remaining and self._is_running:
+                batches = consumer.poll(timeout_ms=500, max_records=self.batch_records)
+                for tp, records in batches.items():
+                    last = ranges[tp][1]
+                    for r in records:
+                        if r.offset >= last:
+                            break
+                        writer.write(r.partition, r.offset, r.timestamp, r.key, r.value, r.headers)
+                        records_written += 1
+                    positions[tp.partition] = min(records[-1].offset + 1, last)
+                    if positions[tp.partition] >= last:
+                        remaining.discard(tp)
+                        consumer.pause(tp)
+                if not batches:
+                    for tp in list(remaining):
+                        if consumer.position(tp) >= ranges[tp][1]:
+                            positions[tp.partition] = ranges[tp][1]
+                            remaining.discard(tp)
+                now = time.monotonic()
+                if now - last_checkpoint >= self.checkpoint_interval:
+                    self.save_checkpoint(writer, positions, records_written)
+                    last_checkpoint = now
+                if now - last_report >= self.report_interval:
+                    self.report(ranges, positions, records_written, resumed, writer, started, remaining)
+                    last_report = now
+            self.save_checkpoint(writer, positions, records_written, complete=not remaining)
+            self.report(ranges, positions, records_written, resumed, writer, started, remaining)
+            state = "complete" if not remaining else "stopped, resumable"
+            self.status_signal.emit(f"Export {state}: {records_written:,} records in {self.path}")
+            logging.info(f"Exported {records_written - resumed} records from '{self.topic}' to {self.path} ({state}).")
+        except Exception as e:
+            error_msg = f"Export error: {e}"
+            self.status_signal.emit(error_msg)
+            logging.error(error_msg)
+        finally:
+            if writer:
+                writer.close()
+            if consumer:
+                consumer.close()
+    def save_checkpoint(self, writer, positions, records_written, complete=False):
+        self.checkpoint_state.update(
+            file_size=writer.checkpoint(),
+            positions={str(p): offset for p, offset in positions.items()},
+            records=records_written,
+            complete=complete,
+        )
+        save_checkpoint(self.path + '.checkpoint', self.checkpoint_state)
+    def report(self, ranges, positions, records_written, resumed, writer, started, remaining):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.progress_signal.emit({
+            'records': records_written,
+            'rate': (records_written - resumed) / elapsed,
+            'file_size': writer.file.tell(),
+            'done': sum(positions[tp.partition] - first for tp, (first, last) in ranges.items()),
+            'total': sum(last - first for first, last in ranges.values()),
+            'partitions': len(ranges),
+            'partitions_done': len(ranges) - len(remaining),
+        })
+
+class ReplayDialog(QtWidgets.QDialog):
+    pacing_modes = ['As fast as possible', 'Fixed rate', 'Original timing']
+
+    def __init__(self, config, producer, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Replay: {topic}")
+        self.setGeometry(250, 200, 550, 350)
+        self.config = config
+        self.producer = producer
+        self.topic = topic
+        self.replay_thread = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        file_layout = QtWidgets.QHBoxLayout()
+        self.file_edit = QtWidgets.QLineEdit()
+        self.browse_btn = QtWidgets.QPushButton("Browse")
+        self.browse_btn.clicked.connect(self.browse_file)
+        file_layout.addWidget(self.file_edit)
+        file_layout.addWidget(self.browse_btn)
+        self.layout.addRow("Export File:", file_layout)
+        self.pacing_combo = QtWidgets.QComboBox()
+        self.pacing_combo.addItems(self.pacing_modes)
+        self.pacing_combo.currentTextChanged.connect(self.pacing_changed)
+        self.layout.addRow("Pacing:", self.pacing_combo)
+        self.rate_spin = QtWidgets.QSpinBox()
+        self.rate_spin.setRange(1, 10000000)
+        self.rate_spin.setValue(1000)
+        self.rate_spin.setSuffix(" records/s")
+        self.layout.addRow("Rate:", self.rate_spin)
+        self.speed_spin = QtWidgets.QDoubleSpinBox()
+        self.speed_spin.setRange(0.01, 1000.0)
+        self.speed_spin.setValue(1.0)
+        self.speed_spin.setSuffix(" x")
+        self.layout.addRow("Speed:", self.speed_spin)
+        self.keep_partitions_checkbox = QtWidgets.QCheckBox("Keep source partitions")
+        self.keep_partitions_checkbox.setChecked(True)
+        self.layout.addRow(self.keep_partitions_checkbox)
+        self.keep_timestamps_checkbox = QtWidgets.QCheckBox("Keep source timestamps")
+        self.layout.addRow(self.keep_timestamps_checkbox)
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.layout.addRow(self.progress_bar)
+        self.stats_label = QtWidgets.QLabel("Idle.")
+        self.stats_label.setWordWrap(True)
+        self.layout.addRow(self.stats_label)
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_replay)
+        self.stop_btn = QtWidgets.QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_replay)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        for btn in (self.start_btn, self.stop_btn, self.close_btn):
+            self.button_layout.addWidget(btn)
+        self.layout.addRow(self.button_layout)
+        self.pacing_changed(self.pacing_combo.currentText())
+
+    def browse_file(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Export File", "", "All Files (*)")
+        if path:
+            self.file_edit.setText(path)
+
+    def pacing_changed(self, pacing):
+        self.rate_spin.setEnabled(pacing == 'Fixed rate')
+        self.speed_spin.setEnabled(pacing == 'Original timing')
+
+    def start_replay(self):
+        path = self.file_edit.text().strip()
+        if not os.path.isfile(path):
+            QtWidgets.QMessageBox.warning(self, "No File", "Select an export file to replay.")
+            return
+        options = {
+            'pacing': self.pacing_combo.currentText(),
+            'rate': self.rate_spin.value(),
+            'speed': self.speed_spin.value(),
+            'keep_partitions': self.keep_partitions_checkbox.isChecked(),
+            'keep_timestamps': self.keep_timestamps_checkbox.isChecked(),
+        }
+        self.replay_thread = ReplayThread(self.producer, self.topic, ExportFileReader(path), options)
+        self.replay_thread.progress_signal.connect(self.show_progress)
+        self.replay_thread.finished.connect(self.replay_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.replay_thread.start()
+        logging.info(f"Replay of {path} to '{self.topic}' started.")
+
+    def stop_replay(self):
+        if self.replay_thread:
+            self.replay_thread.stop()
+            self.stats_label.setText("Stopping...")
+
+    def show_progress(self, stats):
+        self.progress_bar.setValue(int(stats['progress'] * 1000))
+        target = f"{stats['target_rate']:,.0f}" if stats['target_rate'] is not None else "max"
+        text = (f"Sent {stats['sent']:,}, acked {stats['acked']:,}, errors {stats['errors']}, "
+                f"skipped {stats['parse_errors']}\n"
+                f"Achieved {stats['achieved_rate']:,.0f} records/s, target {target} records/s, "
+                f"{stats['elapsed']:.1f} s")
+        if stats['behind_s'] > 0.5:
+            text += f"\nBehind schedule by {stats['behind_s']:.1f} s"
+        if stats.get('error'):
+            text += f"\nError: {stats['error']}"
+        self.stats_label.setText(text)
+
+    def replay_finished(self):
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.replay_thread = None
+
+    def done(self, result):
+        if self.replay_thread:
+            self.replay_thread.stop()
+            self.replay_thread.wait()
+        super().done(result)
+
+class ReplayThread(QtCore.QThread):
+    """
+    Re-produces an export file through the app's producer. Every record gets a due time
+    from the pacing mode (none, start + n / rate, or its source timestamp offset divided
+    by speed); the thread only sleeps when it is more than a millisecond ahead, and sends
+    are never awaited, so the producer keeps batching while the schedule holds.
+    Records whose source timestamps run backwards are sent as soon as they are reached.
+    """
+    progress_signal = QtCore.pyqtSignal(dict)
+    report_interval = 0.25
+    def __init__(self, producer, topic, reader, options):
+        super().__init__()
+        self.producer = producer
+        self.topic = topic
+        self.reader = reader
+        self.options = options
+        self.sent = 0
+        # Only the producer's I/O thread writes these two, from delivery callbacks
+        self.acked = 0
+        self.errors = 0
+        self.error = None
+        self.behind_s = 0.0
+        self.target_rate = None
+        self.window = (0.0, 0, None)
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def wait_until(self, due):
+        delay = due - time.monotonic()
+        while delay > 0.001 and self._is_running:
+            time.sleep(min(delay, 0.1))
+            delay = due - time.monotonic()
+    def run(self):
+        started = time.monotonic()
+        try:
+            pacing = self.options['pacing']
+            partition_count = len(self.producer.partitions_for(self.topic))
+            first_timestamp = None
+            self.window = (started, 0, None)
+            last_report = started
+            for partition, offset, timestamp, key, value, headers in self.reader:
+                if not self._is_running:
+                    break
+                due = None
+                if pacing == 'Fixed rate':
+                    due = started + self.sent / self.options['rate']
+                elif pacing == 'Original timing':
+                    if first_timestamp is None:
+                        first_timestamp = timestamp
+                    due = started + (timestamp - first_timestamp) / 1000 / self.options['speed']
+                if due is not None:
+                    self.wait_until(due)
+                    self.behind_s = max(time.monotonic() - due, 0.0)
+                future = self.producer.send(
+                    self.topic, value=value, key=key, headers=headers or None,
+                    partition=partition % partition_count if self.options['keep_partitions'] else None,
+                    timestamp_ms=timestamp if self.options['keep_timestamps'] else None,
+                )
+                future.add_callback(self.delivered)
+                future.add_errback(self.failed)
+                self.sent += 1
+                now = time.monotonic()
+                if now - last_report >= self.report_interval:
+                    self.report(now, started, timestamp)
+                    last_report = now
+            self.producer.flush()
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Replay error: {e}")
+        finally:
+            self.report(time.monotonic(), started, None)
+            logging.info(f"Replay to '{self.topic}' finished: {self.sent} sent, {self.acked} acked, {self.errors} errors.")
+    def delivered(self, metadata):
+        self.acked += 1
+    def failed(self, error):
+        self.errors += 1
+        self.error = str(error)
+    def report(self, now, started, timestamp):
+        window_start, window_sent, window_timestamp = self.window
+        window_elapsed = max(now - window_start, 1e-6)
+        window_records = self.sent - window_sent
+        if self.options['pacing'] == 'Fixed rate':
+            self.target_rate = self.options['rate']
+        elif self.options['pacing'] == 'Original timing' and window_timestamp is not None and timestamp is not None:
+            source_span = (timestamp - window_timestamp) / 1000 / self.options['speed']
+            self.target_rate = window_records / source_span if source_span > 0 else 0.0
+        self.window = (now, self.sent, timestamp)
+        self.progress_signal.emit({
+            'sent': self.sent,
+            'acked': self.acked,
+            'errors': self.errors,
+            'parse_errors': self.reader.parse_errors,
+            'elapsed': now - started,
+            'achieved_rate': window_records / window_elapsed,
+            'target_rate': self.target_rate,
+            'behind_s': self.behind_s,
+            'progress': self.reader.bytes_read / self.reader.total_bytes if self.reader.total_bytes else 1.0,
+            'error': self.error,
+        })
+
+class CopyDialog(QtWidgets.QDialog):
+    partition_modes = ['Preserve partition', 'By key']
+
+    def __init__(self, servers, source_name, topic, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Copy: {topic}")
+        self.setGeometry(250, 150, 750, 650)
+        self.servers = servers
+        self.source_name = source_name
+        self.topic = topic
+        self.copy_thread = None
+        self.partition_rows = {}
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        self.layout.addRow("Source:", QtWidgets.QLabel(f"{self.source_name} / {self.topic}"))
+        target_layout = QtWidgets.QHBoxLayout()
+        self.target_combo = QtWidgets.QComboBox()
+        self.target_combo.addItems([name for name in self.servers if name != self.source_name] or list(self.servers))
+        target_layout.addWidget(self.target_combo)
+        self.target_topic_edit = QtWidgets.QLineEdit(self.topic)
+        target_layout.addWidget(self.target_topic_edit)
+        self.layout.addRow("Target:", target_layout)
+        self.range_widget = OffsetRangeWidget()
+        self.layout.addRow("Range:", self.range_widget)
+        self.follow_checkbox = QtWidgets.QCheckBox("Keep following new records")
+        self.layout.addRow(self.follow_checkbox)
+        self.partition_combo = QtWidgets.QComboBox()
+        self.partition_combo.addItems(self.partition_modes)
+        self.layout.addRow("Partitioning:", self.partition_combo)
+        self.headers_checkbox = QtWidgets.QCheckBox("Copy headers")
+        self.headers_checkbox.setChecked(True)
+        self.layout.addRow(self.headers_checkbox)
+        self.timestamps_checkbox = QtWidgets.QCheckBox("Copy timestamps")
+        self.timestamps_checkbox.setChecked(True)
+        self.layout.addRow(self.timestamps_checkbox)
+        pipeline_layout = QtWidgets.QHBoxLayout()
+        self.fetchers_spin = QtWidgets.QSpinBox()
+        self.fetchers_spin.setRange(1, 64)
+        self.fetchers_spin.setValue(4)
+        pipeline_layout.addWidget(QtWidgets.QLabel("Fetchers:"))
+        pipeline_layout.addWidget(self.fetchers_spin)
+        self.queue_spin = QtWidgets.QSpinBox()
+        self.queue_spin.setRange(1, 1000)
+        self.queue_spin.setValue(16)
+        self.queue_spin.setSuffix(" batches")
+        pipeline_layout.addWidget(QtWidgets.QLabel("Queue:"))
+        pipeline_layout.addWidget(self.queue_spin)
+        self.compression_combo = QtWidgets.QComboBox()
+        self.compression_combo.addItems(['server', 'none', 'gzip', 'snappy', 'lz4', 'zstd'])
+        self.compression_combo.setToolTip("'server' uses the target profile's tuning preset")
+        pipeline_layout.addWidget(QtWidgets.QLabel("Compression:"))
+        pipeline_layout.addWidget(self.compression_combo)
+        pipeline_layout.addStretch()
+        self.layout.addRow(pipeline_layout)
+        checkpoint_layout = QtWidgets.QHBoxLayout()
+        self.checkpoint_edit = QtWidgets.QLineEdit(f"{self.topic}.copy.checkpoint")
+        checkpoint_layout.addWidget(self.checkpoint_edit)
+        self.browse_btn = QtWidgets.QPushButton("Browse")
+        self.browse_btn.clicked.connect(self.browse_checkpoint)
+        checkpoint_layout.addWidget(self.browse_btn)
+        self.layout.addRow("Checkpoint:", checkpoint_layout)
+        self.partition_table = QtWidgets.QTableWidget(0, 4)
+        self.partition_table.setHorizontalHeaderLabels(["Partition", "Position", "End", "Lag"])
+        self.partition_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.partition_table.verticalHeader().setVisible(False)
+        self.partition_table.horizontalHeader().setStretchLastSection(True)
+        self.layout.addRow(self.partition_table)
+        self.stats_label = QtWidgets.QLabel("Idle.")
+        self.stats_label.setWordWrap(True)
+        self.layout.addRow(self.stats_label)
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_copy)
+        self.stop_btn = QtWidgets.QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_copy)
+        self.close_btn = QtWidgets.QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        for btn in (self.start_btn, self.stop_btn, self.close_btn):
+            self.button_layout.addWidget(btn)
+        self.layout.addRow(self.button_layout)
+
+    def browse_checkpoint(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Checkpoint File", self.checkpoint_edit.text(), "All Files (*)")
+        if path:
+            self.checkpoint_edit.setText(path)
+
+    def start_copy(self):
+        target_name = self.target_combo.currentText()
+        target_topic = self.target_topic_edit.text().strip()
+        checkpoint_path = self.checkpoint_edit.text().strip()
+        if not target_name or not target_topic or not checkpoint_path:
+            return
+        if target_name == self.source_name and target_topic == self.topic:
+            QtWidgets.QMessageBox.warning(self, "Copy", "Source and target are the same topic.")
+            return
+        resume = False
+        checkpoint = load_checkpoint(checkpoint_path)
+        if checkpoint:
+            matches = (checkpoint.get('source'), checkpoint.get('topic'), checkpoint.get('target'), checkpoint.get('target_topic')) == \
+                (self.source_name, self.topic, target_name, target_topic)
+            if matches:
+                answer = QtWidgets.QMessageBox.question(
+                    self,
+                    'Copy',
+                    f"Resume the copy recorded in '{checkpoint_path}' ({checkpoint['records']:,} records copied)?\n"
+                    f"No starts over.",
+                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No | QtWidgets.QMessageBox.Cancel,
+                    QtWidgets.QMessageBox.Yes
+                )
+                if answer == QtWidgets.QMessageBox.Cancel:
+                    return
+                resume = answer == QtWidgets.QMessageBox.Yes
+            else:
+                confirm = QtWidgets.QMessageBox.question(
+                    self,
+                    'Copy',
+                    f"'{checkpoint_path}' belongs to another copy job. Overwrite it?",
+                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                    QtWidgets.QMessageBox.No
+                )
+                if confirm != QtWidgets.QMessageBox.Yes:
+                    return
+        range_kind, start, end = self.range_widget.selection()
+        compression = self.compression_combo.currentText()
+        options = {
+            'source': self.source_name,
+            'topic': self.topic,
+            'target': target_name,
+            'target_topic': target_topic,
+            'range': range_kind,
+            'start': start,
+            'end': end,
+            'follow': self.follow_checkbox.isChecked(),
+            'partitioning': self.partition_combo.currentText(),
+            'headers': self.headers_checkbox.isChecked(),
+            'timestamps': self.timestamps_checkbox.isChecked(),
+            'fetchers': self.fetchers_spin.value(),
+            'queue_batches': self.queue_spin.value(),
+            'checkpoint': checkpoint_path,
+            'resume': resume,
+        }
+        producer_options = {} if compression == 'server' else {'compression_type': None if compression == 'none' else compression}
+        if self.servers[target_name].get('tuning_preset', 'Default') == 'Default':
+            # Untuned targets would send with linger 0 and 16 KB batches, which is slow for bulk copies
+            producer_options.update(linger_ms=20, batch_size=256 * 1024)
+        self.partition_table.setRowCount(0)
+        self.partition_rows = {}
+        self.copy_thread = CopyThread(self.servers[self.source_name], self.servers[target_name], options, producer_options)
+        self.copy_thread.progress_signal.connect(self.show_progress)
+        self.copy_thread.status_signal.connect(self.stats_label.setText)
+        self.copy_thread.finished.connect(self.copy_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.stats_label.setText("Resuming copy..." if resume else "Resolving partition ranges...")
+        self.copy_thread.start()
+
+    def stop_copy(self):
+        if self.copy_thread:
+            self.copy_thread.stop()
+            self.stats_label.setText("Stopping and saving checkpoint...")
+
+    def show_progress(self, stats):
+        for partition, values in stats['partitions'].items():
+            row = self.partition_rows.get(partition)
+            if row is None:
+                row = self.partition_rows[partition] = self.partition_table.rowCount()
+                self.partition_table.insertRow(row)
+                self.partition_table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(partition)))
+            for column, value in enumerate(values, 1):
+                text = "" if value is None else f"{value:,}"
+                item = self.partition_table.item(row, column)
+                if item is None:
+                    self.partition_table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+        text = (f"Copied {stats['records']:,} records ({stats['acked']:,} acked, {stats['errors']} errors), "
+                f"{stats['records_per_sec']:,.0f} records/s, {stats['bytes_per_sec'] / 1024:,.1f} KB/s\n"
+                f"Lag {stats['lag']:,} records, queue {stats['queued']} of {stats['queue_batches']} batches, "
+                f"{stats['elapsed']:.1f} s")
+        if stats.get('error'):
+            text += f"\nError: {stats['error']}"
+        self.stats_label.setText(text)
+
+    def copy_finished(self):
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.copy_thread = None
+
+    def done(self, result):
+        if self.copy_thread:
+            self.copy_thread.stop()
+            self.copy_thread.wait()
+        super().done(result)
+
+class CopyThread(QtCore.QThread):
+    """
+    Copies a topic between server profiles in three stages: fetcher threads, each with an
+    assigned source consumer for a share of the partitions, put poll batches on a bounded
+    queue; this thread drains the queue into one batched target producer. A full queue
+    blocks the fetchers, so the target's speed sets the pace. Every checkpoint_interval the
+    producer is flushed and the next source offset of each partition is saved, so a resumed
+    job re-copies at most the records sent since the last checkpoint.
+    """
+    progress_signal = QtCore.pyqtSignal(dict)
+    status_signal = QtCore.pyqtSignal(str)
+    batch_records = 1000
+    report_interval = 0.5
+    checkpoint_interval = 5.0
+    def __init__(self, source_config, target_config, options, producer_options):
+        super().__init__()
+        self.source_config = source_config
+        self.target_config = target_config
+        self.options = options
+        self.producer_options = producer_options
+        self.batches = queue.Queue(maxsize=options['queue_batches'])
+        self.ranges = {}
+        self.positions = {}
+        self.sent_positions = {}
+        self.end_offsets = {}
+        self.records = 0
+        self.sent_bytes = 0
+        # Only the producer's I/O thread writes these two, from delivery callbacks
+        self.acked = 0
+        self.errors = 0
+        self.error = None
+        self.checkpoint_state = None
+        self._is_running = True
+    def stop(self):
+        self._is_running = False
+    def load_ranges(self, consumer):
+        from kafka import TopicPartition
+        checkpoint = load_checkpoint(self.options['checkpoint']) if self.options['resume'] else None
+        if checkpoint:
+            topic = self.options['topic']
+            self.ranges = {TopicPartition(topic, int(p)): tuple(r) for p, r in checkpoint['ranges'].items()}
+            self.positions = {int(p): offset for p, offset in checkpoint['positions'].items()}
+            self.records = checkpoint['records']
+            self.options['follow'] = checkpoint['follow']
+        else:
+            self.ranges = resolve_offset_ranges(
+                consumer, self.options['topic'], self.options['range'], self.options['start'], self.options['end'])
+            if self.options['follow']:
+                self.ranges = {tp: (first, None) for tp, (first, last) in self.ranges.items()}
+            self.positions = {tp.partition: first for tp, (first, last) in self.ranges.items()}
+        self.checkpoint_state = {
+            key: self.options[key] for key in ('source', 'topic', 'target', 'target_topic', 'follow')
+        }
+        self.checkpoint_state['ranges'] = {str(tp.partition): list(r) for tp, r in self.ranges.items()}
+    def run(self):
+        started = time.monotonic()
+        consumer = None
+        producer = None
+        fetchers = []
+        resumed = 0
+        try:
+            from kafka import KafkaProducer
+            from kafka.errors import KafkaError
+            consumer = attach_consumer(self.source_config)
+            self.load_ranges(consumer)
+            resumed = self.records
+            producer = KafkaProducer(**client_kwargs(self.target_config, 'producer', **self.producer_options))
+            target_partitions = producer.partitions_for(self.options['target_topic'])
+            if not target_partitions:
+                raise KafkaError(f"Target topic '{self.options['target_topic']}' not found")
+            target_count = len(target_partitions)
+            self.save_checkpoint(producer)
+            pending = [tp for tp, (first, last) in self.ranges.items() if last is None or self.positions[tp.partition] < last]
+            fetcher_count = min(self.options['fetchers'], len(pending))
+            fetchers = [
+                threading.Thread(target=self.fetch_partitions, args=(pending[i::fetcher_count],), daemon=True)
+                for i in range(fetcher_count)
+            ]
+            for fetcher in fetchers:
+                fetcher.start()
+            self.sent_positions = dict(self.positions)
+            last_report = last_checkpoint = last_end_offsets = 0.0
+            while self._is_running:
+                try:
+                    partition, next_position, records = self.batches.get(timeout=0.2)
+                except queue.Empty:
+                    if not any(fetcher.is_alive() for fetcher in fetchers) and self.batches.empty():
+                        break
+                    partition, records = None, []
+                for r in records:
+                    future = producer.send(
+                        self.options['target_topic'], value=r.value, key=r.key,
+                        headers=(r.headers or None) if self.options['headers'] else None,
+                        partition=r.partition % target_count if self.options['partitioning'] == 'Preserve partition' else None,
+                        timestamp_ms=r.timestamp if self.options['timestamps'] else None,
+                    )
+                    future.add_callback(self.delivered)
+                    future.add_errback(self.failed)
+                    self.sent_bytes += len(r.value or b'') + len(r.key or b'')
+                if partition is not None:
+                    self.records += len(records)
+                    self.sent_positions[partition] = next_position
+                now = time.monotonic()
+                if now - last_checkpoint >= self.checkpoint_interval:
+                    self.save_checkpoint(producer)
+                    last_checkpoint = now
+                if now - last_end_offsets >= self.checkpoint_interval:
+                    self.end_offsets = {tp.partition: end for tp, end in consumer.end_offsets(list(self.ranges)).items()}
+                    last_end_offsets = now
+                if now - last_report >= self.report_interval:
+                    self.report(started, resumed)
+                    last_report = now
+            self._is_running = False
+            for fetcher in fetchers:
+                fetcher.join()
+            self.save_checkpoint(producer)
+            self.report(started, resumed)
+            complete = all(last is not None and self.positions[tp.partition] >= last for tp, (first, last) in self.ranges.items())
+            state = "complete" if complete else "stopped, resumable"
+            error_text = f", last error: {self.error}" if self.error else ""
+            self.status_signal.emit(
+                f"Copy {state}: {self.records:,} records, {self.errors} errors{error_text}, "
+                f"checkpoint in {self.options['checkpoint']}")
+            logging.info(f"Copied {self.records - resumed} records from {self.options['source']}/{self.options['topic']} "
+                         f"to {self.options['target']}/{self.options['target_topic']} ({state}).")
+        except Exception as e:
+            self._is_running = False
+            error_msg = f"Copy error: {e}"
+            self.status_signal.emit(error_msg)
+            logging.error(error_msg)
+        finally:
+            for fetcher in fetchers:
+                fetcher.join()
+            if producer:
+                producer.close(timeout=10)
+            if consumer:
+                consumer.close()
+    def fetch_partitions(self, tps):
+        fetcher = None
+        try:
+            fetcher = attach_consumer(self.source_config)
+            fetcher.assign(tps)
+            for tp in tps:
+                fetcher.seek(tp, self.positions[tp.partition])
+            remaining = set(tps)
+            while remaining and self._is_running:
+                for tp, records in fetcher.poll(timeout_ms=500, max_records=self.batch_records).items():
+                    last = self.ranges[tp][1]
+                    next_position = records[-1].offset + 1
+                    if last is not None:
+                        records = [r for r in records if r.offset < last]
+                        if next_position >= last:
+                            remaining.discard(tp)
+                            fetcher.pause(tp)
+                            next_position = last
+                    self.put_batch(tp.partition, next_position, records)
+                for tp in list(remaining):
+                    last = self.ranges[tp][1]
+                    if last is not None and fetcher.position(tp) >= last:
+                        # Transaction markers or compacted gaps end the range without a record at last - 1;
+                        # queue the end position so it is checkpointed after the partition's earlier batches
+                        remaining.discard(tp)
+                        self.put_batch(tp.partition, last, [])
+        except Exception as e:
+            self.error = str(e)
+            self._is_running = False
+            logging.error(f"Copy fetcher error: {e}")
+        finally:
+            if fetcher:
+                fetcher.close()
+    def put_batch(self, partition, next_position, records):
+        while self._is_running:
+            try:
+                self.batches.put((partition, next_position, records), timeout=0.2)
+                return
+            except queue.Full:
+                pass
+    def delivered(self, metadata):
+        self.acked += 1
+    def failed(self, error):
+        self.errors += 1
+        self.error = str(error)
+        self._is_running = False
+    def save_checkpoint(self, producer):
+        producer.flush()
+        if self.errors:
+            # Positions past a failed send must not be recorded; resume from the last good checkpoint
+            return
+        self.positions.update(self.sent_positions)
+        self.checkpoint_state.update(
+            positions={str(p): offset for p, offset in self.positions.items()},
+            records=self.records,
+        )
+        save_checkpoint(self.options['checkpoint'], self.checkpoint_state)
+    def report(self, started, resumed):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        partitions = {}
+        for tp, (first, last) in self.ranges.items():
+            end = self.end_offsets.get(tp.partition)
+            if last is not None:
+                end = last if end is None else min(end, last)
+            position = self.sent_positions.get(tp.partition, self.positions[tp.partition])
+            partitions[tp.partition] = (position, end, None if end is None else max(end - position, 0))
+        self.progress_signal.emit({
+            'records': self.records,
+            'acked': self.acked,
+            'errors': self.errors,
+            'records_per_sec': (self.records - resumed) / elapsed,
+            'bytes_per_sec': self.sent_bytes / elapsed,
+            'lag': sum(lag for _, _, lag in partitions.values() if lag is not None),
+            'queued': self.batches.qsize(),
+            'queue_batches': self.options['queue_batches'],
+            'partitions': partitions,
+            'elapsed': elapsed,
+            'error': self.error,
+        })
+
+class SettingsDialog(QtWidgets.QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Settings")
+        self.setGeometry(200, 200, 300, 200)
+        self.parent = parent
+        self.selected_font = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QtWidgets.QFormLayout(self)
+        self.theme_combo = QtWidgets.QComboBox()
+        self.theme_combo.addItems(['Light', 'Dark'])
+        self.theme_combo.setCurrentText(self.parent.settings.get('theme', 'Light'))
+        self.layout.addRow("Theme:", self.theme_combo)
+
+        self.font_btn = QtWidgets.QPushButton("Font")
         self.font_btn.clicked.connect(self.select_font)
         self.font_label = QtWidgets.QLabel(f"{self.parent.settings.get('font_family', 'Segoe UI')}, {self.parent.settings.get('font_size', 12)}")
         font_layout = QtWidgets.QHBoxLayout()
@@ -926,6 +4892,46 @@ class SettingsDialog(QtWidgets.QDialog):
         font_layout.addWidget(self.font_label)
         self.layout.addRow("Output Font:", font_layout)
 
+        self.log_lines_spin = QtWidgets.QSpinBox()
+        self.log_lines_spin.setRange(1000, 10000000)
+        self.log_lines_spin.setSingleStep(10000)
+        self.log_lines_spin.setValue(self.parent.settings.get('log_max_lines', 100000))
+        self.layout.addRow("Output Lines:", self.log_lines_spin)
+        self.log_mb_spin = QtWidgets.QSpinBox()
+        self.log_mb_spin.setRange(1, 4096)
+        self.log_mb_spin.setSuffix(" MB")
+        self.log_mb_spin.setValue(self.parent.settings.get('log_max_bytes', 64 * 1024 * 1024) // (1024 * 1024))
+        self.layout.addRow("Output Size:", self.log_mb_spin)
+
+        self.highlight_kb_spin = QtWidgets.QSpinBox()
+        self.highlight_kb_spin.setRange(0, 1024 * 1024)
+        self.highlight_kb_spin.setSuffix(" KB")
+        self.highlight_kb_spin.setValue(self.parent.settings.get('highlight_max_chars', 2 * 1024 * 1024) // 1024)
+        self.layout.addRow("Highlight Limit:", self.highlight_kb_spin)
+
+        self.large_kb_spin = QtWidgets.QSpinBox()
+        self.large_kb_spin.setRange(16, 1024 * 1024)
+        self.large_kb_spin.setSuffix(" KB")
+        self.large_kb_spin.setValue(self.parent.settings.get('large_message_bytes', 1024 * 1024) // 1024)
+        self.layout.addRow("Large Message:", self.large_kb_spin)
+
+        self.consume_fetchers_spin = QtWidgets.QSpinBox()
+        self.consume_fetchers_spin.setRange(1, 64)
+        self.consume_fetchers_spin.setValue(self.parent.settings.get('consume_fetchers', 4))
+        self.layout.addRow("Consume Fetchers:", self.consume_fetchers_spin)
+        self.consume_workers_spin = QtWidgets.QSpinBox()
+        self.consume_workers_spin.setRange(0, 64)
+        self.consume_workers_spin.setSpecialValueText("inline")
+        self.consume_workers_spin.setValue(self.parent.settings.get('consume_workers', 0))
+        self.layout.addRow("Decode Processes:", self.consume_workers_spin)
+
+        self.schema_dir_edit = QtWidgets.QLineEdit(self.parent.settings.get('schema_dir', ''))
+        self.schema_dir_edit.setPlaceholderText(default_schema_dir)
+        self.layout.addRow("Schema Mirror:", self.schema_dir_edit)
+        self.schema_url_edit = QtWidgets.QLineEdit(self.parent.settings.get('schema_registry_url', ''))
+        self.schema_url_edit.setPlaceholderText("http://registry:8081 (optional)")
+        self.layout.addRow("Schema Registry:", self.schema_url_edit)
+
         self.logging_checkbox = QtWidgets.QCheckBox("Enable Logging")
         self.logging_checkbox.setChecked(self.parent.settings.get('logging_enabled', True))
         self.layout.addRow(self.logging_checkbox)
@@ -955,19 +4961,32 @@ class SettingsDialog(QtWidgets.QDialog):
         if self.selected_font:
             self.parent.settings['font_family'] = self.selected_font.family()
             self.parent.settings['font_size'] = self.selected_font.pointSize()
+        self.parent.settings['log_max_lines'] = self.log_lines_spin.value()
+        self.parent.settings['log_max_bytes'] = self.log_mb_spin.value() * 1024 * 1024
+        self.parent.settings['highlight_max_chars'] = self.highlight_kb_spin.value() * 1024
+        self.parent.settings['large_message_bytes'] = self.large_kb_spin.value() * 1024
+        self.parent.settings['consume_fetchers'] = self.consume_fetchers_spin.value()
+        self.parent.settings['consume_workers'] = self.consume_workers_spin.value()
+        self.parent.settings['schema_dir'] = self.schema_dir_edit.text().strip()
+        self.parent.settings['schema_registry_url'] = self.schema_url_edit.text().strip()
         self.parent.settings['logging_enabled'] = self.logging_checkbox.isChecked()
         self.parent.save_settings()
         setup_logging(enabled=self.parent.settings.get('logging_enabled', True))
         self.accept()
 
 def main():
-    setup_logging(enabled=True)
+    startup_profile.mark("imports")
     app = QtWidgets.QApplication(sys.argv)
     QtCore.QCoreApplication.setApplicationName("Magic Boar Kafka Connector")
     QtCore.QCoreApplication.setOrganizationName("MagicBoar")
+    startup_profile.mark("QApplication")
     kafka_app = KafkaApp()
     kafka_app.show()
+    startup_profile.mark("show")
+    QtCore.QTimer.singleShot(0, kafka_app.finish_startup)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    # In the frozen EXE, spawned pool workers re-run the executable; this turns them back into workers
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,41 @@
+import json
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main_gui_v2 import iter_pretty_json_lines
+
+
+def render(data, **kwargs):
+    return list(iter_pretty_json_lines(data, **kwargs))
+
+
+class PrettyJsonLinesTest(unittest.TestCase):
+    def test_matches_json_dumps(self):
+        data = b'{"a": [1, -2.5, true, null, {}, []], "b": "x\\"y"}'
+        self.assertEqual('\n'.join(render(data)), json.dumps(json.loads(data), indent=4))
+
+    def test_free_text_passes_through(self):
+        data = b'[INFO] user logged in from host a'
+        self.assertEqual(render(data), [data.decode()])
+
+    def test_trailing_words_pass_through(self):
+        data = b'{"msg": "ok"} extra words here'
+        self.assertEqual(render(data), [data.decode()])
+
+    def test_concatenated_documents_pass_through(self):
+        data = b'{"a": 1}{"b": 2}'
+        self.assertEqual(render(data), [data.decode()])
+
+    def test_malformed_tail_after_probe_keeps_raw_text(self):
+        document = json.dumps([{"id": i} for i in range(50)]).encode()
+        lines = render(document + b' trailing junk', probe_bytes=64)
+        self.assertEqual('\n'.join(lines[:-1]), json.dumps(json.loads(document), indent=4))
+        self.assertEqual(lines[-1], 'trailing junk')
+
+
+if __name__ == '__main__':
+    unittest.main()